@@ -1,21 +1,28 @@
-from flask import Flask, request, send_from_directory, jsonify, render_template
+from flask import Flask, request, jsonify, render_template
 from flask_bcrypt import Bcrypt
 from flask_cors import CORS
-from config import ALLOWED_ORIGINS
+from config import ALLOWED_ORIGINS, PROJECT_SUMMARY_RECOMPUTE_MINUTES, STATUS_MONTHLY_ROLLUP_MINUTES
 from blueprints.auth import auth_bp
 from blueprints.schedule import schedule_bp
 from blueprints.user import user_bp
 from blueprints.favorite import favorite_bp
-from blueprints.project import project_bp
-from blueprints.status import status_bp
+from blueprints.project import project_bp, recompute_project_summary
+from blueprints.status import status_bp, rollup_status_months
 from blueprints.admin import admin_bp
 from blueprints.notice import notice_bp
 from blueprints.department import department_bp
 from blueprints.menu import menu_bp
+from blueprints.bootstrap import bootstrap_bp
+from blueprints.search import search_bp
+from jobs import register_periodic_job, start_periodic_jobs
+from compression import compress_response, compression_stats, ENCODERS
+from json_provider import FastJSONProvider
+from static_assets import StaticAssets, not_found_response, precompress_build
 
 import os, logging
 
-app = Flask(__name__, static_folder="build", static_url_path="/")
+app = Flask(__name__, static_folder=None)  # 정적 파일은 serve_react 에서 (static_assets.py)
+app.json = FastJSONProvider(app)  # ISO-8601 날짜, orjson 사용 (json_provider.py)
 
 # logs 디렉터리 생성 (없으면 자동 생성)
 LOG_DIR = "/app/logs" if os.getenv("DOCKER_ENV") else "logs"
@@ -63,13 +70,19 @@ error_handler.setLevel(logging.ERROR)
 app.logger.addHandler(access_handler)
 app.logger.addHandler(error_handler)
 
-# React 정적 파일 서빙 (index.html 없을 경우 404 처리)
+# React 빌드 파일 색인 (시작 시 1회, 빌드를 바꾸면 재시작)
+static_assets = StaticAssets()
+
+# React 정적 파일 서빙 (색인에 있으면 파일, API/정적 파일 경로면 404, 그 외는 index.html)
 @app.route("/", defaults={"path": ""})
 @app.route("/<path:path>")
 def serve_react(path):
-    if os.path.exists(os.path.join("build", path)):  # 정적 파일 요청이면 반환
-        return send_from_directory("build", path)
-    return send_from_directory("build", "index.html")  # React SPA 대응
+    response = static_assets.send(path) if path else None
+    if response is not None:
+        return response
+    if path and static_assets.is_api_path(path, app.url_map):
+        return not_found_response()
+    return static_assets.send_index()  # React SPA 대응
 
 # API 동작 확인용 엔드포인트 추가
 @app.route("/health")
@@ -77,10 +90,23 @@ def health_check():
     app.logger.info("Health check 요청 받음")
     return jsonify({"status": "OK"}), 200
 
-# ✅ 모든 404 요청을 React `index.html`로 리디렉트 (React 클라이언트 라우팅 지원)
+# 응답 압축 통계 (프로세스별: 인코딩별 압축 CPU 시간, 줄어든 바이트 수)
+@app.route("/health/compression")
+def compression_health():
+    return jsonify({"pid": os.getpid(), "encodings": list(ENCODERS), "stats": compression_stats.snapshot()}), 200
+
+# ✅ 404: API/정적 파일 경로는 JSON 404, 그 외는 React `index.html` (React 클라이언트 라우팅 지원)
 @app.errorhandler(404)
 def not_found(e):
-    return send_from_directory("build", "index.html"), 200
+    if static_assets.is_api_path(request.path, app.url_map):
+        return not_found_response()
+    return static_assets.send_index()
+
+# 빌드 결과 미리 압축 (npm run build 후 실행: flask --app app compress-build)
+@app.cli.command('compress-build')
+def compress_build_command():
+    created = precompress_build()
+    print(f"압축 파일 {created}개 생성")
 
 # CORS 설정 개선
 @app.after_request
@@ -95,6 +121,16 @@ def after_request(response):
     response.headers["Access-Control-Allow-Methods"] = "GET, POST, PUT, DELETE, OPTIONS"
     return response
 
+# 큰 JSON/텍스트 응답 압축 (Accept-Encoding 협상, br > gzip)
+@app.after_request
+def compress(response):
+    return compress_response(request, response)
+
+# 주기 실행 작업 시작 (첫 요청 때 한 번, 블루프린트의 요청 훅보다 먼저 실행되도록 먼저 등록)
+@app.before_request
+def start_jobs():
+    start_periodic_jobs()
+
 # 블루프린트 등록
 app.register_blueprint(auth_bp)
 app.register_blueprint(schedule_bp)
@@ -106,6 +142,13 @@ app.register_blueprint(admin_bp)
 app.register_blueprint(notice_bp)
 app.register_blueprint(department_bp)
 app.register_blueprint(menu_bp)
+app.register_blueprint(bootstrap_bp)
+app.register_blueprint(search_bp)
+
+# 주기 실행 작업 (집계 테이블 오차 보정 등)
+# 서버가 요청을 처리하기 시작할 때 시작 (start_jobs, flask CLI 명령에서는 실행하지 않음)
+register_periodic_job('project_summary', PROJECT_SUMMARY_RECOMPUTE_MINUTES * 60, recompute_project_summary)
+register_periodic_job('status_monthly_rollup', STATUS_MONTHLY_ROLLUP_MINUTES * 60, rollup_status_months)
 
 # gunicorn 사용 시 주석 처리
 if __name__ == "__main__":
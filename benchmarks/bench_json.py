@@ -0,0 +1,83 @@
+# benchmarks/bench_json.py
+# JSON 직렬화 벤치마크: Flask 기본 provider vs FastJSONProvider (orjson / 표준 json)
+#
+# DB 없이 get_all_project 응답과 같은 모양의 프로젝트 행을 만들어 측정한다.
+# 실행 (프로젝트 루트에서):
+#   python -m benchmarks.bench_json --rows 10000 --repeat 20
+import argparse, time
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+import json_provider
+from json_provider import FastJSONProvider
+
+def make_projects(count):
+    """get_all_project 와 같은 컬럼 구성의 프로젝트 행 (날짜/시각/Decimal 포함)"""
+    start = date(2024, 1, 1)
+    created = datetime(2024, 1, 1, 9, 0, 0)
+    return [{
+        'project_code': f'PRJ-{i:06d}',
+        'category': ('SI', 'SM', '유지보수')[i % 3],
+        'status': ('제안', '진행', '완료')[i % 3],
+        'business_start_date': start + timedelta(days=i % 365),
+        'business_end_date': start + timedelta(days=i % 365 + 180),
+        'project_name': f'차세대 시스템 구축 프로젝트 {i}',
+        'customer': f'고객사 {i % 50}',
+        'supplier': f'공급사 {i % 20}',
+        'person_in_charge': f'담당자 {i % 100}',
+        'contact_number': '010-0000-0000',
+        'sales_representative': f'영업 {i % 10}',
+        'project_pm': f'PM {i % 30}',
+        'project_manager': f'매니저 {i % 30}',
+        'business_details_and_notes': '상세 내용 ' * 5,
+        'changes': '',
+        'group_name': f'그룹 {i % 5}',
+        'contract_amount': Decimal(f'{i * 1000}.50'),
+        'is_delete_yn': 'N',
+        'created_at': created + timedelta(minutes=i),
+        'updated_at': created + timedelta(minutes=i * 2),
+        'created_by': 'SYSTEM',
+        'updated_by': 'SYSTEM',
+    } for i in range(count)]
+
+def timed(fn, repeat):
+    """repeat 번 실행해서 (평균 ms, 마지막 결과) 반환"""
+    result = None
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - start) * 1000 / repeat, result
+
+def main():
+    parser = argparse.ArgumentParser(description="JSON 직렬화 벤치마크")
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    payload = {'projects': make_projects(args.rows)}
+
+    default_provider = DefaultJSONProvider(app)
+    fast_provider = FastJSONProvider(app)
+
+    # Flask 기본 provider 는 Decimal 은 처리하지만 RFC 1123 날짜를 출력
+    cases = [('Flask 기본 (json, RFC 1123)', default_provider.dumps)]
+    if json_provider.orjson is not None:
+        cases.append(('FastJSONProvider (orjson)', fast_provider.dumps))
+    else:
+        print("orjson 이 설치되어 있지 않아 표준 json 경로만 측정합니다.")
+    # 표준 json 경로 (orjson 미설치 환경과 같은 동작)
+    cases.append(('FastJSONProvider (json 대체 경로)', lambda obj: fast_provider.dumps(obj, separators=(',', ':'))))
+
+    print(f"프로젝트 {args.rows:,}건, {args.repeat}회 평균")
+    baseline = None
+    for label, dumps in cases:
+        ms, body = timed(lambda: dumps(payload), args.repeat)
+        baseline = baseline or ms
+        print(f"  {label:<34}: {ms:8.2f} ms  ({baseline / ms:5.1f}x), {len(body.encode('utf-8')):>12,} bytes")
+    print(f"  날짜 예시: {fast_provider.dumps(payload['projects'][0]['business_start_date'])}, "
+          f"{fast_provider.dumps(payload['projects'][0]['created_at'])}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+# benchmarks/bench_user_directory.py
+# 사용자 목록 조회 벤치마크: 전체 목록(기존 방식) vs 필터/페이지네이션 SQL
+#
+# 실행 (프로젝트 루트에서, .env 의 DB 설정 사용):
+#   python -m benchmarks.bench_user_directory --department D001 --status 본사 --q 김 --limit 50
+import argparse, json, time
+from db import get_db_connection
+from blueprints.user import DIRECTORY_SELECT_SQL, to_directory_user, build_user_query, query_users
+
+def timed(fn, repeat):
+    """repeat 번 실행해서 (평균 ms, 마지막 결과) 반환"""
+    result = None
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - start) * 1000 / repeat, result
+
+def full_list():
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+    try:
+        cursor.execute(DIRECTORY_SELECT_SQL)
+        users = [to_directory_user(row) for row in cursor.fetchall()]
+    finally:
+        cursor.close()
+        conn.close()
+    return json.dumps([u._asdict() for u in users], ensure_ascii=False)
+
+def explain(filters):
+    """필터 SQL(query_users 와 같은 SQL)의 실행 계획 출력 (인덱스 사용 여부 확인용)"""
+    sql, params, _ = build_user_query(filters)
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+    try:
+        cursor.execute("EXPLAIN " + sql, tuple(params))
+        for row in cursor.fetchall():
+            print(f"  {row['table']:<4} type={row['type']} key={row['key']} rows={row['rows']} extra={row['Extra']}")
+    finally:
+        cursor.close()
+        conn.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="사용자 목록 조회 벤치마크")
+    parser.add_argument('--department')
+    parser.add_argument('--team')
+    parser.add_argument('--status')
+    parser.add_argument('--role_id')
+    parser.add_argument('--q')
+    parser.add_argument('--limit', type=int, default=50)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    filters = {k: v for k, v in vars(args).items() if k in ('department', 'team', 'status', 'role_id', 'q') and v}
+    filters['limit'] = str(args.limit)
+
+    def filtered():
+        users, next_cursor = query_users(filters)
+        return json.dumps({'users': [u._asdict() for u in users], 'next_cursor': next_cursor}, ensure_ascii=False)
+
+    full_ms, full_body = timed(full_list, args.repeat)
+    filtered_ms, filtered_body = timed(filtered, args.repeat)
+
+    print(f"전체 목록   : {full_ms:8.2f} ms, {len(full_body.encode('utf-8')):>10,} bytes")
+    print(f"필터 + 페이지: {filtered_ms:8.2f} ms, {len(filtered_body.encode('utf-8')):>10,} bytes  ({filters})")
+    print("필터 SQL 실행 계획:")
+    explain(filters)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+# blobstore.py
+# 내용 주소 방식(SHA-256) 로컬 파일 저장소
+#
+# 같은 내용은 한 번만 저장되고, 파일 이름이 곧 내용의 해시이므로 한 번 저장된 파일은 바뀌지 않는다.
+# (응답에 immutable 캐시 헤더를 붙여도 안전함)
+# 경로: BLOB_DIR/<해시 앞 2자리>/<해시>.<확장자>
+import os, re, glob, hashlib, tempfile, mimetypes
+
+BLOB_DIR = "/app/blobs" if os.getenv("DOCKER_ENV") else "blobs"
+if not os.path.exists(BLOB_DIR):
+    os.makedirs(BLOB_DIR, exist_ok=True)
+
+SHA256_RE = re.compile(r'^[0-9a-f]{64}$')
+
+# 저장을 허용하는 형식 -> 확장자
+EXTENSIONS = {
+    'image/png': 'png',
+    'image/jpeg': 'jpg',
+    'image/gif': 'gif',
+    'image/webp': 'webp',
+    'image/bmp': 'bmp',
+}
+
+def put_blob(data, mimetype):
+    """data(bytes)를 저장하고 SHA-256 해시를 반환 (이미 있으면 다시 쓰지 않음)"""
+    ext = EXTENSIONS.get(mimetype)
+    if ext is None:
+        raise ValueError(f"지원하지 않는 형식입니다: {mimetype}")
+    sha = hashlib.sha256(data).hexdigest()
+    directory = os.path.join(BLOB_DIR, sha[:2])
+    path = os.path.join(directory, f"{sha}.{ext}")
+    if os.path.exists(path):
+        return sha
+    os.makedirs(directory, exist_ok=True)
+    # 임시 파일에 쓴 뒤 rename (동시에 같은 파일을 써도 반쯤 쓰인 파일이 보이지 않음)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return sha
+
+def find_blob(sha):
+    """해시로 저장된 파일의 (경로, mimetype) 조회 (없으면 None)"""
+    if not SHA256_RE.match(sha or ''):
+        return None
+    for path in glob.glob(os.path.join(BLOB_DIR, sha[:2], f"{sha}.*")):
+        return path, mimetypes.guess_type(path)[0] or 'application/octet-stream'
+    return None
@@ -1,16 +1,76 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, Response, stream_with_context, current_app
 import jwt, logging
+import io, csv, os, threading
+import bcrypt as bcrypt_lib
+from concurrent.futures import ProcessPoolExecutor
 from flask_bcrypt import Bcrypt
-from db import get_db_connection
-from config import SECRET_KEY
+from db import get_db_connection, close_db
+from config import SECRET_KEY, IMPORT_USERS_CHUNK_SIZE, IMPORT_USERS_HASH_WORKERS
 from .auth import encrypt_deterministic, encrypt_aes
 from blueprints.auth import verify_and_refresh_token
+from cache import notify_change
+from blueprints.bootstrap import reference_response, get_reference_data
 
 admin_bp = Blueprint('admin', __name__, url_prefix='/admin')
 bcrypt = Bcrypt()
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+# 여러 사용자를 한 번에 바꾸는 API 를 호출할 수 있는 권한 (메뉴 권한 설정과 별개로 API 에서 직접 확인)
+ADMIN_ROLES = ['AD_ADMIN']
+
+# 사용자 일괄 등록 CSV 필수 컬럼 (/add_user 요청 필드와 같은 이름)
+IMPORT_REQUIRED_FIELDS = ['id', 'username', 'position', 'department', 'phone', 'password', 'role_id']
+
+_hash_pool = None
+_hash_pool_lock = threading.Lock()
+
+def get_hash_pool():
+    """비밀번호 해시용 프로세스 풀 (처음 사용할 때 생성, bcrypt 는 CPU 작업이라 스레드로는 병렬화되지 않음)"""
+    global _hash_pool
+    with _hash_pool_lock:
+        if _hash_pool is None:
+            _hash_pool = ProcessPoolExecutor(max_workers=IMPORT_USERS_HASH_WORKERS or os.cpu_count())
+        return _hash_pool
+
+def hash_password(password, rounds):
+    """flask_bcrypt 의 generate_password_hash 와 같은 형식 ($2b$) 의 해시 (프로세스 풀에서 실행)"""
+    return bcrypt_lib.hashpw(password.encode('utf-8'), bcrypt_lib.gensalt(rounds)).decode('utf-8')
+
+def default_status_id(statuses):
+    """/add_user 와 같은 기본 상태 (HQ 가 있으면 HQ, 없으면 id 순 첫 번째)"""
+    ids = sorted(row['id'] for row in statuses)
+    if 'HQ' in ids:
+        return 'HQ'
+    return ids[0] if ids else None
+
+def validate_import_row(row, seen_ids, role_ids, status_ids, default_status):
+    """CSV 한 행 검사 후 (INSERT 값 dict, 오류 메시지) 반환"""
+    row = {k.strip(): (v or '').strip() for k, v in row.items() if k}
+    for field in IMPORT_REQUIRED_FIELDS:
+        if not row.get(field):
+            return None, f'{field} 필드가 누락되었습니다.'
+    if row['id'] in seen_ids:
+        return None, '파일 안에 같은 id 가 이미 있습니다.'
+    if row['role_id'] not in role_ids:
+        return None, f"존재하지 않는 권한입니다: {row['role_id']}"
+    status = row.get('status') or default_status
+    if not status:
+        return None, '기본 상태 값이 설정되지 않았습니다. tb_status 테이블을 확인하세요.'
+    if status not in status_ids:
+        return None, f'존재하지 않는 상태입니다: {status}'
+    return {
+        'id': row['id'],
+        'name': row['username'],
+        'position': row['position'],
+        'department': row['department'],
+        'phone': row['phone'],
+        'password': row['password'],
+        'role_id': row['role_id'],
+        'status': status,
+        'first_login_yn': row.get('first_login_yn') or 'N',
+    }, None
+
 # 유저 생성 API (관리자용)
 @admin_bp.route('/add_user', methods=['POST', 'OPTIONS'])
 def create_user():
@@ -88,6 +148,7 @@ def create_user():
         logger.info(f"[SQL/INSERT] tb_user /add_user {sql_tb_user_insert}")
 
         conn.commit()
+        notify_change('directory', [id])
         return jsonify({'message': '유저 생성 성공!'}), 201
     except Exception as e:
         conn.rollback()
@@ -97,6 +158,150 @@ def create_user():
         cursor.close()
         conn.close()
 
+# 사용자 일괄 등록 API (관리자용, CSV)
+# 요청 본문: CSV (Content-Type: text/csv), 첫 줄은 컬럼명 (id,username,position,department,phone,password,role_id[,status,first_login_yn])
+# 응답: 행별 결과를 JSON 으로 스트리밍 ({"results": [...], "summary": {...}})
+@admin_bp.route('/import_users', methods=['POST', 'OPTIONS'])
+def import_users():
+    if request.method == 'OPTIONS':
+        return jsonify({'message': 'CORS preflight request success'})
+    
+    # verify_and_refresh_token 사용하여 토큰 검증 및 자동 갱신
+    user_id, user_name, role_id, refresh_response, status_code = verify_and_refresh_token(request)
+    if refresh_response:
+        return refresh_response, status_code  # 자동 토큰 갱신 응답 반환
+    
+    if user_id is None:
+        return jsonify({'message': '토큰 인증 실패'}), 401
+
+    # CSV 의 role_id 로 관리자 계정도 만들 수 있으므로 관리자만 호출 가능
+    if role_id not in ADMIN_ROLES:
+        return jsonify({'message': '사용자 일괄 등록 권한이 없습니다.'}), 403
+
+    created_by = user_name or 'SYSTEM'
+    # 본문을 한꺼번에 읽지 않고 묶음 단위로 읽어 처리 (multipart 는 응답 스트리밍 전에 파일이 닫히므로 받지 않음)
+    if request.mimetype == 'multipart/form-data':
+        return jsonify({'message': 'CSV 파일 내용을 요청 본문으로 보내주세요. (Content-Type: text/csv)'}), 400
+    reader = csv.DictReader(io.TextIOWrapper(request.stream, encoding='utf-8-sig', newline=''))
+    missing = [field for field in IMPORT_REQUIRED_FIELDS if field not in [name.strip() for name in (reader.fieldnames or [])]]
+    if missing:
+        return jsonify({'message': f"CSV 컬럼이 누락되었습니다: {', '.join(missing)}"}), 400
+
+    try:
+        reference = get_reference_data()
+    except Exception as e:
+        print(f"기준 정보 조회 오류: {e}")
+        return jsonify({'message': '기준 정보 조회 오류'}), 500
+    role_ids = {row['id'] for row in reference['roles']}
+    status_ids = {row['id'] for row in reference['statuses']}
+    default_status = default_status_id(reference['statuses'])
+    rounds = current_app.config.get('BCRYPT_LOG_ROUNDS', 12)
+
+    conn = get_db_connection()
+    if conn is None:
+        return jsonify({'message': '데이터베이스 연결 실패!'}), 500
+
+    sql_insert = """
+    INSERT INTO tb_user 
+    (name, position, department, id, phone_number, password, role_id, status, first_login_yn, created_at, updated_at, created_by, updated_by)
+    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, NOW(), NOW(), %s, %s)"""
+
+    def import_chunk(cursor, chunk):
+        """검사를 통과한 행 묶음: 기존 id 한 번에 조회 -> 비밀번호 병렬 해시 -> executemany (행별 결과 반환)"""
+        sql_exists = f"SELECT id FROM tb_user WHERE id IN ({','.join(['%s'] * len(chunk))})"
+        cursor.execute(sql_exists, tuple(user['id'] for _, user in chunk))
+        logger.info(f"[SQL/SELECT] tb_user /import_users {sql_exists}")
+        existing = {row[0] for row in cursor.fetchall()}
+
+        results = {}
+        new_rows = []
+        for line, user in chunk:
+            if user['id'] in existing:
+                results[line] = {'line': line, 'id': user['id'], 'result': 'skipped', 'message': '이미 사용 중인 이메일입니다.'}
+            else:
+                new_rows.append((line, user))
+        if not new_rows:
+            return [results[line] for line, _ in chunk], []
+
+        hashes = get_hash_pool().map(hash_password, [user['password'] for _, user in new_rows], [rounds] * len(new_rows))
+        values = [
+            (user['name'], user['position'], user['department'], user['id'], encrypt_aes(user['phone']), hashed,
+             user['role_id'], user['status'], user['first_login_yn'], created_by, created_by)
+            for (line, user), hashed in zip(new_rows, hashes)
+        ]
+        try:
+            cursor.executemany(sql_insert, values)
+            logger.info(f"[SQL/INSERT] tb_user /import_users {sql_insert} | ROWS: {len(values)}")
+            conn.commit()
+            created = new_rows
+        except Exception as e:
+            # 묶음 중 한 행이라도 실패하면 (동시 등록 등) 해당 묶음만 한 행씩 다시 넣어 실패한 행을 찾음
+            conn.rollback()
+            logger.error(f"사용자 일괄 등록 묶음 INSERT 오류, 행 단위로 재시도: {e}")
+            created = []
+            for (line, user), value in zip(new_rows, values):
+                try:
+                    cursor.execute(sql_insert, value)
+                    conn.commit()
+                    created.append((line, user))
+                except Exception as row_error:
+                    conn.rollback()
+                    results[line] = {'line': line, 'id': user['id'], 'result': 'error', 'message': str(row_error)}
+        for line, user in created:
+            results[line] = {'line': line, 'id': user['id'], 'result': 'created'}
+        return [results[line] for line, _ in chunk], [user['id'] for _, user in created]
+
+    def generate():
+        dumps = current_app.json.dumps
+        cursor = conn.cursor()
+        summary = {'created': 0, 'skipped': 0, 'error': 0}
+        written = 0
+        seen_ids = set()
+
+        def emit(items):
+            nonlocal written
+            for item in items:
+                summary[item['result']] += 1
+            text = (',' if written else '') + ','.join(dumps(item) for item in items)
+            written += len(items)
+            return text
+
+        opened = False
+        try:
+            yield '{"results": ['
+            opened = True
+            chunk, invalid = [], []
+            # 헤더가 1행이므로 데이터는 2행부터
+            for line, row in enumerate(reader, start=2):
+                user, error = validate_import_row(row, seen_ids, role_ids, status_ids, default_status)
+                if error:
+                    invalid.append({'line': line, 'id': (row.get('id') or '').strip() or None, 'result': 'error', 'message': error})
+                else:
+                    seen_ids.add(user['id'])
+                    chunk.append((line, user))
+                if len(chunk) + len(invalid) >= IMPORT_USERS_CHUNK_SIZE:
+                    results, created_ids = import_chunk(cursor, chunk) if chunk else ([], [])
+                    if created_ids:
+                        notify_change('directory', created_ids)
+                    yield emit(sorted(invalid + results, key=lambda r: r['line']))
+                    chunk, invalid = [], []
+            if chunk or invalid:
+                results, created_ids = import_chunk(cursor, chunk) if chunk else ([], [])
+                if created_ids:
+                    notify_change('directory', created_ids)
+                yield emit(sorted(invalid + results, key=lambda r: r['line']))
+            yield '], "summary": %s}' % dumps(summary)
+        except Exception as e:
+            # 스트리밍 도중에는 상태 코드를 바꿀 수 없으므로, 목록을 닫고 error 를 붙여 응답이 불완전함을 알림
+            # (이미 커밋된 묶음은 유지되며 summary 에 포함)
+            logger.error(f"사용자 일괄 등록 오류: {e}")
+            error = dumps(f'사용자 일괄 등록 중 오류가 발생했습니다. 이후 행은 처리되지 않았습니다: {e}')
+            yield ('], "summary": %s, "error": %s}' if opened else '{"summary": %s, "error": %s}') % (dumps(summary), error)
+        finally:
+            close_db(cursor, conn)
+
+    return Response(stream_with_context(generate()), mimetype='application/json')
+
 # 유저 정보 수정 API (날짜 관련 컬럼 제외)
 @admin_bp.route('/update_user', methods=['PUT', 'OPTIONS'])
 def update_user():
@@ -172,6 +377,7 @@ def update_user():
         logger.info(f"[SQL/UPDATE] tb_user /update_user{sql}")
 
         conn.commit()
+        notify_change('directory', [user_id])
         return jsonify({'message': '유저 정보가 업데이트되었습니다.'}), 200
     except Exception as e:
         conn.rollback()
@@ -209,6 +415,7 @@ def delete_user(user_id):
         logger.info(f"[SQL/UPDATE] tb_user /delete_user{sql}")
 
         conn.commit()
+        notify_change('directory', [user_id])
         return jsonify({'message': '유저가 삭제되었습니다.'}), 200
     except Exception as e:
         conn.rollback()
@@ -270,6 +477,7 @@ def update_role_id():
         logger.info(f"[SQL/UPDATE] tb_user /update_role_id{sql}")
 
         conn.commit()
+        notify_change('directory', [user_id])
         return jsonify({'message': '유저 정보가 업데이트되었습니다.'}), 200
     except Exception as e:
         conn.rollback()
@@ -279,50 +487,70 @@ def update_role_id():
         cursor.close()
         conn.close()
 
+# 권한별 허용 메뉴 설정 (기존 목록을 menu_ids 로 교체)
+@admin_bp.route('/update_role_menus', methods=['PUT', 'OPTIONS'])
+def update_role_menus():
+    if request.method == 'OPTIONS':
+        return jsonify({'message': 'CORS preflight request success'})
+    
+    # verify_and_refresh_token 사용하여 토큰 검증 및 자동 갱신
+    user_id, user_name, role_id, refresh_response, status_code = verify_and_refresh_token(request)
+    if refresh_response:
+        return refresh_response, status_code  # 자동 토큰 갱신 응답 반환
+    
+    if user_id is None:
+        return jsonify({'message': '토큰 인증 실패'}), 401
+
+    data = request.get_json() or {}
+    target_role_id = data.get('role_id')
+    menu_ids = data.get('menu_ids')
+    if not target_role_id or not isinstance(menu_ids, list):
+        return jsonify({'message': 'role_id 와 menu_ids(목록)가 필요합니다.'}), 400
+    created_by = user_name or 'SYSTEM'
+
+    conn = get_db_connection()
+    if conn is None:
+        return jsonify({'message': '데이터베이스 연결 실패!'}), 500
+    cursor = conn.cursor()
+    try:
+        sql_delete = "DELETE FROM tb_role_menu WHERE role_id = %s"
+        cursor.execute(sql_delete, (target_role_id,))
+        logger.info(f"[SQL/DELETE] tb_role_menu /update_role_menus{sql_delete}")
+
+        if menu_ids:
+            sql_insert = "INSERT INTO tb_role_menu (role_id, menu_id, created_by) VALUES (%s, %s, %s)"
+            cursor.executemany(sql_insert, [(target_role_id, menu_id, created_by) for menu_id in dict.fromkeys(menu_ids)])
+            logger.info(f"[SQL/INSERT] tb_role_menu /update_role_menus{sql_insert}")
+
+        conn.commit()
+        notify_change('reference')
+        return jsonify({'message': '권한별 메뉴가 저장되었습니다.'}), 200
+    except Exception as e:
+        conn.rollback()
+        print(f"권한별 메뉴 저장 오류: {e}")
+        return jsonify({'message': f'권한별 메뉴 저장 오류: {e}'}), 500
+    finally:
+        cursor.close()
+        conn.close()
+
 # 권한 목록 조회
 @admin_bp.route('/get_role_list', methods=['GET'])
 def get_roles():
-    conn = get_db_connection()
-    cursor = conn.cursor(dictionary=True)
     try:
-        sql = """
-            SELECT id, comment 
-            FROM tb_role 
-            ORDER BY id"""
-        cursor.execute(sql)
-        logger.info(f"[SQL/SELECT] tb_role /get_role_list{sql}")
-
-        roles = cursor.fetchall()
-        return jsonify(roles), 200
+        # 기준 정보 캐시에서 응답 (변경이 없으면 304)
+        return reference_response('roles')
     except Exception as e:
         print(f"권한 조회 오류: {e}")
         return jsonify({'message': '권한 목록 조회 오류'}), 500
-    finally:
-        cursor.close()
-        conn.close()
 
-# 직급 목록 조회
+# 직급 목록 조회 (사용자 목록 스냅샷 기준)
 @admin_bp.route('/get_position_list', methods=['GET'])
 def get_unique_position():
-    conn = get_db_connection()
-    cursor = conn.cursor(dictionary=True)
     try:
-        sql =  """
-            SELECT DISTINCT 
-            position FROM tb_user 
-            WHERE position IS NOT NULL AND position != '' 
-            ORDER BY position"""
-        cursor.execute(sql)
-        logger.info(f"[SQL/SELECT] tb_user /get_position_list{sql}")
-
-        positions = cursor.fetchall()
-        return jsonify([p['position'] for p in positions]), 200
+        return reference_response('positions')
     except Exception as e:
         print(f"직급 조회 오류: {e}")
         return jsonify({'message': '직급 목록 조회 오류'}), 500
-    finally:
-        cursor.close()
-        conn.close()
 
 @admin_bp.route('/update_status_admin', methods=['PUT', 'OPTIONS'])
 def update_status_admin():
@@ -372,6 +600,7 @@ def update_status_admin():
 
 
         conn.commit()
+        notify_change('directory', [target_user_id])
         return jsonify({'message': '상태가 업데이트되었습니다.'}), 200
 
     except jwt.ExpiredSignatureError:
@@ -386,4 +615,84 @@ def update_status_admin():
             cursor.close()
             conn.close()
         except Exception:
-            pass
\ No newline at end of file
+            pass
+
+# 여러 사용자 상태 일괄 변경 (관리자용, 한 트랜잭션)
+@admin_bp.route('/update_status_bulk', methods=['PUT', 'OPTIONS'])
+def update_status_bulk():
+    if request.method == 'OPTIONS':
+        return jsonify({'message': 'CORS preflight request success'})
+    
+    # verify_and_refresh_token 사용하여 토큰 검증 및 자동 갱신
+    user_id, user_name, role_id, refresh_response, status_code = verify_and_refresh_token(request)
+    if refresh_response:
+        return refresh_response, status_code  # 자동 토큰 갱신 응답 반환
+    
+    if user_id is None:
+        return jsonify({'message': '토큰 인증 실패'}), 401
+
+    # 여러 사용자의 상태를 한 번에 바꾸므로 관리자만 호출 가능
+    if role_id not in ADMIN_ROLES:
+        return jsonify({'message': '사용자 상태 일괄 변경 권한이 없습니다.'}), 403
+    
+    requester_user_id = user_id
+
+    data = request.get_json() or {}
+    new_status = data.get('status')
+    target_user_ids = data.get('user_ids')
+
+    # 필수 값 체크
+    if not new_status:
+        return jsonify({'message': '새 상태가 제공되지 않았습니다.'}), 400
+    if not target_user_ids or not isinstance(target_user_ids, list):
+        return jsonify({'message': '대상 사용자 ID 목록(user_ids)이 제공되지 않았습니다.'}), 400
+    target_user_ids = list(dict.fromkeys(target_user_ids))
+
+    conn = get_db_connection()
+    if conn is None:
+        return jsonify({'message': '데이터베이스 연결 실패!'}), 500
+    cursor = conn.cursor(dictionary=True)
+    try:
+        cursor.execute("SELECT id FROM tb_status WHERE id = %s", (new_status,))
+        if not cursor.fetchone():
+            return jsonify({'message': '존재하지 않는 상태입니다.'}), 400
+
+        placeholders = ','.join(['%s'] * len(target_user_ids))
+        sql_select = f"SELECT id FROM tb_user WHERE id IN ({placeholders}) AND is_delete_yn = 'N'"
+        cursor.execute(sql_select, tuple(target_user_ids))
+        logger.info(f"[SQL/SELECT] tb_user /update_status_bulk{sql_select}")
+        found = {row['id'] for row in cursor.fetchall()}
+        updated_ids = [uid for uid in target_user_ids if uid in found]
+        not_found = [uid for uid in target_user_ids if uid not in found]
+
+        if updated_ids:
+            # 상태 업데이트
+            placeholders = ','.join(['%s'] * len(updated_ids))
+            sql_update = f"UPDATE tb_user SET status = %s WHERE id IN ({placeholders})"
+            cursor.execute(sql_update, (new_status, *updated_ids))
+            logger.info(f"[SQL/UPDATE] tb_user /update_status_bulk{sql_update}")
+
+            # 변경 이력 기록 (multi-row INSERT 한 번)
+            sql_log = f"""
+                INSERT INTO tb_user_status_log (recorded_at, status_id, user_id, created_by)
+                VALUES {','.join(['(NOW(3), %s, %s, %s)'] * len(updated_ids))}"""
+            params = [value for uid in updated_ids for value in (new_status, uid, requester_user_id)]
+            cursor.execute(sql_log, tuple(params))
+            logger.info(f"[SQL/INSERT] tb_user_status_log /update_status_bulk{sql_log}")
+
+        conn.commit()
+        if updated_ids:
+            notify_change('directory', updated_ids)
+        return jsonify({
+            'message': f'{len(updated_ids)}명의 상태가 업데이트되었습니다.',
+            'updated': updated_ids,
+            'not_found': not_found,
+        }), 200
+
+    except Exception as e:
+        conn.rollback()
+        print(f"🚨 상태 일괄 업데이트 오류: {e}")
+        return jsonify({'message': '상태 일괄 업데이트 오류', 'error': str(e)}), 500
+    finally:
+        cursor.close()
+        conn.close()
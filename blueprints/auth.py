@@ -4,6 +4,7 @@ from flask_cors import cross_origin
 from datetime import datetime, timedelta, timezone
 from db import get_db_connection
 from config import SECRET_KEY
+from cache import notify_change
 from Cryptodome.Cipher import AES
 import jwt, base64, os, logging, uuid
 
@@ -540,6 +541,7 @@ def change_password():
         logger.info(f"[SQL/UPDATE] tb_user /change_password{sql_tb_user_update}")
 
         conn.commit()
+        notify_change('directory', [user_id])  # first_login_yn 변경 반영
         return jsonify({'message': '비밀번호가 성공적으로 변경되었습니다.'}), 200
 
     except Exception as e:
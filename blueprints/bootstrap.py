@@ -0,0 +1,134 @@
+from flask import Blueprint, request, jsonify, current_app
+import logging
+from collections import defaultdict
+from db import get_db_connection
+from config import REFERENCE_CACHE_MAX_AGE
+from cache import VersionedCache, make_etag, etag_response
+from blueprints.auth import verify_and_refresh_token
+from blueprints.user import user_directory
+
+bootstrap_bp = Blueprint('bootstrap', __name__)
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+# 기준 정보(상태/권한/부서/메뉴) 캐시
+# 상태/부서/메뉴 쓰기 API 에서 notify_change('reference') 로 세대 번호를 올리면 다음 조회 때 다시 읽는다.
+# 직급 목록과 조직도 인원 수는 사용자 목록 스냅샷('directory')에서 계산한다.
+reference_cache = VersionedCache('reference', maxsize=4)
+reference_body_cache = VersionedCache('reference', 'directory', maxsize=16)
+
+# /bootstrap 만 max-age 동안 브라우저 캐시 사용 (화면 초기 로딩용)
+# 기존 목록 API(상태/권한/직급/부서/메뉴)는 관리 화면이 쓰기 직후 다시 조회하므로 매번 ETag 로 재검증
+BOOTSTRAP_CACHE_CONTROL = f'private, max-age={REFERENCE_CACHE_MAX_AGE}'
+REFERENCE_CACHE_CONTROL = 'private, no-cache'
+
+def _load_reference_tables():
+    conn = get_db_connection()
+    if conn is None:
+        raise RuntimeError('데이터베이스 연결 실패!')
+    cursor = conn.cursor(dictionary=True)
+    try:
+        data = {}
+        for key, sql in (
+            ('statuses', "SELECT id, comment FROM tb_status ORDER BY comment"),
+            ('roles', "SELECT id, comment FROM tb_role ORDER BY id"),
+            ('departments', "SELECT * FROM tb_department ORDER BY dpr_nm desc"),
+            ('menus', "SELECT * FROM tb_menu ORDER BY menu_order ASC"),
+        ):
+            cursor.execute(sql)
+            logger.info(f"[SQL/SELECT] reference_cache {sql}")
+            data[key] = cursor.fetchall()
+        return data
+    finally:
+        cursor.close()
+        conn.close()
+
+def get_reference_data():
+    """상태/권한/부서/메뉴 목록 (세대 번호가 바뀔 때만 DB 조회)"""
+    version = reference_cache.current_version()
+    data = reference_cache.get('tables', version)
+    if data is None:
+        data = _load_reference_tables()
+        reference_cache.set('tables', version, data)
+    return data
+
+def get_positions():
+    """사용 중인 직급 목록 (사용자 목록 스냅샷 기준, 정렬)"""
+    return sorted({u.position for u in user_directory.sorted_users() if u.position})
+
+def build_department_tree(departments, users, include_members=False):
+    """부서 -> 팀 -> 인원 수 트리 (tb_department 한 행이 팀 하나, team_nm 이 없으면 부서 직속)
+
+    어느 부서에도 속하지 않는 사용자는 unassigned 로 따로 집계한다.
+    """
+    members = defaultdict(list)
+    for user in users:
+        members[user.department].append(user.id)
+
+    tree = {}
+    for row in departments:
+        team_ids = members.pop(row['dpr_id'], [])
+        team = {
+            'dpr_id': row['dpr_id'],
+            'team_nm': row['team_nm'],
+            'label': f"{row['dpr_nm']} - {row['team_nm']}" if row['team_nm'] else row['dpr_nm'],
+            'member_count': len(team_ids),
+        }
+        if include_members:
+            team['member_ids'] = team_ids
+        node = tree.setdefault(row['dpr_nm'], {'name': row['dpr_nm'], 'member_count': 0, 'teams': []})
+        node['member_count'] += len(team_ids)
+        node['teams'].append(team)
+
+    for node in tree.values():
+        node['teams'].sort(key=lambda t: (t['team_nm'] is not None, t['team_nm'] or ''))
+    unassigned_ids = [uid for ids in members.values() for uid in ids]
+    unassigned = {'member_count': len(unassigned_ids)}
+    if include_members:
+        unassigned['member_ids'] = unassigned_ids
+    return {'departments': [tree[name] for name in sorted(tree)], 'unassigned': unassigned}
+
+def get_department_tree(include_members=False):
+    return build_department_tree(get_reference_data()['departments'], user_directory.sorted_users(), include_members)
+
+# 응답 이름 -> 응답 본문 구성 (기존 개별 목록 API 의 응답 형태 유지)
+REFERENCE_BODIES = {
+    'bootstrap': lambda: dict(get_reference_data(), positions=get_positions()),
+    'statuses': lambda: {'statuses': get_reference_data()['statuses']},
+    'roles': lambda: get_reference_data()['roles'],
+    'positions': get_positions,
+    'departments': lambda: {'departments': get_reference_data()['departments']},
+    'menus': lambda: {'menus': get_reference_data()['menus']},
+    'department_tree': get_department_tree,
+    'department_tree_members': lambda: get_department_tree(include_members=True),
+}
+
+def reference_response(name, cache_control=REFERENCE_CACHE_CONTROL):
+    """기준 정보 응답 (직렬화 결과 캐시 + 강한 ETag, 같으면 304)"""
+    version = reference_body_cache.current_version()
+    cached = reference_body_cache.get(name, version)
+    if cached is None:
+        body = current_app.json.dumps(REFERENCE_BODIES[name]()).encode('utf-8')
+        cached = (body, make_etag(body))
+        reference_body_cache.set(name, version, cached)
+    return etag_response(*cached, cache_control=cache_control)
+
+# 화면 초기 로딩용 기준 정보 일괄 조회
+@bootstrap_bp.route('/bootstrap', methods=['GET', 'OPTIONS'])
+def bootstrap():
+    if request.method == 'OPTIONS':
+        return jsonify({'message': 'CORS preflight request success'})
+
+    # verify_and_refresh_token 사용하여 토큰 검증 및 자동 갱신
+    user_id, user_name, role_id, refresh_response, status_code = verify_and_refresh_token(request)
+    if refresh_response:
+        return refresh_response, status_code  # 자동 토큰 갱신 응답 반환
+
+    if user_id is None:
+        return jsonify({'message': '토큰 인증 실패'}), 401
+
+    try:
+        return reference_response('bootstrap', cache_control=BOOTSTRAP_CACHE_CONTROL)
+    except Exception as e:
+        print(f"기준 정보 조회 오류: {e}")
+        return jsonify({'message': '기준 정보 조회 오류'}), 500
@@ -4,6 +4,8 @@ from db import get_db_connection
 from config import SECRET_KEY
 from datetime import datetime
 from blueprints.auth import verify_and_refresh_token
+from cache import notify_change
+from blueprints.bootstrap import reference_response, REFERENCE_CACHE_CONTROL
 
 department_bp = Blueprint('department', __name__, url_prefix='/department')
 logger = logging.getLogger(__name__)
@@ -23,23 +25,33 @@ def get_department_list():
     if user_id is None:
         return jsonify({'message': '토큰 인증 실패'}), 401
 
-    conn = get_db_connection()
-    if conn is None:
-        return jsonify({'message': '데이터베이스 연결 실패!'}), 500
-
-    cursor = conn.cursor(dictionary=True)
     try:
-        sql = "SELECT * FROM tb_department ORDER BY dpr_nm desc"
-        cursor.execute(sql)
-        departments = cursor.fetchall()
-        logger.info(f"[SQL/SELECT] {sql})")
-        
-        return jsonify({'departments': departments}), 200
+        # 기준 정보 캐시에서 응답 (변경이 없으면 304)
+        return reference_response('departments')
     except Exception as e:
         return jsonify({'message': f'부서 목록 조회 실패: {str(e)}'}), 500
-    finally:
-        cursor.close()
-        conn.close()
+
+# 조직도 조회 (부서 -> 팀 -> 인원 수, include_members=Y 면 팀별 사용자 id 포함)
+@department_bp.route('/tree', methods=['GET', 'OPTIONS'])
+def get_department_tree():
+    if request.method == 'OPTIONS':
+        return jsonify({'message': 'CORS preflight request success'})
+    
+    # verify_and_refresh_token 사용하여 토큰 검증 및 자동 갱신
+    user_id, user_name, role_id, refresh_response, status_code = verify_and_refresh_token(request)
+    if refresh_response:
+        return refresh_response, status_code  # 자동 토큰 갱신 응답 반환
+    
+    if user_id is None:
+        return jsonify({'message': '토큰 인증 실패'}), 401
+
+    try:
+        # 부서 변경('reference') 또는 사용자 부서 이동('directory') 시에만 다시 계산 (변경이 없으면 304)
+        # 부서 이동이 바로 반영되도록 max-age 없이 매번 ETag 로 재검증 (Calendar 의 member_ids 필터)
+        name = 'department_tree_members' if request.args.get('include_members') == 'Y' else 'department_tree'
+        return reference_response(name, cache_control=REFERENCE_CACHE_CONTROL)
+    except Exception as e:
+        return jsonify({'message': f'조직도 조회 실패: {str(e)}'}), 500
 
 # 특정 부서 조회
 @department_bp.route('/get_department/<string:dpr_id>', methods=['GET', 'OPTIONS'])
@@ -108,6 +120,7 @@ def create_department():
         VALUES (%s, %s, %s, %s, %s)"""
         cursor.execute(sql, (dpr_id, dpr_nm, team_nm, created_by, created_by))
         conn.commit()
+        notify_change('reference')
         logger.info(f"[SQL/INSERT] {sql} | PARAMS: ({dpr_id}, {dpr_nm}, {team_nm}, {created_by})")
         return jsonify({'message': '부서가 성공적으로 추가되었습니다.'}), 201
     except Exception as e:
@@ -148,6 +161,8 @@ def update_department(dpr_id):
         cursor.execute(sql, (dpr_nm, team_nm, updated_by, dpr_id))
         logger.info(f"[SQL/UPDATE] {sql} | PARAMS: ({dpr_nm}, {team_nm}, {updated_by})")
         conn.commit()
+        notify_change('directory')  # 부서명/팀명이 사용자 목록에 포함됨
+        notify_change('reference')
 
         if cursor.rowcount == 0:
             return jsonify({'message': '부서를 찾을 수 없습니다.'}), 404
@@ -183,6 +198,8 @@ def delete_department(dpr_id):
         cursor.execute(sql, (dpr_id,))
         logger.info(f"[SQL/DELETE] {sql} | PARAMS: ({dpr_id})")
         conn.commit()
+        notify_change('directory')
+        notify_change('reference')
 
         if cursor.rowcount == 0:
             return jsonify({'message': '부서를 찾을 수 없습니다.'}), 404
@@ -4,6 +4,7 @@ from db import get_db_connection
 from config import SECRET_KEY
 from blueprints.auth import decrypt_aes, decrypt_deterministic, encrypt_deterministic  # 이메일 복호화 함수
 from blueprints.auth import verify_and_refresh_token
+from blueprints.user import user_directory, get_favorite_ids
 
 favorite_bp = Blueprint('favorite', __name__, url_prefix='/favorite')
 logger = logging.getLogger(__name__)
@@ -33,30 +34,27 @@ def toggle_favorite():
             return jsonify({'message': '데이터베이스 연결 실패!'}), 500
         cursor = conn.cursor()
 
-        # 암호화된 ID를 사용하여 즐겨찾기 여부 확인
-        sql_tb_favorite_select = """
-            SELECT * FROM tb_favorite 
-            WHERE user_id = %s AND favorite_user_id = %s"""
-        cursor.execute(sql_tb_favorite_select, (user_id, favorite_user_id))
-        logger.info(f"[SQL/SELECT] tb_favorite /toggle_favorite{sql_tb_favorite_select}")
-        
-        favorite = cursor.fetchone()
-        if favorite:
-            # 이미 즐겨찾기 상태이면 삭제 (즐겨찾기 해제)
-            sql_tb_favorite_delete = "DELETE FROM tb_favorite WHERE user_id = %s AND favorite_user_id = %s"
-            cursor.execute(sql_tb_favorite_delete, (user_id, favorite_user_id))
-            logger.info(f"[SQL/DELETE] tb_favorite /toggle_favorite{sql_tb_favorite_delete}")
-            conn.commit()
+        # 이미 즐겨찾기 상태이면 삭제 (즐겨찾기 해제)
+        sql_tb_favorite_delete = "DELETE FROM tb_favorite WHERE user_id = %s AND favorite_user_id = %s"
+        cursor.execute(sql_tb_favorite_delete, (user_id, favorite_user_id))
+        logger.info(f"[SQL/DELETE] tb_favorite /toggle_favorite{sql_tb_favorite_delete}")
+        if cursor.rowcount > 0:
             response_message = '즐겨찾기가 삭제되었습니다.'
         else:
-            # 즐겨찾기가 없으면 새로 추가
+            # 삭제된 행이 없으면 새로 추가
+            # - 없는 사용자면 tb_user 에서 선택되는 행이 없어 추가되지 않음 (404)
+            # - 동시 요청이 먼저 추가했으면 uq_favorite_user 충돌을 UPDATE 로 처리 (오류 없이 즐겨찾기 상태 유지)
             sql_tb_favorite_insert = """
                 INSERT INTO tb_favorite (user_id, favorite_user_id, is_favorite_yn) 
-                VALUES (%s, %s, 'y')"""
+                SELECT %s, id, 'y' FROM tb_user WHERE id = %s
+                ON DUPLICATE KEY UPDATE is_favorite_yn = 'y'"""
             cursor.execute(sql_tb_favorite_insert, (user_id, favorite_user_id))
             logger.info(f"[SQL/INSERT] tb_favorite /toggle_favorite{sql_tb_favorite_insert}")
-            conn.commit()
+            if cursor.rowcount == 0:
+                conn.rollback()
+                return jsonify({'message': '즐겨찾기할 사용자를 찾을 수 없습니다.'}), 404
             response_message = '즐겨찾기가 추가되었습니다.'
+        conn.commit()
         return jsonify({'message': response_message}), 200
     except Exception as e:
         print(f"즐겨찾기 오류: {e}")
@@ -68,6 +66,80 @@ def toggle_favorite():
         except Exception:
             pass
 
+# 즐겨찾기 목록 일괄 설정 (요청 목록에 없는 즐겨찾기는 해제, 한 트랜잭션)
+@favorite_bp.route('/set_favorites', methods=['POST', 'OPTIONS'])
+def set_favorites():
+    if request.method == 'OPTIONS':
+        return jsonify({'message': 'CORS preflight request success'})
+    
+    # verify_and_refresh_token 사용하여 토큰 검증 및 자동 갱신
+    user_id, user_name, role_id, refresh_response, status_code = verify_and_refresh_token(request)
+    if refresh_response:
+        return refresh_response, status_code  # 자동 토큰 갱신 응답 반환
+    
+    if user_id is None:
+        return jsonify({'message': '토큰 인증 실패'}), 401
+
+    data = request.get_json() or {}
+    user_id = data.get('user_id')
+    favorite_user_ids = data.get('favorite_user_ids')
+    if not user_id or not isinstance(favorite_user_ids, list):
+        return jsonify({'message': 'user_id 와 favorite_user_ids(목록)가 필요합니다.'}), 400
+    favorite_user_ids = list(dict.fromkeys(favorite_user_ids))
+
+    conn = get_db_connection()
+    if conn is None:
+        return jsonify({'message': '데이터베이스 연결 실패!'}), 500
+    cursor = conn.cursor()
+    try:
+        # 없는 사용자 id 확인 (FK 오류 대신 400)
+        if favorite_user_ids:
+            sql_tb_user_select = f"SELECT id FROM tb_user WHERE id IN ({','.join(['%s'] * len(favorite_user_ids))})"
+            cursor.execute(sql_tb_user_select, tuple(favorite_user_ids))
+            logger.info(f"[SQL/SELECT] tb_user /set_favorites{sql_tb_user_select}")
+            unknown = set(favorite_user_ids) - {row[0] for row in cursor.fetchall()}
+            if unknown:
+                return jsonify({'message': '존재하지 않는 사용자가 포함되어 있습니다.', 'unknown_user_ids': sorted(unknown)}), 400
+
+        # 목록에 없는 즐겨찾기 해제
+        sql_tb_favorite_delete = "DELETE FROM tb_favorite WHERE user_id = %s"
+        params = [user_id]
+        if favorite_user_ids:
+            sql_tb_favorite_delete += f" AND favorite_user_id NOT IN ({','.join(['%s'] * len(favorite_user_ids))})"
+            params.extend(favorite_user_ids)
+        cursor.execute(sql_tb_favorite_delete, tuple(params))
+        logger.info(f"[SQL/DELETE] tb_favorite /set_favorites{sql_tb_favorite_delete}")
+        removed = cursor.rowcount
+
+        # 목록 중 아직 즐겨찾기가 아닌 사용자만 추가
+        # (동시 요청이 먼저 추가한 행은 uq_favorite_user 충돌을 UPDATE 로 처리)
+        added = 0
+        if favorite_user_ids:
+            sql_tb_favorite_insert = f"""
+                INSERT INTO tb_favorite (user_id, favorite_user_id, is_favorite_yn) 
+                SELECT %s, u.id, 'y'
+                FROM tb_user u
+                WHERE u.id IN ({','.join(['%s'] * len(favorite_user_ids))})
+                  AND NOT EXISTS (
+                      SELECT 1 FROM tb_favorite f
+                      WHERE f.user_id = %s AND f.favorite_user_id = u.id
+                  )
+                ON DUPLICATE KEY UPDATE is_favorite_yn = 'y'"""
+            params = [user_id, *favorite_user_ids, user_id]
+            cursor.execute(sql_tb_favorite_insert, tuple(params))
+            logger.info(f"[SQL/INSERT] tb_favorite /set_favorites{sql_tb_favorite_insert}")
+            added = cursor.rowcount
+
+        conn.commit()
+        return jsonify({'message': '즐겨찾기 목록이 저장되었습니다.', 'added': added, 'removed': removed}), 200
+    except Exception as e:
+        conn.rollback()
+        print(f"즐겨찾기 일괄 설정 오류: {e}")
+        return jsonify({'message': '즐겨찾기 일괄 설정 오류'}), 500
+    finally:
+        cursor.close()
+        conn.close()
+
 @favorite_bp.route('/get_favorites', methods=['GET', 'OPTIONS'])
 def get_favorites():
     if request.method == 'OPTIONS':
@@ -83,48 +155,23 @@ def get_favorites():
     
     try:
         user_id = request.args.get('user_id')
-        conn = get_db_connection()
-        if conn is None:
-            return jsonify({'message': '데이터베이스 연결 실패!'}), 500
-        cursor = conn.cursor(dictionary=True)
-        # tb_favorite와 tb_user를 조인하여 필요한 정보를 가져옵니다.
-        # 기존의 u.email 대신 u.id를 사용합니다.
-        sql = """
-        SELECT 
-            u.id, 
-            u.name, 
-            u.position, 
-            d.dpr_nm AS department_name, 
-            d.team_nm AS team_name, 
-            u.phone_number,
-            COALESCE(u.status, 'NULL') AS status
-        FROM 
-            tb_favorite f
-        JOIN 
-            tb_user u ON f.favorite_user_id = u.id
-        LEFT JOIN 
-            tb_department d ON u.department = d.dpr_id
-        WHERE 
-            f.user_id = %s"""
-
-        cursor.execute(sql, (user_id,))
-        logger.info(f"[SQL/SELECT] tb_favorite, tb_user /get_favorites{sql}")
-        favorites = cursor.fetchall()
-
-        for fav in favorites:
-            try:
-                fav['phone_number'] = decrypt_aes(fav['phone_number'])
-            except Exception as decryption_error:
-                print(f"복호화 오류: {decryption_error}")
-                return jsonify({'message': '사용자 정보 복호화 실패'}), 500
+        # 사용자 정보는 사용자 목록 스냅샷에서 가져옴 (tb_user 재조인, 전화번호 재복호화 없음)
+        favorites = []
+        for favorite_user_id in dict.fromkeys(get_favorite_ids(user_id)):
+            user = user_directory.get(favorite_user_id)
+            if user is None:
+                continue
+            favorites.append({
+                'id': user.id,
+                'name': user.name,
+                'position': user.position,
+                'department_name': user.department_name,
+                'team_name': user.team_name,
+                'phone_number': user.phone_number,
+                'status': user.status if user.status is not None else 'NULL',
+            })
 
         return jsonify({'favorite': favorites}), 200
     except Exception as e:
         print(f"즐겨찾기 목록 조회 오류: {e}")
         return jsonify({'message': '즐겨찾기 목록 조회 오류'}), 500
-    finally:
-        try:
-            cursor.close()
-            conn.close()
-        except Exception:
-            pass
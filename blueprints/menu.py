@@ -1,13 +1,158 @@
-from flask import Blueprint, request, jsonify
-import jwt, logging
+from flask import Blueprint, request, jsonify, current_app
+import jwt, logging, time
 from db import get_db_connection
 from config import SECRET_KEY
 from blueprints.auth import verify_and_refresh_token
+from blueprints.bootstrap import reference_response
+from cache import IncrementalState, notify_change, make_etag, etag_response
 
 menu_bp = Blueprint('menu', __name__, url_prefix='/menu')
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+# 권한 정보 로딩 실패 후 다시 시도하기까지 대기 시간 (초, 그동안 요청마다 DB 를 다시 읽지 않음)
+PERMISSION_RETRY_SECONDS = 5
+
+# 권한 정보 없이도 응답하는 경로 (정적 파일/SPA, 헬스 체크, 로그인/토큰 갱신/로그아웃)
+PERMISSION_EXEMPT_ENDPOINTS = {
+    'serve_react', 'health_check', 'compression_health',
+    'auth.login', 'auth.refresh_token', 'auth.logout',
+}
+
+class PermissionMatrix(IncrementalState):
+    """권한 -> 허용 메뉴 / 허용 API 경로 (tb_role, tb_menu, tb_role_menu 를 읽어 미리 계산)
+
+    - 메뉴/권한 매핑 변경 시 notify_change('reference') 로 다음 요청 때 다시 읽음
+    - endpoint_prefix 가 있는 메뉴는 해당 경로로 시작하는 API 를 그 메뉴가 허용된 권한만 호출 가능
+      (여러 접두사가 겹치면 가장 긴 접두사 기준)
+    """
+    version_names = ('reference',)
+
+    def __init__(self):
+        super().__init__()
+        self.prefixes = []   # (endpoint_prefix, menu_id), 긴 접두사 먼저
+        self.allowed = {}    # role_id -> {menu_id}
+        self.bodies = {}     # role_id -> (내 메뉴 응답 본문, ETag)
+        self.loaded = False  # 한 번이라도 읽기에 성공했는지
+        self.failed_at = None
+
+    def try_refresh(self):
+        """권한 정보를 최신으로 맞춤 (사용할 권한 정보가 있으면 True)
+
+        다시 읽기에 실패하면 마지막으로 읽은 권한 정보를 그대로 사용하고,
+        PERMISSION_RETRY_SECONDS 동안은 다시 읽지 않는다.
+        한 번도 읽지 못했을 때만 False 를 반환한다.
+        """
+        if self.failed_at is not None and time.time() - self.failed_at < PERMISSION_RETRY_SECONDS:
+            return self.loaded
+        try:
+            self.ensure_fresh()
+        except Exception as e:
+            logger.error(f"권한 정보 로딩 오류 (이전 권한 정보 사용: {self.loaded}): {e}")
+            self.failed_at = time.time()
+            return self.loaded
+        self.failed_at = None
+        return True
+
+    def rebuild(self):
+        conn = get_db_connection()
+        if conn is None:
+            raise RuntimeError('데이터베이스 연결 실패!')
+        cursor = conn.cursor(dictionary=True)
+        try:
+            queries = {
+                'roles': "SELECT id FROM tb_role",
+                'menus': "SELECT * FROM tb_menu ORDER BY menu_order ASC",
+                'role_menus': "SELECT role_id, menu_id FROM tb_role_menu",
+            }
+            data = {}
+            for key, sql in queries.items():
+                cursor.execute(sql)
+                logger.info(f"[SQL/SELECT] PermissionMatrix {sql}")
+                data[key] = cursor.fetchall()
+        finally:
+            cursor.close()
+            conn.close()
+
+        allowed = {row['id']: set() for row in data['roles']}
+        for row in data['role_menus']:
+            allowed.setdefault(row['role_id'], set()).add(row['menu_id'])
+
+        self.allowed = allowed
+        self.prefixes = sorted(
+            ((m['endpoint_prefix'], m['menu_id']) for m in data['menus'] if m.get('endpoint_prefix')),
+            key=lambda p: len(p[0]), reverse=True,
+        )
+        self.bodies = {}
+        for role, menu_ids in allowed.items():
+            menus = [m for m in data['menus'] if m['menu_id'] in menu_ids]
+            body = current_app.json.dumps({'menus': menus}).encode('utf-8')
+            self.bodies[role] = (body, make_etag(body))
+        self.loaded = True
+
+    def required_menu(self, path):
+        """경로에 해당하는 메뉴 id (제한 없는 경로면 None)"""
+        for prefix, menu_id in self.prefixes:
+            if path.startswith(prefix):
+                return menu_id
+        return None
+
+    def is_allowed(self, role_id, menu_id):
+        return menu_id in self.allowed.get(role_id, ())
+
+    def my_menu(self, role_id):
+        self.ensure_fresh()
+        body = self.bodies.get(role_id)
+        if body is None:
+            body = current_app.json.dumps({'menus': []}).encode('utf-8')
+            body = (body, make_etag(body))
+        return body
+
+permission_matrix = PermissionMatrix()
+
+# 모든 요청 공통 권한 검사 (메뉴에 연결된 API 경로만 검사, 그 외 경로는 토큰 해석도 하지 않음)
+@menu_bp.before_app_request
+def enforce_menu_permission():
+    # 정적 파일/SPA 경로, 헬스 체크, 로그인/토큰 갱신은 권한 검사 대상이 아님
+    if request.method == 'OPTIONS' or request.endpoint in PERMISSION_EXEMPT_ENDPOINTS:
+        return None
+    if not permission_matrix.try_refresh():
+        # 권한 정보를 한 번도 읽지 못했으면 제한 대상인지도 알 수 없으므로 거부 (통과시키지 않음)
+        return jsonify({'message': '권한 정보를 확인할 수 없습니다. 잠시 후 다시 시도해 주세요.'}), 503
+    menu_id = permission_matrix.required_menu(request.path)
+    if menu_id is None:
+        return None
+
+    auth_header = request.headers.get('Authorization', '')
+    try:
+        payload = jwt.decode(auth_header.split(' ')[-1], SECRET_KEY, algorithms=["HS256"])
+    except jwt.InvalidTokenError:
+        return None  # 토큰 없음/만료/오류는 각 API 의 verify_and_refresh_token 에서 처리 (401 또는 토큰 갱신)
+
+    if not permission_matrix.is_allowed(payload.get('role_id'), menu_id):
+        logger.info(f"[AUTH] 권한 없음: user={payload.get('user_id')} role={payload.get('role_id')} path={request.path}")
+        return jsonify({'message': '접근 권한이 없습니다.'}), 403
+    return None
+
+# 내 메뉴 조회 (로그인한 사용자 권한에 허용된 메뉴, DB 조회 없음)
+@menu_bp.route('/my_menu', methods=['GET', 'OPTIONS'])
+def get_my_menu():
+    if request.method == 'OPTIONS':
+        return jsonify({'message': 'CORS preflight request success'})
+    
+    # verify_and_refresh_token 사용하여 토큰 검증 및 자동 갱신
+    user_id, user_name, role_id, refresh_response, status_code = verify_and_refresh_token(request)
+    if refresh_response:
+        return refresh_response, status_code  # 자동 토큰 갱신 응답 반환
+    
+    if user_id is None:
+        return jsonify({'message': '토큰 인증 실패'}), 401
+
+    try:
+        return etag_response(*permission_matrix.my_menu(role_id))
+    except Exception as e:
+        return jsonify({'message': f'메뉴 조회 실패: {str(e)}'}), 500
+
 # 메뉴 목록 조회
 @menu_bp.route('/get_menu_list', methods=['GET', 'OPTIONS'])
 def get_menu_list():
@@ -22,19 +167,11 @@ def get_menu_list():
     if user_id is None:
         return jsonify({'message': '토큰 인증 실패'}), 401
     
-    conn = get_db_connection()
-    cursor = conn.cursor(dictionary=True)
     try:
-        sql = "SELECT * FROM tb_menu ORDER BY menu_order ASC"
-        cursor.execute(sql)
-        menus = cursor.fetchall()
-        logger.info(f"[SQL/SELECT] {sql}")
-        return jsonify({'menus': menus}), 200
+        # 기준 정보 캐시에서 응답 (변경이 없으면 304)
+        return reference_response('menus')
     except Exception as e:
         return jsonify({'message': f'메뉴 조회 실패: {str(e)}'}), 500
-    finally:
-        cursor.close()
-        conn.close()
 
 # 메뉴 추가
 @menu_bp.route('/create_menu', methods=['POST', 'OPTIONS'])
@@ -54,6 +191,7 @@ def create_menu():
     menu_id = data.get('menu_id')
     menu_nm = data.get('menu_nm')
     menu_order = data.get('menu_order', 0)
+    endpoint_prefix = data.get('endpoint_prefix') or None
     created_by = user_name or 'SYSTEM'
 
     if not menu_id or not menu_nm:
@@ -72,10 +210,11 @@ def create_menu():
             return jsonify({'message': '이미 존재하는 menu_id입니다.'}), 400
         
         sql = """
-        INSERT INTO tb_menu (menu_id, menu_nm, menu_order, created_by, updated_by)
-        VALUES (%s, %s, %s, %s, %s)"""
-        cursor.execute(sql, (menu_id, menu_nm, menu_order, created_by, created_by))
+        INSERT INTO tb_menu (menu_id, menu_nm, menu_order, endpoint_prefix, created_by, updated_by)
+        VALUES (%s, %s, %s, %s, %s, %s)"""
+        cursor.execute(sql, (menu_id, menu_nm, menu_order, endpoint_prefix, created_by, created_by))
         conn.commit()
+        notify_change('reference')
         logger.info(f"[SQL/INSERT] {sql} | PARAMS: ({menu_id}, {menu_nm}, {menu_order})")
         return jsonify({'message': '메뉴가 추가되었습니다.'}), 201
     except Exception as e:
@@ -109,12 +248,18 @@ def update_menu(menu_id):
     conn = get_db_connection()
     cursor = conn.cursor()
     try:
-        sql = """
+        # endpoint_prefix 는 요청에 포함된 경우에만 수정 (빈 값이면 API 제한 해제)
+        prefix_clause = ", endpoint_prefix = %s" if 'endpoint_prefix' in data else ""
+        params = [menu_nm, menu_order, updated_by]
+        if prefix_clause:
+            params.append(data.get('endpoint_prefix') or None)
+        sql = f"""
         UPDATE tb_menu
-        SET menu_nm = %s, menu_order = %s, updated_by = %s, updated_at = NOW()
+        SET menu_nm = %s, menu_order = %s, updated_by = %s, updated_at = NOW(){prefix_clause}
         WHERE menu_id = %s"""
-        cursor.execute(sql, (menu_nm, menu_order, updated_by, menu_id))
+        cursor.execute(sql, (*params, menu_id))
         conn.commit()
+        notify_change('reference')
         logger.info(f"[SQL/UPDATE] {sql} | PARAMS: ({menu_nm}, {menu_order})")
 
         if cursor.rowcount == 0:
@@ -148,6 +293,7 @@ def delete_menu(menu_id):
         sql = "DELETE FROM tb_menu WHERE menu_id = %s"
         cursor.execute(sql, (menu_id,))
         conn.commit()
+        notify_change('reference')
         logger.info(f"[SQL/DELETE] {sql} | PARAMS: ({menu_id})")
 
         if cursor.rowcount == 0:
@@ -1,14 +1,210 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app, send_file
 from db import get_db_connection
 from datetime import datetime, timezone
+from html.parser import HTMLParser
 from config import SECRET_KEY
 from blueprints.auth import verify_and_refresh_token
-import logging, jwt
+from cache import IncrementalState, notify_change, make_etag, etag_response
+from blobstore import put_blob, find_blob
+import logging, jwt, base64, json, re
+from bisect import bisect_right
 
 notice_bp = Blueprint('notice', __name__, url_prefix='/notice')
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+NOTICE_SUMMARY_LENGTH = 200
+DEFAULT_NOTICE_PAGE_SIZE = 50
+MAX_NOTICE_PAGE_SIZE = 100
+
+class _TextExtractor(HTMLParser):
+    """Quill HTML 에서 본문 텍스트만 추출 (이미지 등 태그 속성은 무시)"""
+    BLOCK_TAGS = {'p', 'div', 'br', 'li', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'blockquote', 'pre', 'tr'}
+
+    def __init__(self):
+        super().__init__()
+        self.parts = []
+        self._skip = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in ('script', 'style'):
+            self._skip += 1
+        elif tag in self.BLOCK_TAGS:
+            self.parts.append(' ')
+
+    def handle_endtag(self, tag):
+        if tag in ('script', 'style') and self._skip:
+            self._skip -= 1
+        elif tag in self.BLOCK_TAGS:
+            self.parts.append(' ')
+
+    def handle_data(self, data):
+        if not self._skip:
+            self.parts.append(data)
+
+def make_notice_summary(content, length=NOTICE_SUMMARY_LENGTH):
+    """공지 본문(HTML)의 앞부분 일반 텍스트 요약"""
+    extractor = _TextExtractor()
+    extractor.feed(content or '')
+    extractor.close()
+    text = ' '.join(''.join(extractor.parts).split())
+    return text if len(text) <= length else text[:length - 1] + '…'
+
+# 본문에 base64 로 포함된 이미지 (Quill 에디터 기본 동작)
+DATA_IMAGE_RE = re.compile(r'src=(["\'])data:(image/[a-zA-Z0-9.+-]+);base64,([A-Za-z0-9+/=\s]+)\1')
+# 화면에서 API 주소를 붙인 이미지 경로 (저장 시 다시 상대 경로로)
+BLOB_URL_RE = re.compile(r'src=(["\'])[^"\']*?/notice/blob/([0-9a-f]{64})\1')
+BLOB_URL_PATH = '/notice/blob/'
+BLOB_MAX_AGE = 365 * 24 * 60 * 60
+
+def externalize_images(content):
+    """본문의 base64 이미지를 blob 저장소로 옮기고 src 를 /notice/blob/<sha256> 로 바꾼 HTML 반환"""
+    def save(match):
+        quote, mimetype, encoded = match.groups()
+        try:
+            sha = put_blob(base64.b64decode(''.join(encoded.split()), validate=True), mimetype.lower())
+        except Exception as e:
+            # 지원하지 않는 형식이거나 깨진 데이터는 그대로 둠
+            logger.warning(f"공지 이미지 분리 실패 ({mimetype}): {e}")
+            return match.group(0)
+        return f'src={quote}{BLOB_URL_PATH}{sha}{quote}'
+
+    content = DATA_IMAGE_RE.sub(save, content or '')
+    return BLOB_URL_RE.sub(lambda m: f'src={m.group(1)}{BLOB_URL_PATH}{m.group(2)}{m.group(1)}', content)
+
+def compact_read_state(read_through_id, read_ids, active_ids):
+    """읽음 상태 정리: 기준점 바로 다음 공지들을 연달아 읽었으면 기준점을 앞으로 옮기고 예외 목록에서 뺌"""
+    read_ids = {i for i in read_ids if i > read_through_id}
+    idx = bisect_right(active_ids, read_through_id)
+    while idx < len(active_ids) and active_ids[idx] in read_ids:
+        read_through_id = active_ids[idx]
+        idx += 1
+    return read_through_id, {i for i in read_ids if i > read_through_id}
+
+class NoticeReadState(IncrementalState):
+    """게시 중인 공지 id 목록 (안 읽은 공지 수 계산용)
+
+    - 공지 생성/수정/삭제/복구 시 notify_change('notice', [notice_id]) 로 다시 읽음
+    - 사용자별 읽음 상태('이 id 까지 모두 읽음' 기준점 + 기준점 이후에 읽은 id 예외 목록)는
+      프로세스에 캐시하지 않고 요청마다 tb_notice_read 에서 기본 키로 한 행만 읽는다.
+      (읽음 처리는 가장 잦은 쓰기라서 전역 버전으로 관리하면 다른 워커가 매번 전체를 다시 읽게 됨)
+    """
+    version_names = ('notice',)
+
+    def __init__(self):
+        super().__init__()
+        self.active_ids = []       # 게시 중인 공지 id (정렬)
+        self.active_set = set()
+
+    def rebuild(self):
+        conn = get_db_connection()
+        if conn is None:
+            raise RuntimeError('데이터베이스 연결 실패!')
+        cursor = conn.cursor()
+        try:
+            sql = "SELECT id FROM tb_notice WHERE is_delete_yn = 'N' ORDER BY id"
+            cursor.execute(sql)
+            logger.info(f"[SQL/SELECT] tb_notice NoticeReadState{sql}")
+            self.active_ids = [row[0] for row in cursor.fetchall()]
+            self.active_set = set(self.active_ids)
+        finally:
+            cursor.close()
+            conn.close()
+
+    def apply(self, name, changes):
+        self.rebuild()
+
+    def last_id(self):
+        self.ensure_fresh()
+        with self.lock:
+            return self.active_ids[-1] if self.active_ids else 0
+
+    def unread_count(self, read_state):
+        """안 읽은 게시 중 공지 수 (기준점 이후 공지 수 - 예외 목록 중 게시 중인 공지 수)"""
+        read_through_id, read_ids = read_state
+        self.ensure_fresh()
+        with self.lock:
+            after = len(self.active_ids) - bisect_right(self.active_ids, read_through_id)
+            return after - sum(1 for i in read_ids if i in self.active_set)
+
+notice_read_state = NoticeReadState()
+
+def _parse_read_ids(value):
+    if not value:
+        return set()
+    if isinstance(value, (bytes, bytearray)):
+        value = value.decode('utf-8')
+    return set(json.loads(value) if isinstance(value, str) else value)
+
+def load_read_state(user_id, cursor=None, for_update=False):
+    """tb_notice_read 에서 사용자 읽음 상태 조회 (행이 없으면 아무것도 읽지 않은 상태)"""
+    sql = "SELECT read_through_id, read_ids FROM tb_notice_read WHERE user_id = %s"
+    if for_update:
+        sql += " FOR UPDATE"
+    own = cursor is None
+    if own:
+        conn = get_db_connection()
+        if conn is None:
+            raise RuntimeError('데이터베이스 연결 실패!')
+        cursor = conn.cursor()
+    try:
+        cursor.execute(sql, (user_id,))
+        logger.info(f"[SQL/SELECT] tb_notice_read load_read_state(){sql}")
+        row = cursor.fetchone()
+        if isinstance(row, dict):
+            row = (row['read_through_id'], row['read_ids'])
+        return (row[0], _parse_read_ids(row[1])) if row else (0, set())
+    finally:
+        if own:
+            cursor.close()
+            conn.close()
+
+def is_read(read_state, notice_id):
+    read_through_id, read_ids = read_state
+    return notice_id <= read_through_id or notice_id in read_ids
+
+def save_read_state(user_id, update):
+    """사용자 읽음 상태를 잠금 후 갱신 (update(기준점, 예외목록) -> (기준점, 예외목록))"""
+    conn = get_db_connection()
+    if conn is None:
+        raise RuntimeError('데이터베이스 연결 실패!')
+    cursor = conn.cursor()
+    try:
+        read_through_id, read_ids = load_read_state(user_id, cursor, for_update=True)
+        notice_read_state.ensure_fresh()
+        with notice_read_state.lock:
+            active_ids = list(notice_read_state.active_ids)
+        read_through_id, read_ids = compact_read_state(*update(read_through_id, read_ids), active_ids)
+        sql = """
+            INSERT INTO tb_notice_read (user_id, read_through_id, read_ids)
+            VALUES (%s, %s, %s) AS new
+            ON DUPLICATE KEY UPDATE read_through_id = new.read_through_id, read_ids = new.read_ids"""
+        cursor.execute(sql, (user_id, read_through_id, json.dumps(sorted(read_ids))))
+        logger.info(f"[SQL/INSERT] tb_notice_read save_read_state(){sql}")
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+        conn.close()
+
+def mark_notice_read(user_id, notice_id):
+    """공지 1건 읽음 처리 (이미 읽은 공지면 DB 쓰기 없음)"""
+    if is_read(load_read_state(user_id), notice_id):
+        return
+    save_read_state(user_id, lambda through, read_ids: (through, read_ids | {notice_id}))
+
+def encode_notice_cursor(notice):
+    return base64.urlsafe_b64encode(json.dumps([notice['created_at'].isoformat(sep=' '), notice['id']]).encode('utf-8')).decode('ascii')
+
+def decode_notice_cursor(cursor_str):
+    try:
+        created_at, notice_id = json.loads(base64.urlsafe_b64decode(cursor_str.encode('ascii')))
+        return datetime.fromisoformat(created_at), int(notice_id)
+    except Exception:
+        raise ValueError('유효하지 않은 cursor 입니다.')
+
 # 공지사항 목록 조회 (삭제되지 않은 공지만)
 @notice_bp.route('/get_notice_list', methods=['GET', 'OPTIONS'])
 def get_notices():
@@ -23,23 +219,51 @@ def get_notices():
     if user_id is None:
         return jsonify({'message': '토큰 인증 실패'}), 401
 
+    # (created_at, id) 키셋 페이지네이션 (limit 이 없으면 DEFAULT_NOTICE_PAGE_SIZE, 다음 페이지는 next_cursor 로)
+    last = None
+    try:
+        limit = min(int(request.args.get('limit') or DEFAULT_NOTICE_PAGE_SIZE), MAX_NOTICE_PAGE_SIZE)
+    except ValueError:
+        return jsonify({'message': 'limit 은 숫자여야 합니다.'}), 400
+    if limit < 1:
+        return jsonify({'message': 'limit 은 1 이상이어야 합니다.'}), 400
+    if request.args.get('cursor'):
+        try:
+            last = decode_notice_cursor(request.args['cursor'])
+        except ValueError as e:
+            return jsonify({'message': str(e)}), 400
+
     conn = get_db_connection()
     if conn is None:
         return jsonify({'message': '데이터베이스 연결 실패!'}), 500
 
     cursor = conn.cursor(dictionary=True)
     try:
-        # 작성자 이름을 함께 조회하도록 수정
+        # 본문(content) 대신 요약만 조회 (본문은 /get_notice/<id> 에서)
         sql = """
-        SELECT n.*, u.name AS created_by_name
+        SELECT n.id, n.title, n.summary, n.user_id, n.created_by, n.updated_by,
+               n.created_at, n.updated_at, n.is_delete_yn, u.name AS created_by_name
         FROM tb_notice n
         LEFT JOIN tb_user u ON n.user_id = u.id
-        WHERE n.is_delete_yn = 'N'
-        ORDER BY n.created_at DESC"""
-        cursor.execute(sql)
+        WHERE n.is_delete_yn = 'N'"""
+        params = []
+        if last:
+            sql += " AND (n.created_at < %s OR (n.created_at = %s AND n.id < %s))"
+            params.extend([last[0], last[0], last[1]])
+        sql += " ORDER BY n.created_at DESC, n.id DESC LIMIT %s"
+        params.append(limit + 1)  # 다음 페이지 존재 여부 확인용 1건 추가
+        cursor.execute(sql, tuple(params))
+        logger.info(f"[SQL/SELECT] tb_notice, tb_user /get_notice_list{sql}")
 
         notices = cursor.fetchall()
-        return jsonify({'notices': notices}), 200
+        next_cursor = None
+        if len(notices) > limit:
+            notices = notices[:limit]
+            next_cursor = encode_notice_cursor(notices[-1])
+        read_state = load_read_state(user_id, cursor)
+        for notice in notices:
+            notice['is_read'] = is_read(read_state, notice['id'])
+        return jsonify({'notices': notices, 'next_cursor': next_cursor}), 200
     except Exception as e:
         return jsonify({'message': f'공지사항 조회 실패: {str(e)}'}), 500
     finally:
@@ -71,11 +295,21 @@ def get_notice(notice_id):
         WHERE id = %s AND is_delete_yn = 'N'"""
         cursor.execute(sql, (notice_id,))
         logger.info(f"[SQL/SELECT] {sql} | PARAMS: {notice_id}")
-        
+
         notice = cursor.fetchone()
-        if notice:
-            return jsonify({'notice': notice}), 200
-        return jsonify({'message': '공지사항을 찾을 수 없습니다.'}), 404
+        if not notice:
+            return jsonify({'message': '공지사항을 찾을 수 없습니다.'}), 404
+
+        # 응답 본문 기반 ETag (updated_at 은 초 단위라 같은 초 안의 수정을 구분하지 못함)
+        # 클라이언트가 가진 것과 같으면 본문 없이 304
+        body = current_app.json.dumps({'notice': notice}).encode('utf-8')
+        response = etag_response(body, make_etag(body))
+
+        try:
+            mark_notice_read(user_id, notice_id)
+        except Exception as e:
+            logger.error(f"공지사항 읽음 처리 오류: {e}")
+        return response
     except Exception as e:
         logger.error(f"공지사항 조회 오류: {e}")
         return jsonify({'message': '공지사항 조회 실패!'}), 500
@@ -83,6 +317,61 @@ def get_notice(notice_id):
         cursor.close()
         conn.close()
 
+# 공지 본문 이미지 조회
+# <img> 태그는 인증 헤더를 보낼 수 없으므로 토큰 검증 없이 제공 (SHA-256 해시를 알아야만 접근 가능)
+# 내용이 바뀌면 해시도 바뀌므로 immutable 로 캐시하고, Range 요청과 sendfile 은 send_file 이 처리한다.
+@notice_bp.route('/blob/<string:sha>', methods=['GET'])
+def get_notice_blob(sha):
+    found = find_blob(sha)
+    if found is None:
+        return jsonify({'message': '파일을 찾을 수 없습니다.'}), 404
+    path, mimetype = found
+    response = send_file(path, mimetype=mimetype, conditional=True, etag=sha, max_age=BLOB_MAX_AGE)
+    response.headers['Cache-Control'] = f'public, max-age={BLOB_MAX_AGE}, immutable'
+    return response
+
+# 안 읽은 공지사항 수 조회 (게시 중인 공지 목록은 메모리, 사용자 읽음 상태는 tb_notice_read 한 행)
+@notice_bp.route('/unread_count', methods=['GET', 'OPTIONS'])
+def get_unread_count():
+    if request.method == 'OPTIONS':
+        return jsonify({'message': 'CORS preflight request success'})
+    
+    # verify_and_refresh_token 사용하여 토큰 검증 및 자동 갱신
+    user_id, user_name, role_id, refresh_response, status_code = verify_and_refresh_token(request)
+    if refresh_response:
+        return refresh_response, status_code  # 자동 토큰 갱신 응답 반환
+    
+    if user_id is None:
+        return jsonify({'message': '토큰 인증 실패'}), 401
+
+    try:
+        return jsonify({'unread_count': notice_read_state.unread_count(load_read_state(user_id))}), 200
+    except Exception as e:
+        logger.error(f"안 읽은 공지사항 수 조회 오류: {e}")
+        return jsonify({'message': '안 읽은 공지사항 수 조회 실패!'}), 500
+
+# 공지사항 모두 읽음 처리
+@notice_bp.route('/mark_all_read', methods=['POST', 'OPTIONS'])
+def mark_all_read():
+    if request.method == 'OPTIONS':
+        return jsonify({'message': 'CORS preflight request success'})
+    
+    # verify_and_refresh_token 사용하여 토큰 검증 및 자동 갱신
+    user_id, user_name, role_id, refresh_response, status_code = verify_and_refresh_token(request)
+    if refresh_response:
+        return refresh_response, status_code  # 자동 토큰 갱신 응답 반환
+    
+    if user_id is None:
+        return jsonify({'message': '토큰 인증 실패'}), 401
+
+    try:
+        last_id = notice_read_state.last_id()
+        save_read_state(user_id, lambda through, read_ids: (max(through, last_id), read_ids))
+        return jsonify({'message': '모든 공지사항을 읽음 처리했습니다.', 'unread_count': 0}), 200
+    except Exception as e:
+        logger.error(f"공지사항 읽음 처리 오류: {e}")
+        return jsonify({'message': '공지사항 읽음 처리 실패!'}), 500
+
 # 공지사항 생성
 @notice_bp.route('/create_notice', methods=['POST', 'OPTIONS'])
 def create_notice():
@@ -118,13 +407,15 @@ def create_notice():
 
         if not title or not content:
             return jsonify({'message': '제목과 내용을 입력해야 합니다.'}), 400
+        content = externalize_images(content)
 
         # 공지사항 생성 시 작성자 이름 저장
         sql = """
-        INSERT INTO tb_notice (title, content, user_id, created_by, updated_by)
-        VALUES (%s, %s, %s, %s, %s)"""
-        cursor.execute(sql, (title, content, user_id, created_by, created_by))
+        INSERT INTO tb_notice (title, content, summary, user_id, created_by, updated_by)
+        VALUES (%s, %s, %s, %s, %s, %s)"""
+        cursor.execute(sql, (title, content, make_notice_summary(content), user_id, created_by, created_by))
         conn.commit()
+        notify_change('notice', [cursor.lastrowid])
 
         return jsonify({'message': '공지사항이 성공적으로 등록되었습니다.'}), 201
 
@@ -164,16 +455,18 @@ def update_notice(notice_id):
 
     cursor = conn.cursor()
     try:
+        content = externalize_images(content)
         sql = """
         UPDATE tb_notice 
-        SET title = %s, content = %s, updated_by = %s, updated_at = NOW()
+        SET title = %s, content = %s, summary = %s, updated_by = %s, updated_at = NOW()
         WHERE id = %s AND is_delete_yn = 'N'"""
-        cursor.execute(sql, (title, content, updated_by, notice_id))
+        cursor.execute(sql, (title, content, make_notice_summary(content), updated_by, notice_id))
         conn.commit()
         logger.info(f"[SQL/UPDATE] {sql} | PARAMS: ({title}, {content}, {updated_by}, {notice_id})")
 
         if cursor.rowcount == 0:
             return jsonify({'message': '공지사항을 찾을 수 없거나 삭제된 상태입니다.'}), 404
+        notify_change('notice', [notice_id])
 
         return jsonify({'message': '공지사항이 성공적으로 수정되었습니다.'}), 200
     except Exception as e:
@@ -216,6 +509,7 @@ def delete_notice(notice_id):
 
         if cursor.rowcount == 0:
             return jsonify({'message': '공지사항을 찾을 수 없거나 이미 삭제되었습니다.'}), 404
+        notify_change('notice', [notice_id])
 
         return jsonify({'message': '공지사항이 성공적으로 삭제(비활성화)되었습니다.'}), 200
     except Exception as e:
@@ -258,6 +552,7 @@ def restore_notice(notice_id):
 
         if cursor.rowcount == 0:
             return jsonify({'message': '삭제된 공지사항을 찾을 수 없습니다.'}), 404
+        notify_change('notice', [notice_id])
 
         return jsonify({'message': '공지사항이 성공적으로 복구되었습니다.'}), 200
     except Exception as e:
@@ -266,3 +561,61 @@ def restore_notice(notice_id):
     finally:
         cursor.close()
         conn.close()
+
+@notice_bp.cli.command('backfill-summary')
+def backfill_summary_command():
+    """요약(summary)이 없는 공지사항의 요약 생성"""
+    conn = get_db_connection()
+    if conn is None:
+        print("데이터베이스 연결 실패!")
+        return
+    cursor = conn.cursor()
+    try:
+        last_id, count = 0, 0
+        while True:
+            cursor.execute(
+                "SELECT id, content FROM tb_notice WHERE summary IS NULL AND id > %s ORDER BY id LIMIT 100",
+                (last_id,))
+            rows = cursor.fetchall()
+            if not rows:
+                break
+            cursor.executemany("UPDATE tb_notice SET summary = %s WHERE id = %s",
+                               [(make_notice_summary(content), notice_id) for notice_id, content in rows])
+            conn.commit()
+            last_id = rows[-1][0]
+            count += len(rows)
+        print(f"공지사항 요약 생성 완료 ({count}건)")
+    finally:
+        cursor.close()
+        conn.close()
+
+@notice_bp.cli.command('migrate-images')
+def migrate_images_command():
+    """기존 공지 본문의 base64 이미지를 blob 저장소로 옮김 (수정 시각은 유지)"""
+    conn = get_db_connection()
+    if conn is None:
+        print("데이터베이스 연결 실패!")
+        return
+    cursor = conn.cursor()
+    try:
+        last_id, count = 0, 0
+        while True:
+            cursor.execute(
+                "SELECT id, content FROM tb_notice WHERE id > %s AND content LIKE %s ORDER BY id LIMIT 20",
+                (last_id, '%src=_data:image/%'))
+            rows = cursor.fetchall()
+            if not rows:
+                break
+            for notice_id, content in rows:
+                new_content = externalize_images(content)
+                if new_content != content:
+                    cursor.execute(
+                        "UPDATE tb_notice SET content = %s, updated_at = updated_at WHERE id = %s",
+                        (new_content, notice_id))
+                    count += 1
+            conn.commit()
+            last_id = rows[-1][0]
+        print(f"공지 본문 이미지 분리 완료 ({count}건)")
+    finally:
+        cursor.close()
+        conn.close()
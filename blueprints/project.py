@@ -1,8 +1,10 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, Response, stream_with_context, current_app
 import jwt, logging
-from db import get_db_connection
-from config import SECRET_KEY
-from datetime import datetime
+import numpy as np
+from db import get_db_connection, close_db
+from config import SECRET_KEY, PROJECT_CAPACITY, LEAVE_KEYWORDS
+from datetime import datetime, date, timedelta
+from cache import VersionedCache, IncrementalState, notify_change
 from blueprints.auth import decrypt_deterministic, encrypt_deterministic, decrypt_aes
 from blueprints.auth import verify_and_refresh_token
 
@@ -16,15 +18,408 @@ def parse_date(date_str: str) -> str:
             return None  # 빈 문자열 또는 "None" 문자열이면 None 반환
 
         if isinstance(date_str, str) and "," in date_str:
+            # 구버전 응답 형식 (RFC 1123, JSON_LEGACY_DATES=Y 일 때)
             return datetime.strptime(date_str, '%a, %d %b %Y %H:%M:%S %Z').strftime('%Y-%m-%d')
         elif isinstance(date_str, str):
-            # 이미 "YYYY-MM-DD" 형식일 경우
-            return date_str
+            # ISO-8601 ("YYYY-MM-DD" 또는 "YYYY-MM-DDTHH:MM:SSZ") 이면 날짜 부분만 사용
+            return date_str[:10]
         else:
             raise ValueError("Invalid date format")
     except Exception as e:
         raise ValueError(f"날짜 형식 오류: {date_str} - {e}")
-    
+
+# "YYYY-MM" 또는 "YYYY-MM-DD" 문자열을 해당 월의 1일(date)로 변환
+def parse_month(month_str: str):
+    try:
+        return datetime.strptime(month_str[:7], '%Y-%m').date()
+    except Exception as e:
+        raise ValueError(f"월 형식 오류: {month_str} - {e}")
+
+# 인력 현황 행렬 캐시 (프로젝트 참여 정보나 사용자 목록이 바뀌면 자동 무효화)
+staffing_cache = VersionedCache('assignment', 'directory')
+MAX_STAFFING_MONTHS = 120
+
+def build_staffing_matrix(user_ids, assignments, first_month, month_count):
+    """사용자 × 월 투입률 행렬 계산
+
+    셀 값 = 그 달에 참여한 일수 / 그 달의 일수 (여러 프로젝트에 참여하면 합산)
+    """
+    first = np.datetime64(first_month, 'M')
+    month_bounds = np.arange(first, first + month_count + 1).astype('datetime64[D]')
+    matrix = np.zeros((len(user_ids), month_count))
+    if assignments:
+        row_of = {uid: i for i, uid in enumerate(user_ids)}
+        rows = np.array([row_of[a['user_id']] for a in assignments])
+        starts = np.array([a['start_date'] for a in assignments], dtype='datetime64[D]')
+        ends = np.array([a['end_date'] for a in assignments], dtype='datetime64[D]') + 1  # 종료일 포함
+
+        # (참여 건수 × 월) 구간 교집합 일수를 한 번에 계산
+        overlap_start = np.maximum(starts[:, None], month_bounds[None, :-1])
+        overlap_end = np.minimum(ends[:, None], month_bounds[None, 1:])
+        days = np.clip((overlap_end - overlap_start).astype(np.int64), 0, None)
+        month_days = np.diff(month_bounds).astype(np.int64)
+
+        np.add.at(matrix, rows, days / month_days)
+    return np.round(matrix, 2)
+
+def find_user_conflicts(user_id, assignments, leaves, capacity=PROJECT_CAPACITY):
+    """한 사용자의 프로젝트 참여 구간과 휴가 구간을 스윕라인으로 검사해 충돌 목록 반환
+
+    - over_allocation: 동시에 참여 중인 프로젝트 수가 capacity 를 넘는 구간
+    - leave_clash: 휴가 일정과 프로젝트 참여 기간이 겹치는 구간
+    정렬 한 번(O(n log n)) + 선형 스캔으로 처리한다.
+    """
+    # (날짜, 0=종료/1=시작, 종류, 인덱스) - 종료일은 다음 날(배타적)로 변환해서 같은 날의 시작보다 먼저 처리
+    events = []
+    for i, a in enumerate(assignments):
+        events.append((a['start_date'], 1, 'assignment', i))
+        events.append((a['end_date'] + timedelta(days=1), 0, 'assignment', i))
+    for i, l in enumerate(leaves):
+        events.append((l['start_date'], 1, 'leave', i))
+        events.append((l['end_date'] + timedelta(days=1), 0, 'leave', i))
+    events.sort(key=lambda e: (e[0], e[1]))
+
+    conflicts = []
+    active_assignments = {}
+    active_leaves = {}
+    over_since = None  # 현재 과다 배정 구간의 시작일
+
+    idx = 0
+    while idx < len(events):
+        day = events[idx][0]
+        group_end = idx
+        while group_end < len(events) and events[group_end][0] == day:
+            group_end += 1
+        assignments_changed = any(e[2] == 'assignment' for e in events[idx:group_end])
+
+        # 참여 프로젝트 구성이 바뀌기 전에 진행 중이던 과다 배정 구간을 닫는다
+        if over_since is not None and assignments_changed:
+            conflicts.append({
+                'type': 'over_allocation',
+                'user_id': user_id,
+                'start_date': over_since,
+                'end_date': day - timedelta(days=1),
+                'project_codes': sorted(a['project_code'] for a in active_assignments.values()),
+                'count': len(active_assignments),
+                'capacity': capacity,
+            })
+            over_since = None
+
+        for _, is_start, kind, i in events[idx:group_end]:
+            if kind == 'assignment':
+                if not is_start:
+                    active_assignments.pop(i, None)
+                    continue
+                assignment = assignments[i]
+                active_assignments[i] = assignment
+                for leave in active_leaves.values():
+                    conflicts.append(_leave_clash(user_id, assignment, leave))
+            else:
+                if not is_start:
+                    active_leaves.pop(i, None)
+                    continue
+                leave = leaves[i]
+                active_leaves[i] = leave
+                for assignment in active_assignments.values():
+                    conflicts.append(_leave_clash(user_id, assignment, leave))
+
+        idx = group_end
+
+        if over_since is None and len(active_assignments) > capacity:
+            over_since = day
+
+    conflicts.sort(key=lambda c: (c['start_date'], c['type']))
+    return conflicts
+
+def _leave_clash(user_id, assignment, leave):
+    return {
+        'type': 'leave_clash',
+        'user_id': user_id,
+        'start_date': max(assignment['start_date'], leave['start_date']),
+        'end_date': min(assignment['end_date'], leave['end_date']),
+        'project_codes': [assignment['project_code']],
+        'schedule_id': leave['id'],
+        'task': leave['task'],
+    }
+
+class ConflictIndex(IncrementalState):
+    """사용자별 배정 충돌 목록 (프로젝트 참여/일정 변경 시 해당 사용자만 다시 계산)"""
+    version_names = ('assignment', 'schedule')
+
+    def __init__(self):
+        super().__init__()
+        self.by_user = {}
+
+    def rebuild(self):
+        self.by_user = self._compute(None)
+
+    def apply(self, name, changes):
+        user_ids = set(changes)
+        if not user_ids:
+            return
+        computed = self._compute(user_ids)
+        for uid in user_ids:
+            if computed.get(uid):
+                self.by_user[uid] = computed[uid]
+            else:
+                self.by_user.pop(uid, None)
+
+    def _compute(self, user_ids):
+        conn = get_db_connection()
+        if conn is None:
+            raise RuntimeError('데이터베이스 연결 실패!')
+        cursor = conn.cursor(dictionary=True)
+        try:
+            user_filter, params = "", ()
+            if user_ids is not None:
+                user_filter = f" AND pu.user_id IN ({','.join(['%s'] * len(user_ids))})"
+                params = tuple(user_ids)
+            sql_assignments = f"""
+                SELECT pu.user_id, pu.project_code, pu.start_date, pu.end_date
+                FROM tb_project_user pu
+                JOIN tb_project p ON p.project_code = pu.project_code AND p.is_delete_yn = 'N'
+                WHERE pu.is_delete_yn = 'N'{user_filter}"""
+            cursor.execute(sql_assignments, params)
+            logger.info(f"[SQL/SELECT] tb_project_user, tb_project ConflictIndex{sql_assignments}")
+            assignments = cursor.fetchall()
+
+            leave_conditions = " OR ".join(["task LIKE %s OR status LIKE %s"] * len(LEAVE_KEYWORDS)) or "FALSE"
+            leave_params = tuple(p for k in LEAVE_KEYWORDS for p in (f"%{k}%", f"%{k}%"))
+            sql_leaves = f"""
+                SELECT id, user_id, task, start_date, end_date
+                FROM tb_schedule
+                WHERE ({leave_conditions}){user_filter.replace('pu.', '')}"""
+            cursor.execute(sql_leaves, leave_params + params)
+            logger.info(f"[SQL/SELECT] tb_schedule ConflictIndex{sql_leaves}")
+            leaves = cursor.fetchall()
+        finally:
+            cursor.close()
+            conn.close()
+
+        intervals = {}
+        for a in assignments:
+            intervals.setdefault(a['user_id'], ([], []))[0].append(a)
+        for l in leaves:
+            # DATETIME 으로 저장된 일정도 날짜 단위로 비교
+            for key in ('start_date', 'end_date'):
+                if isinstance(l[key], datetime):
+                    l[key] = l[key].date()
+            intervals.setdefault(l['user_id'], ([], []))[1].append(l)
+
+        result = {}
+        for uid, (user_assignments, user_leaves) in intervals.items():
+            conflicts = find_user_conflicts(uid, user_assignments, user_leaves)
+            if conflicts:
+                result[uid] = conflicts
+        return result
+
+    def conflicts(self, user_id=None):
+        self.ensure_fresh()
+        with self.lock:
+            if user_id is not None:
+                return list(self.by_user.get(user_id, []))
+            return [c for uid in sorted(self.by_user) for c in self.by_user[uid]]
+
+conflict_index = ConflictIndex()
+
+class CurrentAssignmentIndex(IncrementalState):
+    """오늘 날짜 기준 사용자별 참여 중인 프로젝트 (날짜가 바뀌거나 참여 정보가 바뀌면 갱신)"""
+    version_names = ('assignment',)
+
+    def __init__(self):
+        super().__init__()
+        self.date = None
+        self.by_user = {}
+
+    def ensure_fresh(self):
+        today = date.today()
+        if today != self.date:
+            with self.lock:
+                if today != self.date:
+                    self.date = today
+                    self.versions = None  # 날짜가 바뀌면 전체 재구성
+        super().ensure_fresh()
+
+    def rebuild(self):
+        self.by_user = load_assignments_on(self.date)
+
+    def apply(self, name, changes):
+        user_ids = set(changes)
+        if not user_ids:
+            return
+        loaded = load_assignments_on(self.date, user_ids)
+        for uid in user_ids:
+            if loaded.get(uid):
+                self.by_user[uid] = loaded[uid]
+            else:
+                self.by_user.pop(uid, None)
+
+    def assignments(self, user_id=None):
+        self.ensure_fresh()
+        with self.lock:
+            if user_id is not None:
+                return {user_id: self.by_user[user_id]} if user_id in self.by_user else {}
+            return dict(self.by_user)
+
+def load_assignments_on(target_date, user_ids=None):
+    """target_date 에 참여 중인 프로젝트를 사용자별로 조회 (idx_project_user_period 사용)"""
+    conn = get_db_connection()
+    if conn is None:
+        raise RuntimeError('데이터베이스 연결 실패!')
+    cursor = conn.cursor(dictionary=True)
+    try:
+        sql = """
+            SELECT pu.user_id, pu.project_code, p.project_name, p.status, pu.start_date, pu.end_date
+            FROM tb_project_user pu
+            JOIN tb_project p ON p.project_code = pu.project_code AND p.is_delete_yn = 'N'
+            WHERE pu.is_delete_yn = 'N' AND pu.start_date <= %s AND pu.end_date >= %s"""
+        params = [target_date, target_date]
+        if user_ids:
+            sql += f" AND pu.user_id IN ({','.join(['%s'] * len(user_ids))})"
+            params.extend(user_ids)
+        sql += " ORDER BY pu.user_id, pu.start_date"
+        cursor.execute(sql, tuple(params))
+        logger.info(f"[SQL/SELECT] tb_project_user, tb_project load_assignments_on(){sql}")
+
+        by_user = {}
+        for row in cursor.fetchall():
+            by_user.setdefault(row.pop('user_id'), []).append(row)
+        return by_user
+    finally:
+        cursor.close()
+        conn.close()
+
+current_assignment_index = CurrentAssignmentIndex()
+
+# 프로젝트 현황 집계 (tb_project_summary, tb_project_headcount_monthly)
+SUMMARY_DIMENSIONS = ('status', 'category', 'group_name')
+
+def _to_date(value):
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, str):
+        return datetime.strptime(parse_date(value)[:10], '%Y-%m-%d').date()
+    return value
+
+def _month_keys(start_date, end_date):
+    """start_date ~ end_date 가 걸쳐 있는 월 목록 ('YYYY-MM')"""
+    start_date, end_date = _to_date(start_date), _to_date(end_date)
+    year, month = start_date.year, start_date.month
+    while (year, month) <= (end_date.year, end_date.month):
+        yield f"{year:04d}-{month:02d}"
+        month += 1
+        if month > 12:
+            year, month = year + 1, 1
+
+def adjust_project_summary(cursor, project, delta):
+    """프로젝트 1건의 status/category/group_name 집계를 delta 만큼 증감 (커밋 전 같은 트랜잭션에서 호출)"""
+    sql = """
+        INSERT INTO tb_project_summary (dimension, value, project_count)
+        VALUES (%s, %s, %s)
+        ON DUPLICATE KEY UPDATE project_count = project_count + %s"""
+    for dim in SUMMARY_DIMENSIONS:
+        cursor.execute(sql, (dim, project.get(dim) or '', delta, delta))
+    logger.info(f"[SQL/INSERT] tb_project_summary adjust_project_summary(){sql}")
+
+def user_months(cursor, user_ids):
+    """사용자별 참여 중인 월 집합 {user_id: {'YYYY-MM', ...}} (삭제되지 않은 프로젝트 기준)
+
+    같은 트랜잭션 안에서 변경 전/후에 한 번씩 호출해서 adjust_headcount 에 넘긴다.
+    """
+    user_ids = list(user_ids)
+    months = {user_id: set() for user_id in user_ids}
+    if not user_ids:
+        return months
+    sql = f"""
+        SELECT pu.user_id, pu.start_date, pu.end_date
+        FROM tb_project_user pu
+        JOIN tb_project p ON p.project_code = pu.project_code AND p.is_delete_yn = 'N'
+        WHERE pu.is_delete_yn = 'N' AND pu.user_id IN ({', '.join(['%s'] * len(user_ids))})"""
+    cursor.execute(sql, tuple(user_ids))
+    logger.info(f"[SQL/SELECT] tb_project_user, tb_project user_months(){sql}")
+    for row in cursor.fetchall():
+        if isinstance(row, dict):
+            row = (row['user_id'], row['start_date'], row['end_date'])
+        months.setdefault(row[0], set()).update(_month_keys(row[1], row[2]))
+    return months
+
+def adjust_headcount(cursor, before, after):
+    """변경 전/후 사용자별 참여 월(user_months 결과)을 비교해서 월별 투입 인원(중복 없는 사용자 수)을 증감
+
+    한 사용자가 같은 달에 여러 프로젝트에 참여해도 1명으로 센다.
+    """
+    month_deltas = {}
+    for user_id in before.keys() | after.keys():
+        old_months, new_months = before.get(user_id, set()), after.get(user_id, set())
+        for month in new_months - old_months:
+            month_deltas[month] = month_deltas.get(month, 0) + 1
+        for month in old_months - new_months:
+            month_deltas[month] = month_deltas.get(month, 0) - 1
+    month_deltas = {month: delta for month, delta in month_deltas.items() if delta}
+    if not month_deltas:
+        return
+    sql = """
+        INSERT INTO tb_project_headcount_monthly (month, headcount)
+        VALUES (%s, %s)
+        ON DUPLICATE KEY UPDATE headcount = headcount + %s"""
+    for month, delta in sorted(month_deltas.items()):
+        cursor.execute(sql, (month, delta, delta))
+    logger.info(f"[SQL/INSERT] tb_project_headcount_monthly adjust_headcount(){sql}")
+
+def recompute_project_summary():
+    """집계 테이블 전체 재계산 (증분 갱신 중 생긴 오차를 바로잡는 주기 작업)"""
+    conn = get_db_connection()
+    if conn is None:
+        raise RuntimeError('데이터베이스 연결 실패!')
+    cursor = conn.cursor()
+    try:
+        sql_periods = """
+            SELECT pu.user_id, pu.start_date, pu.end_date
+            FROM tb_project_user pu
+            JOIN tb_project p ON p.project_code = pu.project_code AND p.is_delete_yn = 'N'
+            WHERE pu.is_delete_yn = 'N'"""
+        cursor.execute(sql_periods)
+        logger.info(f"[SQL/SELECT] tb_project_user, tb_project recompute_project_summary(){sql_periods}")
+        month_users = {}  # 'YYYY-MM' -> {user_id} (같은 달 여러 프로젝트 참여는 1명)
+        for participant_id, start_date, end_date in cursor.fetchall():
+            for month in _month_keys(start_date, end_date):
+                month_users.setdefault(month, set()).add(participant_id)
+        month_counts = {month: len(users) for month, users in month_users.items()}
+
+        cursor.execute("DELETE FROM tb_project_summary")
+        sql_summary = """
+            INSERT INTO tb_project_summary (dimension, value, project_count)
+            SELECT 'status', COALESCE(status, ''), COUNT(*) FROM tb_project
+            WHERE is_delete_yn = 'N' GROUP BY COALESCE(status, '')
+            UNION ALL
+            SELECT 'category', COALESCE(category, ''), COUNT(*) FROM tb_project
+            WHERE is_delete_yn = 'N' GROUP BY COALESCE(category, '')
+            UNION ALL
+            SELECT 'group_name', COALESCE(group_name, ''), COUNT(*) FROM tb_project
+            WHERE is_delete_yn = 'N' GROUP BY COALESCE(group_name, '')"""
+        cursor.execute(sql_summary)
+        logger.info(f"[SQL/INSERT] tb_project_summary recompute_project_summary(){sql_summary}")
+
+        cursor.execute("DELETE FROM tb_project_headcount_monthly")
+        if month_counts:
+            sql_headcount = "INSERT INTO tb_project_headcount_monthly (month, headcount) VALUES (%s, %s)"
+            cursor.executemany(sql_headcount, sorted(month_counts.items()))
+            logger.info(f"[SQL/INSERT] tb_project_headcount_monthly recompute_project_summary(){sql_headcount}")
+
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+        conn.close()
+
+@project_bp.cli.command('recompute-summary')
+def recompute_summary_command():
+    """프로젝트 현황 집계 테이블 전체 재계산"""
+    recompute_project_summary()
+    print("프로젝트 현황 집계 재계산 완료")
+
 # 모든 프로젝트 조회 (tb_project와 tb_project_user를 조인)
 @project_bp.route('/get_all_project', methods=['GET', 'OPTIONS'])
 def get_all_project():
@@ -285,6 +680,8 @@ def add_project():
         VALUES
         (%s, %s, %s, %s, %s, 'N', NOW(), NOW(), %s, %s)
         """
+        participant_ids = {participant.get("id") for participant in participants if participant.get("id")}
+        months_before = user_months(cursor, participant_ids)
         for participant in participants:
             participant_id = participant.get("id")
             start_date = participant.get("start_date", business_start_date)
@@ -295,7 +692,13 @@ def add_project():
 
             cursor.execute(sql_project_user, (project_code, participant_id, start_date, end_date, current_project_yn, created_by, created_by))
             logger.info(f"[SQL/INSERT] tb_project_user /add_project{sql_project_user}")
+
+        # 현황 집계 증분 갱신
+        adjust_project_summary(cursor, {'status': status, 'category': category, 'group_name': group_name}, 1)
+        adjust_headcount(cursor, months_before, user_months(cursor, participant_ids))
         conn.commit()
+        notify_change('assignment', [participant.get("id") for participant in participants])
+        notify_change('project', [project_code])
         return jsonify({'message': '프로젝트가 추가되었습니다.'}), 201
     except Exception as e:
         print(f"프로젝트 추가 오류: {e}")
@@ -360,7 +763,7 @@ def edit_project():
         # 기존 프로젝트 조회
         cursor = conn.cursor(dictionary=True)
         sql_select_project = """
-            SELECT project_code FROM tb_project
+            SELECT project_code, status, category, group_name FROM tb_project
             WHERE project_code = %s AND is_delete_yn = 'N'"""
         cursor.execute(sql_select_project, (new_project_code,))
         logger.info(f"[SQL/SELECT] tb_project /edit_project{sql_select_project}")
@@ -410,6 +813,12 @@ def edit_project():
 
         # tb_project_user 업데이트: 기존 참여자 논리 삭제 후 재등록
         cursor = conn.cursor()
+        cursor.execute("SELECT user_id, start_date, end_date FROM tb_project_user WHERE project_code = %s AND is_delete_yn = 'N'", (old_project_code,))
+        old_participants = cursor.fetchall()
+        affected_user_ids = {row[0] for row in old_participants}
+        affected_user_ids.update(participant.get("user_id") or participant.get("id") for participant in participants)
+        affected_user_ids.discard(None)
+        months_before = user_months(cursor, affected_user_ids)
         cursor.execute("UPDATE tb_project_user SET is_delete_yn = 'Y', updated_at = NOW(), updated_by = %s WHERE project_code = %s", (updated_by, old_project_code))
         sql_project_user = """
         INSERT INTO tb_project_user
@@ -436,8 +845,16 @@ def edit_project():
                 current_project_yn, updated_by, updated_by
             ))
             logger.info(f"[SQL/INSERT] tb_project_user /edit_project{sql_project_user}")
+            affected_user_ids.add(participant_user_id)
+
+        # 현황 집계 증분 갱신 (기존 값 차감 후 새 값 반영)
+        adjust_project_summary(cursor, old_project, -1)
+        adjust_project_summary(cursor, {'status': status, 'category': category, 'group_name': group_name}, 1)
+        adjust_headcount(cursor, months_before, user_months(cursor, affected_user_ids))
 
         conn.commit()
+        notify_change('assignment', affected_user_ids)
+        notify_change('project', {old_project_code, new_project_code})
 
         return jsonify({'message': '프로젝트가 수정되었습니다.'}), 200
 
@@ -470,7 +887,14 @@ def delete_project(project_code):
         if conn is None:
             return jsonify({'message': '데이터베이스 연결 실패!'}), 500
 
-        cursor = conn.cursor()
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute("SELECT status, category, group_name FROM tb_project WHERE project_code = %s AND is_delete_yn = 'N'", (project_code,))
+        project = cursor.fetchone()
+        cursor.execute("SELECT user_id, start_date, end_date FROM tb_project_user WHERE project_code = %s AND is_delete_yn = 'N'", (project_code,))
+        old_participants = cursor.fetchall()
+        affected_user_ids = {row['user_id'] for row in old_participants}
+        months_before = user_months(cursor, affected_user_ids) if project else {}
+
         sql_project = "UPDATE tb_project SET is_delete_yn = 'Y', updated_at = NOW() WHERE project_code = %s"
         cursor.execute(sql_project, (project_code,))
         logger.info(f"[SQL/UPDATE] tb_project /delete_project{sql_project}")
@@ -479,7 +903,14 @@ def delete_project(project_code):
         cursor.execute(sql_project_user, (project_code,))
         logger.info(f"[SQL/UPDATE] tb_project_user /delete_project{sql_project_user}")
 
+        # 현황 집계 증분 갱신 (이미 삭제된 프로젝트면 건너뜀)
+        if project:
+            adjust_project_summary(cursor, project, -1)
+            adjust_headcount(cursor, months_before, user_months(cursor, affected_user_ids))
+
         conn.commit()
+        notify_change('assignment', affected_user_ids)
+        notify_change('project', [project_code])
         return jsonify({'message': '프로젝트가 삭제되었습니다.'}), 200
     except jwt.ExpiredSignatureError:
         return jsonify({'message': '토큰이 만료되었습니다.'}), 401
@@ -636,3 +1067,323 @@ def get_users_and_projects():
             conn.close()
         except Exception:
             pass
+
+# 사용자 × 월 인력 투입 현황 행렬 조회 (현황관리 화면용)
+@project_bp.route('/staffing_matrix', methods=['GET', 'OPTIONS'])
+def get_staffing_matrix():
+    if request.method == 'OPTIONS':
+        return jsonify({'message': 'CORS preflight request success'})
+    
+    # verify_and_refresh_token 사용하여 토큰 검증 및 자동 갱신
+    user_id, user_name, role_id, refresh_response, status_code = verify_and_refresh_token(request)
+    if refresh_response:
+        return refresh_response, status_code  # 자동 토큰 갱신 응답 반환
+    
+    if user_id is None:
+        return jsonify({'message': '토큰 인증 실패'}), 401
+
+    # 기간 기본값: 올해 1월 ~ 12월
+    this_year = datetime.now().year
+    try:
+        first_month = parse_month(request.args.get('from') or f"{this_year}-01")
+        last_month = parse_month(request.args.get('to') or f"{this_year}-12")
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
+    department = request.args.get('department') or None
+
+    month_count = (last_month.year - first_month.year) * 12 + last_month.month - first_month.month + 1
+    if month_count < 1:
+        return jsonify({'message': '조회 시작 월이 종료 월보다 늦습니다.'}), 400
+    if month_count > MAX_STAFFING_MONTHS:
+        return jsonify({'message': f'조회 기간은 최대 {MAX_STAFFING_MONTHS}개월입니다.'}), 400
+
+    cache_key = (first_month, last_month, department)
+    version = staffing_cache.current_version()
+    cached = staffing_cache.get(cache_key, version)
+    if cached is not None:
+        return jsonify(cached), 200
+
+    # 조회 범위: [first_month 1일, last_month 다음 달 1일)
+    range_end = np.datetime64(last_month, 'M') + 1
+    range_end = range_end.astype('datetime64[D]').item()
+
+    try:
+        conn = get_db_connection()
+        if conn is None:
+            return jsonify({'message': '데이터베이스 연결 실패!'}), 500
+        cursor = conn.cursor(dictionary=True)
+
+        sql_users = """
+            SELECT id, name
+            FROM tb_user
+            WHERE is_delete_yn = 'N'"""
+        params_users = []
+        if department:
+            sql_users += " AND department = %s"
+            params_users.append(department)
+        sql_users += " ORDER BY name ASC, id ASC"
+        cursor.execute(sql_users, tuple(params_users))
+        logger.info(f"[SQL/SELECT] tb_user /staffing_matrix{sql_users}")
+        users = cursor.fetchall()
+
+        sql_assignments = """
+            SELECT pu.user_id, pu.start_date, pu.end_date
+            FROM tb_project_user pu
+            JOIN tb_project p ON p.project_code = pu.project_code AND p.is_delete_yn = 'N'
+            JOIN tb_user u ON u.id = pu.user_id AND u.is_delete_yn = 'N'
+            WHERE pu.is_delete_yn = 'N' AND pu.start_date < %s AND pu.end_date >= %s"""
+        params_assignments = [range_end, first_month]
+        if department:
+            sql_assignments += " AND u.department = %s"
+            params_assignments.append(department)
+        cursor.execute(sql_assignments, tuple(params_assignments))
+        logger.info(f"[SQL/SELECT] tb_project_user, tb_project, tb_user /staffing_matrix{sql_assignments}")
+        assignments = cursor.fetchall()
+
+        user_ids = [u['id'] for u in users]
+        matrix = build_staffing_matrix(user_ids, assignments, first_month, month_count)
+
+        first = np.datetime64(first_month, 'M')
+        result = {
+            'from': first_month.strftime('%Y-%m'),
+            'to': last_month.strftime('%Y-%m'),
+            'department': department,
+            'columns': [str(m) for m in np.arange(first, first + month_count)],
+            'rows': user_ids,
+            'row_names': [u['name'] for u in users],
+            'matrix': matrix.tolist(),
+        }
+        staffing_cache.set(cache_key, version, result)
+        return jsonify(result), 200
+    except Exception as e:
+        print(f"인력 현황 행렬 조회 오류: {e}")
+        return jsonify({'message': '인력 현황 행렬 조회 오류'}), 500
+    finally:
+        try:
+            cursor.close()
+            conn.close()
+        except Exception:
+            pass
+
+# 배정 충돌 조회 (과다 배정, 휴가-프로젝트 기간 겹침)
+@project_bp.route('/conflicts', methods=['GET', 'OPTIONS'])
+def get_conflicts():
+    if request.method == 'OPTIONS':
+        return jsonify({'message': 'CORS preflight request success'})
+    
+    # verify_and_refresh_token 사용하여 토큰 검증 및 자동 갱신
+    user_id, user_name, role_id, refresh_response, status_code = verify_and_refresh_token(request)
+    if refresh_response:
+        return refresh_response, status_code  # 자동 토큰 갱신 응답 반환
+    
+    if user_id is None:
+        return jsonify({'message': '토큰 인증 실패'}), 401
+
+    target_user_id = request.args.get('user_id')
+    conflict_type = request.args.get('type')
+
+    try:
+        conflicts = conflict_index.conflicts(target_user_id)
+        if conflict_type:
+            conflicts = [c for c in conflicts if c['type'] == conflict_type]
+        return jsonify({'conflicts': conflicts, 'capacity': PROJECT_CAPACITY}), 200
+    except Exception as e:
+        print(f"배정 충돌 조회 오류: {e}")
+        return jsonify({'message': '배정 충돌 조회 오류'}), 500
+
+# 기간 내 프로젝트 참여 정보를 사용자별로 묶어서 조회 (get_users_and_projects 후속 API)
+# - 기간과 겹치는 참여 정보만 반환 (삭제된 참여/프로젝트 제외)
+# - 전화번호 등 개인정보는 include_pii=Y 일 때만 포함
+# - 사용자 수와 무관하게 메모리 사용량이 일정하도록 스트리밍 응답
+@project_bp.route('/get_users_assignments', methods=['GET', 'OPTIONS'])
+def get_users_assignments():
+    if request.method == 'OPTIONS':
+        return jsonify({'message': 'CORS preflight request success'})
+    
+    # verify_and_refresh_token 사용하여 토큰 검증 및 자동 갱신
+    user_id, user_name, role_id, refresh_response, status_code = verify_and_refresh_token(request)
+    if refresh_response:
+        return refresh_response, status_code  # 자동 토큰 갱신 응답 반환
+    
+    if user_id is None:
+        return jsonify({'message': '토큰 인증 실패'}), 401
+
+    this_year = datetime.now().year
+    try:
+        window_start = datetime.strptime(request.args.get('from') or f"{this_year}-01-01", '%Y-%m-%d').date()
+        window_end = datetime.strptime(request.args.get('to') or f"{this_year}-12-31", '%Y-%m-%d').date()
+    except ValueError as e:
+        return jsonify({'message': f'날짜 형식 오류 (YYYY-MM-DD): {e}'}), 400
+    if window_start > window_end:
+        return jsonify({'message': '조회 시작일이 종료일보다 늦습니다.'}), 400
+    department = request.args.get('department') or None
+    include_pii = request.args.get('include_pii', 'N').upper() == 'Y'
+
+    conn = get_db_connection()
+    if conn is None:
+        return jsonify({'message': '데이터베이스 연결 실패!'}), 500
+    cursor = conn.cursor(dictionary=True)  # unbuffered: 한 행씩 읽어서 바로 내보냄
+
+    try:
+        sql = f"""
+            SELECT u.id, u.name, u.position, u.department, td.dpr_nm AS department_name,
+                   td.team_nm AS team_name, u.role_id, u.status{', u.phone_number' if include_pii else ''},
+                   pu.project_code, p.project_name, pu.start_date, pu.end_date
+            FROM tb_user u
+            LEFT JOIN tb_department td ON u.department = td.dpr_id
+            LEFT JOIN (tb_project_user pu
+                       JOIN tb_project p ON p.project_code = pu.project_code AND p.is_delete_yn = 'N')
+              ON pu.user_id = u.id AND pu.is_delete_yn = 'N'
+             AND pu.start_date <= %s AND pu.end_date >= %s
+            WHERE u.is_delete_yn = 'N'"""
+        params = [window_end, window_start]
+        if department:
+            sql += " AND u.department = %s"
+            params.append(department)
+        sql += " ORDER BY u.id, pu.start_date"
+        cursor.execute(sql, tuple(params))
+        logger.info(f"[SQL/SELECT] tb_user, tb_project_user, tb_project /get_users_assignments{sql}")
+    except Exception as e:
+        print(f"사용자별 프로젝트 참여 정보 조회 오류: {e}")
+        close_db(cursor, conn)
+        return jsonify({'message': '사용자별 프로젝트 참여 정보 조회 오류'}), 500
+
+    user_fields = ('id', 'name', 'position', 'department', 'department_name', 'team_name', 'role_id', 'status')
+
+    def new_user(row):
+        user = {field: row[field] for field in user_fields}
+        if include_pii:
+            try:
+                user['phone_number'] = decrypt_aes(row['phone_number'])
+            except Exception as decrypt_error:
+                print(f"📛 Phone number 복호화 오류 ({row['id']}): {decrypt_error}")
+                user['phone_number'] = None
+        user['assignments'] = []
+        return user
+
+    def generate():
+        dumps = current_app.json.dumps
+        opened = False
+        try:
+            yield '{"from": %s, "to": %s, "users": [' % (dumps(window_start.isoformat()), dumps(window_end.isoformat()))
+            opened = True
+            buffer = []
+            written = 0
+            current = None
+            for row in cursor:
+                if current is None or row['id'] != current['id']:
+                    if current is not None:
+                        buffer.append(dumps(current))
+                    if len(buffer) >= 100:
+                        yield (',' if written else '') + ','.join(buffer)
+                        written += len(buffer)
+                        buffer = []
+                    current = new_user(row)
+                if row['project_code'] is not None:
+                    current['assignments'].append({
+                        'project_code': row['project_code'],
+                        'project_name': row['project_name'],
+                        'start_date': row['start_date'],
+                        'end_date': row['end_date'],
+                    })
+            if current is not None:
+                buffer.append(dumps(current))
+            if buffer:
+                yield (',' if written else '') + ','.join(buffer)
+            yield ']}'
+        except Exception as e:
+            # 스트리밍 도중에는 상태 코드를 바꿀 수 없으므로, 목록을 닫고 error 를 붙여 응답이 불완전함을 알림
+            logger.error(f"사용자별 프로젝트 참여 정보 스트리밍 오류: {e}")
+            error = dumps('사용자별 프로젝트 참여 정보 조회 중 오류가 발생했습니다. (목록이 완전하지 않음)')
+            yield ('], "error": %s}' if opened else '{"error": %s}') % error
+        finally:
+            close_db(cursor, conn)
+
+    return Response(stream_with_context(generate()), mimetype='application/json')
+
+# 프로젝트 현황 요약 (상태/구분/그룹별 프로젝트 수, 월별 투입 인원)
+@project_bp.route('/summary', methods=['GET', 'OPTIONS'])
+def get_project_summary():
+    if request.method == 'OPTIONS':
+        return jsonify({'message': 'CORS preflight request success'})
+    
+    # verify_and_refresh_token 사용하여 토큰 검증 및 자동 갱신
+    user_id, user_name, role_id, refresh_response, status_code = verify_and_refresh_token(request)
+    if refresh_response:
+        return refresh_response, status_code  # 자동 토큰 갱신 응답 반환
+    
+    if user_id is None:
+        return jsonify({'message': '토큰 인증 실패'}), 401
+
+    try:
+        first_month = parse_month(request.args['from']).strftime('%Y-%m') if request.args.get('from') else '0000-00'
+        last_month = parse_month(request.args['to']).strftime('%Y-%m') if request.args.get('to') else '9999-99'
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
+
+    try:
+        conn = get_db_connection()
+        if conn is None:
+            return jsonify({'message': '데이터베이스 연결 실패!'}), 500
+        cursor = conn.cursor(dictionary=True)
+
+        sql_summary = """
+            SELECT dimension, value, project_count
+            FROM tb_project_summary
+            WHERE project_count > 0"""
+        cursor.execute(sql_summary)
+        logger.info(f"[SQL/SELECT] tb_project_summary /summary{sql_summary}")
+        summary = {f"by_{dim}": {} for dim in SUMMARY_DIMENSIONS}
+        for row in cursor.fetchall():
+            summary[f"by_{row['dimension']}"][row['value']] = row['project_count']
+
+        sql_headcount = """
+            SELECT month, headcount
+            FROM tb_project_headcount_monthly
+            WHERE month BETWEEN %s AND %s AND headcount > 0
+            ORDER BY month"""
+        cursor.execute(sql_headcount, (first_month, last_month))
+        logger.info(f"[SQL/SELECT] tb_project_headcount_monthly /summary{sql_headcount}")
+        summary['headcount_by_month'] = {row['month']: row['headcount'] for row in cursor.fetchall()}
+
+        return jsonify(summary), 200
+    except Exception as e:
+        print(f"프로젝트 현황 요약 조회 오류: {e}")
+        return jsonify({'message': '프로젝트 현황 요약 조회 오류'}), 500
+    finally:
+        try:
+            cursor.close()
+            conn.close()
+        except Exception:
+            pass
+
+# 특정 날짜(기본: 오늘)에 참여 중인 프로젝트를 사용자별로 조회
+@project_bp.route('/current_assignments', methods=['GET', 'OPTIONS'])
+def get_current_assignments():
+    if request.method == 'OPTIONS':
+        return jsonify({'message': 'CORS preflight request success'})
+    
+    # verify_and_refresh_token 사용하여 토큰 검증 및 자동 갱신
+    user_id, user_name, role_id, refresh_response, status_code = verify_and_refresh_token(request)
+    if refresh_response:
+        return refresh_response, status_code  # 자동 토큰 갱신 응답 반환
+    
+    if user_id is None:
+        return jsonify({'message': '토큰 인증 실패'}), 401
+
+    try:
+        target_date = datetime.strptime(request.args['date'], '%Y-%m-%d').date() if request.args.get('date') else date.today()
+    except ValueError as e:
+        return jsonify({'message': f'날짜 형식 오류 (YYYY-MM-DD): {e}'}), 400
+    target_user_id = request.args.get('user_id')
+
+    try:
+        if target_date == date.today():
+            # 오늘 날짜는 메모리 인덱스에서 바로 응답
+            assignments = current_assignment_index.assignments(target_user_id)
+        else:
+            assignments = load_assignments_on(target_date, [target_user_id] if target_user_id else None)
+        return jsonify({'date': target_date.isoformat(), 'assignments': assignments}), 200
+    except Exception as e:
+        print(f"현재 참여 프로젝트 조회 오류: {e}")
+        return jsonify({'message': '현재 참여 프로젝트 조회 오류'}), 500
@@ -4,6 +4,7 @@ from db import get_db_connection
 from config import SECRET_KEY
 from blueprints.auth import decrypt_deterministic  # 이메일 복호화 함수
 from blueprints.auth import verify_and_refresh_token
+from cache import notify_change
 
 schedule_bp = Blueprint('schedule', __name__, url_prefix='/schedule')
 logger = logging.getLogger(__name__)
@@ -127,6 +128,7 @@ def add_schedule():
         logger.info(f"[SQL/INSERT] tb_schedule /add-schedule{sql}")
 
         conn.commit()
+        notify_change('schedule', [user_id])
         return jsonify({'message': '일정이 추가되었습니다.'}), 200
     except Exception as e:
         print(f"일정 추가 오류: {e}")
@@ -180,6 +182,7 @@ def edit_schedule(schedule_id):
         logger.info(f"[SQL/UPDATE] tb_schedule /edit-schedule{sql_schedule_update}")
 
         conn.commit()
+        notify_change('schedule', [schedule_owner[0]] if schedule_owner else [])
         return jsonify({'message': '일정이 수정되었습니다.'}), 200
     except jwt.ExpiredSignatureError:
         return jsonify({'message': '토큰이 만료되었습니다.'}), 401
@@ -234,6 +237,7 @@ def delete_schedule(schedule_id):
         logger.info(f"[SQL/DELETE] tb_schedule /delete-schedule{sql_schedule_id_delete}")
 
         conn.commit()
+        notify_change('schedule', [schedule_owner[0]] if schedule_owner else [])
         return jsonify({'message': '일정이 삭제되었습니다.'}), 200
     except jwt.ExpiredSignatureError:
         return jsonify({'message': '토큰이 만료되었습니다.'}), 401
@@ -0,0 +1,303 @@
+from flask import Blueprint, request, jsonify
+import logging, sys, time
+from db import get_db_connection
+from cache import IncrementalState
+from hangul import normalize, ngrams
+from blueprints.auth import verify_and_refresh_token
+from blueprints.user import user_search_index
+
+search_bp = Blueprint('search', __name__)
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+DEFAULT_SEARCH_LIMIT = 20
+MAX_SEARCH_LIMIT = 100
+SEARCH_TYPES = ('user', 'project', 'notice')
+
+# 필드 가중치 (이름/제목 일치가 부서/고객사/요약 일치보다 앞에 오도록)
+NAME_WEIGHT = 3
+TITLE_WEIGHT = 2
+DETAIL_WEIGHT = 1
+
+# 일치 종류별 점수 (필드 전체 일치 > 앞부분 일치 > 중간 일치)
+EXACT_SCORE = 4
+PREFIX_SCORE = 2
+CONTAINS_SCORE = 1
+
+PROJECT_SELECT_SQL = """
+    SELECT project_code, project_name, customer
+    FROM tb_project
+    WHERE is_delete_yn = 'N'"""
+
+NOTICE_SELECT_SQL = """
+    SELECT id, title, summary
+    FROM tb_notice
+    WHERE is_delete_yn = 'N'"""
+
+def tokens(text):
+    """색인 토큰: 정규화 문자열의 2-gram + 1글자 (1글자 검색어용)"""
+    text = normalize(text)
+    return ngrams(text) | set(text)
+
+def query_tokens(term):
+    """검색어 한 단어(정규화 완료)로 후보를 찾을 토큰 (1글자면 그 글자, 아니면 2-gram)"""
+    return {term} if len(term) == 1 else ngrams(term)
+
+def match_score(term, text):
+    if text == term:
+        return EXACT_SCORE
+    if text.startswith(term):
+        return PREFIX_SCORE
+    if term in text:
+        return CONTAINS_SCORE
+    return 0
+
+def fields_score(terms, fields):
+    """단어별 (가장 잘 맞는 필드의 일치 점수 x 필드 가중치) 합 (어느 필드에도 없는 단어가 있으면 0)"""
+    score = 0
+    for term in terms:
+        best = max(match_score(term, text) * weight for text, weight in fields)
+        if best == 0:
+            return 0  # 2-gram 은 모두 있지만 실제로 연속해서 나오지 않는 경우
+        score += best
+    return score
+
+def user_document(user, entry):
+    """user_search_index 의 키(정규화 이름, 부서/팀/직급)로 만든 사용자 문서"""
+    name_key, _, other_keys, _, _ = entry
+    fields = [(name_key, NAME_WEIGHT)] + [(key, DETAIL_WEIGHT) for key in other_keys]
+    subtitle = ' '.join(v for v in (user.department_name, user.team_name, user.position) if v)
+    return fields, {'type': 'user', 'id': user.id, 'title': user.name, 'subtitle': subtitle}
+
+def project_document(row):
+    fields = [(normalize(row['project_code']), NAME_WEIGHT), (normalize(row['project_name']), NAME_WEIGHT)]
+    if row['customer']:
+        fields.append((normalize(row['customer']), DETAIL_WEIGHT))
+    subtitle = ' · '.join(v for v in (row['project_code'], row['customer']) if v)
+    return fields, {'type': 'project', 'id': row['project_code'], 'title': row['project_name'], 'subtitle': subtitle}
+
+def notice_document(row):
+    fields = [(normalize(row['title']), TITLE_WEIGHT)]
+    if row['summary']:
+        fields.append((normalize(row['summary']), DETAIL_WEIGHT))
+    return fields, {'type': 'notice', 'id': row['id'], 'title': row['title'], 'subtitle': row['summary'] or ''}
+
+def _deep_size(obj, seen):
+    """객체와 내부 컨테이너/문자열의 대략적인 메모리 크기 (bytes, 공유 객체는 한 번만)"""
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(_deep_size(k, seen) + _deep_size(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(_deep_size(v, seen) for v in obj)
+    return size
+
+class SearchIndex(IncrementalState):
+    """통합 검색용 인메모리 역색인 (프로젝트 코드/이름/고객사, 공지 제목/요약)
+
+    - 문서 키: (종류, id)
+    - 토큰 -> 문서 키 집합 (2-gram, 1글자)
+    프로젝트는 'project', 공지는 'notice' 버전을 따르며,
+    같은 프로세스의 쓰기는 notify_change 로 받은 id 만 다시 색인한다.
+    사용자는 따로 색인하지 않고 /user/search 와 같은 user_search_index 에서 찾는다.
+    """
+    version_names = ('project', 'notice')
+
+    def __init__(self):
+        super().__init__()
+        self.docs = {}       # 문서 키 -> (필드 목록 [(정규화 문자열, 가중치)], 응답용 dict)
+        self.postings = {}   # 토큰 -> {문서 키}
+        self.rebuild_ms = None
+        self.rebuilt_at = None
+
+    def rebuild(self):
+        start = time.perf_counter()
+        self.docs, self.postings = {}, {}
+        for row in self._load(PROJECT_SELECT_SQL, 'project_code'):
+            self._add(('project', row['project_code']), *project_document(row))
+        for row in self._load(NOTICE_SELECT_SQL, 'id'):
+            self._add(('notice', row['id']), *notice_document(row))
+        self.rebuild_ms = round((time.perf_counter() - start) * 1000, 2)
+        self.rebuilt_at = time.time()
+        logger.info(f"[SEARCH] 검색 색인 재구성: 문서 {len(self.docs)}건, 토큰 {len(self.postings)}개, {self.rebuild_ms} ms")
+
+    def apply(self, name, changes):
+        keys = {k for k in changes if k}
+        if not keys:
+            return
+        if name == 'project':
+            loaded = {row['project_code']: row for row in self._load(PROJECT_SELECT_SQL, 'project_code', keys)}
+            for code in keys:
+                self._remove(('project', code))
+                if code in loaded:
+                    self._add(('project', code), *project_document(loaded[code]))
+        elif name == 'notice':
+            loaded = {row['id']: row for row in self._load(NOTICE_SELECT_SQL, 'id', keys)}
+            for notice_id in keys:
+                self._remove(('notice', notice_id))
+                if notice_id in loaded:
+                    self._add(('notice', notice_id), *notice_document(loaded[notice_id]))
+
+    def _load(self, select_sql, key_column, keys=None):
+        conn = get_db_connection()
+        if conn is None:
+            raise RuntimeError('데이터베이스 연결 실패!')
+        cursor = conn.cursor(dictionary=True)
+        try:
+            sql = select_sql
+            params = ()
+            if keys:
+                sql += f" AND {key_column} IN ({','.join(['%s'] * len(keys))})"
+                params = tuple(keys)
+            cursor.execute(sql, params)
+            logger.info(f"[SQL/SELECT] SearchIndex{sql}")
+            return cursor.fetchall()
+        finally:
+            cursor.close()
+            conn.close()
+
+    def _add(self, key, fields, item):
+        self.docs[key] = (fields, item)
+        for token in set().union(*(tokens(text) for text, _ in fields)):
+            self.postings.setdefault(token, set()).add(key)
+
+    def _remove(self, key):
+        entry = self.docs.pop(key, None)
+        if entry is None:
+            return
+        for token in set().union(*(tokens(text) for text, _ in entry[0])):
+            postings = self.postings.get(token)
+            if postings is not None:
+                postings.discard(key)
+                if not postings:
+                    del self.postings[token]
+
+    def search(self, query, types=SEARCH_TYPES, limit=DEFAULT_SEARCH_LIMIT):
+        """공백으로 나눈 모든 단어를 포함하는 문서를 점수순으로 반환
+
+        점수 = 단어별 (가장 잘 맞는 필드의 일치 점수 x 필드 가중치) 합
+        """
+        terms = [t for t in (normalize(w) for w in query.split()) if t]
+        if not terms:
+            return []
+        results = self._search_users(terms) if 'user' in types else []
+        if any(t != 'user' for t in types):
+            self.ensure_fresh()
+            with self.lock:
+                candidates = None
+                for term in terms:
+                    for token in query_tokens(term):
+                        postings = self.postings.get(token, set())
+                        candidates = set(postings) if candidates is None else candidates & postings
+                        if not candidates:
+                            break
+                for key in candidates or ():
+                    if key[0] not in types:
+                        continue
+                    fields, item = self.docs[key]
+                    score = fields_score(terms, fields)
+                    if score:
+                        results.append((score, item))
+
+        order = {t: i for i, t in enumerate(SEARCH_TYPES)}
+        results.sort(key=lambda r: (-r[0], order[r[1]['type']], str(r[1]['title'] or '')))
+        return [dict(item, score=score) for score, item in results[:limit]]
+
+    @staticmethod
+    def _search_users(terms):
+        """user_search_index 에서 모든 단어를 포함하는 사용자 [(점수, 응답용 dict)]"""
+        user_search_index.ensure_fresh()
+        with user_search_index.lock:
+            candidates = None
+            for term in terms:
+                found = user_search_index.containing(term)
+                candidates = found if candidates is None else candidates & found
+                if not candidates:
+                    return []
+            results = []
+            for uid in candidates:
+                fields, item = user_document(user_search_index.users[uid], user_search_index.entries[uid])
+                score = fields_score(terms, fields)
+                if score:
+                    results.append((score, item))
+            return results
+
+    def stats(self):
+        """문서/토큰 수, 대략적인 메모리 사용량, 마지막 전체 재구성 시간
+
+        사용자 수는 user_search_index 기준 (메모리/토큰 수에는 포함하지 않음)
+        """
+        user_search_index.ensure_fresh()
+        self.ensure_fresh()
+        with self.lock:
+            counts = {t: 0 for t in SEARCH_TYPES}
+            counts['user'] = len(user_search_index.entries)
+            for key in self.docs:
+                counts[key[0]] += 1
+            return {
+                'documents': counts,
+                'tokens': len(self.postings),
+                'postings': sum(len(p) for p in self.postings.values()),
+                'memory_bytes': _deep_size(self.docs, set()) + _deep_size(self.postings, set()),
+                'rebuild_ms': self.rebuild_ms,
+                'rebuilt_at': self.rebuilt_at,
+            }
+
+search_index = SearchIndex()
+
+# 통합 검색 (사용자/프로젝트/공지사항)
+@search_bp.route('/search', methods=['GET', 'OPTIONS'])
+def search():
+    if request.method == 'OPTIONS':
+        return jsonify({'message': 'CORS preflight request success'})
+
+    # verify_and_refresh_token 사용하여 토큰 검증 및 자동 갱신
+    user_id, user_name, role_id, refresh_response, status_code = verify_and_refresh_token(request)
+    if refresh_response:
+        return refresh_response, status_code  # 자동 토큰 갱신 응답 반환
+
+    if user_id is None:
+        return jsonify({'message': '토큰 인증 실패'}), 401
+
+    query = request.args.get('q', '')
+    try:
+        limit = min(int(request.args.get('limit') or DEFAULT_SEARCH_LIMIT), MAX_SEARCH_LIMIT)
+    except ValueError:
+        return jsonify({'message': 'limit 은 숫자여야 합니다.'}), 400
+    if limit < 1:
+        return jsonify({'message': 'limit 은 1 이상이어야 합니다.'}), 400
+
+    types = SEARCH_TYPES
+    if request.args.get('types'):
+        types = tuple(t for t in request.args['types'].split(',') if t)
+        unknown = set(types) - set(SEARCH_TYPES)
+        if unknown:
+            return jsonify({'message': f"지원하지 않는 검색 종류입니다: {', '.join(sorted(unknown))}"}), 400
+
+    try:
+        return jsonify({'results': search_index.search(query, types, limit)}), 200
+    except Exception as e:
+        logger.error(f"통합 검색 오류: {e}")
+        return jsonify({'message': '통합 검색 실패!'}), 500
+
+# 검색 색인 상태 (문서 수, 메모리 사용량, 재구성 시간)
+@search_bp.route('/search/stats', methods=['GET', 'OPTIONS'])
+def search_stats():
+    if request.method == 'OPTIONS':
+        return jsonify({'message': 'CORS preflight request success'})
+
+    # verify_and_refresh_token 사용하여 토큰 검증 및 자동 갱신
+    user_id, user_name, role_id, refresh_response, status_code = verify_and_refresh_token(request)
+    if refresh_response:
+        return refresh_response, status_code  # 자동 토큰 갱신 응답 반환
+
+    if user_id is None:
+        return jsonify({'message': '토큰 인증 실패'}), 401
+
+    try:
+        return jsonify(search_index.stats()), 200
+    except Exception as e:
+        logger.error(f"검색 색인 상태 조회 오류: {e}")
+        return jsonify({'message': '검색 색인 상태 조회 실패!'}), 500
@@ -1,13 +1,236 @@
-from flask import Blueprint, request, jsonify
-import jwt, logging
+from flask import Blueprint, request, jsonify, current_app, make_response
+import os, jwt, fcntl, logging, threading, time
+from datetime import datetime, timedelta
 from db import get_db_connection
-from config import SECRET_KEY
+from config import SECRET_KEY, STATUS_BOARD_MAX_WAIT, STATUS_BOARD_MAX_WAITERS
 from blueprints.auth import verify_and_refresh_token
+from cache import CACHE_DIR, IncrementalState, subscribe, get_version, get_epoch, notify_change, make_etag, if_none_match, request_etag, etag_response
+from blueprints.bootstrap import reference_response
+from blueprints.user import user_directory
 
 status_bp = Blueprint('status', __name__, url_prefix='/status')
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+class StatusBoard(IncrementalState):
+    """부서/팀별 상태 현황 (상태별 인원수 + 구성원 목록)
+
+    사용자 목록 스냅샷(user_directory)과 같은 'directory' 버전을 따른다.
+    상태 변경/사용자 수정 시 notify_change('directory', [user_id]) 로 해당 사용자만 빼고 다시 넣고,
+    바뀐 부서의 응답 본문만 다시 직렬화한다.
+    부서 필터는 /user/get_users, /project/staffing_matrix 와 같이 부서 코드(tb_user.department = dpr_id)를 사용한다.
+    """
+    version_names = ('directory',)
+    ALL = object()  # 전체 부서 응답 캐시 키
+
+    def __init__(self):
+        super().__init__()
+        self.placement = {}  # user_id -> (부서 코드, 부서명, 팀명, 상태)
+        self.groups = {}     # 부서명 -> 팀명 -> {'counts': {상태: 인원}, 'members': {user_id: 구성원}}
+        self.codes = {}      # 부서 코드 -> (부서명, 팀명)
+        self._bodies = {}    # 부서 코드 또는 ALL -> (본문, ETag)
+
+    def rebuild(self):
+        self.placement, self.groups, self.codes, self._bodies = {}, {}, {}, {}
+        for user in user_directory.sorted_users():
+            self._add(user)
+
+    def apply(self, name, changes):
+        for uid in set(changes):
+            self._remove(uid)
+            user = user_directory.get(uid)
+            if user is not None:
+                self._add(user)
+
+    def _add(self, user):
+        code, department, team = user.department, user.department_name, user.team_name
+        status = user.status or ''  # 상태 없음 (JSON 키로 쓰기 위해 빈 문자열)
+        group = self.groups.setdefault(department, {}).setdefault(team, {'counts': {}, 'members': {}})
+        group['counts'][status] = group['counts'].get(status, 0) + 1
+        group['members'][user.id] = {
+            'id': user.id,
+            'name': user.name,
+            'position': user.position,
+            'status': user.status,
+            'comment': user.comment,
+        }
+        self.placement[user.id] = (code, department, team, status)
+        if code:
+            self.codes[code] = (department, team)
+        self._invalidate(code)
+
+    def _remove(self, uid):
+        placed = self.placement.pop(uid, None)
+        if placed is None:
+            return
+        code, department, team, status = placed
+        teams = self.groups[department]
+        group = teams[team]
+        group['members'].pop(uid, None)
+        group['counts'][status] -= 1
+        if not group['counts'][status]:
+            del group['counts'][status]
+        if not group['members']:
+            del teams[team]
+            if not teams:
+                del self.groups[department]
+        self._invalidate(code)
+
+    def _invalidate(self, code):
+        self._bodies.pop(code, None)
+        self._bodies.pop(self.ALL, None)
+
+    def _department_view(self, department, only_team=ALL):
+        teams, total = [], {}
+        for team, group in sorted(self.groups.get(department, {}).items(), key=lambda item: item[0] or ''):
+            if only_team is not self.ALL and team != only_team:
+                continue
+            for status, count in group['counts'].items():
+                total[status] = total.get(status, 0) + count
+            teams.append({
+                'team_name': team,
+                'counts': group['counts'],
+                'members': sorted(group['members'].values(), key=lambda m: (m['name'] or '', m['id'])),
+            })
+        return {'department_name': department, 'counts': total, 'total': sum(total.values()), 'teams': teams}
+
+    def body_and_etag(self, department=None):
+        """부서 코드(department 가 없으면 전체) 상태 현황 JSON 본문과 ETag"""
+        self.ensure_fresh()
+        with self.lock:
+            key = department or self.ALL
+            if key not in self._bodies:
+                if department:
+                    views = []
+                    if department in self.codes:
+                        name, team = self.codes[department]
+                        view = self._department_view(name, only_team=team)
+                        views = [view] if view['teams'] else []
+                else:
+                    views = [self._department_view(d) for d in sorted(self.groups, key=lambda d: d or '')]
+                body = current_app.json.dumps({'departments': views}).encode('utf-8')
+                self._bodies[key] = (body, make_etag(body))
+            return self._bodies[key]
+
+status_board = StatusBoard()
+
+# 롱폴링: 같은 워커의 상태 변경은 Condition 으로 바로 깨우고,
+# 다른 워커의 변경은 STATUS_BOARD_CHECK_SECONDS 마다 버전(os.stat)만 확인 (바뀌었을 때만 현황 갱신)
+STATUS_BOARD_CHECK_SECONDS = 1
+# 대기 자리가 없을 때 다시 요청하기까지 권장 간격 (Retry-After, 초)
+STATUS_BOARD_RETRY_SECONDS = 5
+_board_changed = threading.Condition()
+
+def _wake_board_waiters(name, version, changes):
+    with _board_changed:
+        _board_changed.notify_all()
+
+subscribe('directory', _wake_board_waiters)
+
+def acquire_board_wait_slot():
+    """롱폴링 대기 자리 (모든 워커 합계 STATUS_BOARD_MAX_WAITERS 개, 파일 락), 없으면 None
+
+    반환한 파일을 닫으면 자리가 반납된다.
+    """
+    for slot in range(STATUS_BOARD_MAX_WAITERS):
+        lock_file = open(os.path.join(CACHE_DIR, f"status_board_wait.{slot}.lock"), "a")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return lock_file
+        except BlockingIOError:
+            lock_file.close()
+    return None
+
+def wait_for_board_change(department, etag, wait):
+    """현황 ETag 가 etag 와 달라지거나 wait 초가 지날 때까지 대기 후 (본문, ETag)"""
+    deadline = time.monotonic() + wait
+    seen_version = None  # 처음 깨어났을 때는 항상 확인 (호출 전에 바뀌었을 수 있음)
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return status_board.body_and_etag(department)
+        with _board_changed:
+            _board_changed.wait(min(remaining, STATUS_BOARD_CHECK_SECONDS))
+        version = get_version('directory')
+        if version == seen_version:
+            continue
+        seen_version = version
+        body, current = status_board.body_and_etag(department)
+        if current != etag:
+            return body, current
+
+class StatusStamps(IncrementalState):
+    """사용자별 상태 변경 시점('directory' 버전 번호)
+
+    쓰기(다른 워커의 쓰기는 변경 기록으로)는 바뀐 사용자만 비교하고, 변경 기록으로 따라잡을 수 없으면
+    사용자 목록 스냅샷 전체와 비교해서 상태가 달라진 사용자에게 현재 버전을 기록한다.
+    처음 만들 때와 캐시 디렉터리 세대(get_epoch)가 바뀌었을 때는 모든 사용자를 현재 버전으로 기록한다.
+    클라이언트에는 '세대.버전' 토큰을 넘기고, 다른 세대이거나 현재보다 큰 버전의 토큰이 오면 전체를 다시 보낸다.
+    """
+    version_names = ('directory',)
+
+    def __init__(self):
+        super().__init__()
+        self.epoch = None
+        self.statuses = None  # user_id -> 상태 (삭제된 사용자는 None)
+        self.stamps = {}      # user_id -> 마지막으로 상태가 바뀐 버전
+
+    def rebuild(self):
+        epoch = get_epoch()
+        if epoch != self.epoch:
+            self.epoch, self.statuses = epoch, None  # 이전 세대의 버전 번호는 비교할 수 없음
+        version = self.current_version()
+        current = {u.id: u.status for u in user_directory.sorted_users()}
+        if self.statuses is None:
+            self.stamps = dict.fromkeys(current, version)
+            self.statuses = current
+            return
+        for uid in current.keys() | self.statuses.keys():
+            status = current.get(uid)  # 목록에서 빠진(삭제된) 사용자는 None
+            if uid not in self.statuses or self.statuses[uid] != status:
+                self.statuses[uid] = status
+                self.stamps[uid] = version
+
+    def apply(self, name, changes):
+        version = self.versions[name] + 1
+        for uid in set(changes):
+            user = user_directory.get(uid)
+            status = user.status if user is not None else None
+            if status != self.statuses.get(uid) or uid not in self.statuses:
+                self.statuses[uid] = status
+                self.stamps[uid] = version
+
+    def current_version(self):
+        return get_version('directory')
+
+    @staticmethod
+    def parse_token(token):
+        """'세대.버전' 토큰 -> (세대, 버전), 형식이 다르면 (None, 0) (전체 재동기화)"""
+        epoch, _, version = (token or '').rpartition('.')
+        try:
+            return epoch or None, int(version)
+        except ValueError:
+            return None, 0
+
+    def changed_since(self, since, user_ids=None):
+        """since 토큰 이후 상태가 바뀐 사용자 {user_id: 상태}, 현재 토큰, 전체 재동기화 여부
+
+        다른 세대의 토큰이거나 현재 버전보다 큰 버전(캐시 디렉터리 초기화)이면 대상 전체를 반환한다.
+        """
+        since_epoch, since_version = self.parse_token(since)
+        if get_epoch() != self.epoch:
+            self.versions = None  # 캐시 디렉터리가 바뀜: 다시 기록
+        self.ensure_fresh()
+        with self.lock:
+            version = self.versions['directory']
+            targets = user_ids if user_ids is not None else self.stamps.keys()
+            full = since_epoch != self.epoch or since_version > version
+            changed = {uid: self.statuses.get(uid) for uid in targets
+                       if full or self.stamps.get(uid, 0) > since_version}
+            return changed, f"{self.epoch}.{version}", full
+
+status_stamps = StatusStamps()
+
 # 전체 상태 목록 조회
 @status_bp.route('/get_all_status', methods=['GET', 'OPTIONS'])
 def get_all_status():
@@ -23,26 +246,11 @@ def get_all_status():
         return jsonify({'message': '토큰 인증 실패'}), 401
     
     try:
-        conn = get_db_connection()
-        if conn is None:
-            return jsonify({'message': '데이터베이스 연결 실패!'}), 500
-        cursor = conn.cursor(dictionary=True)
-        sql = """
-            SELECT id, comment FROM tb_status"""
-        cursor.execute(sql)
-        logger.info(f"[SQL/SELECT] tb_status /get_all_status{sql}")
-
-        statuses = cursor.fetchall()
-        return jsonify({'statuses': statuses}), 200
+        # 기준 정보 캐시에서 응답 (변경이 없으면 304)
+        return reference_response('statuses')
     except Exception as e:
         print(f"상태 목록 조회 오류: {e}")
         return jsonify({'message': '상태 목록 조회 오류'}), 500
-    finally:
-        try:
-            cursor.close()
-            conn.close()
-        except Exception:
-            pass
 
 @status_bp.route('/get_status_list', methods=['GET', 'OPTIONS'])
 def get_status_list():
@@ -58,27 +266,53 @@ def get_status_list():
         return jsonify({'message': '토큰 인증 실패'}), 401
     
     try:
-        conn = get_db_connection()
-        if conn is None:
-            return jsonify({'message': '데이터베이스 연결 실패!'}), 500
-        cursor = conn.cursor(dictionary=True)
-        
-        sql = """
-            SELECT id, comment FROM tb_status ORDER BY comment"""
-        cursor.execute(sql)
-        logger.info(f"[SQL/SELECT] tb_status /get_status_list{sql}")
-
-        statuses = cursor.fetchall()
-        return jsonify({'statuses': statuses}), 200
+        # 기준 정보 캐시에서 응답 (변경이 없으면 304)
+        return reference_response('statuses')
     except Exception as e:
         print(f"상태 목록 조회 오류: {e}")
         return jsonify({'message': '상태 목록 조회 오류'}), 500
-    finally:
-        try:
-            cursor.close()
-            conn.close()
-        except Exception:
-            pass
+
+# 부서/팀별 상태 현황 (department=부서 코드, wait 초 동안 변경을 기다리는 롱폴링 지원)
+@status_bp.route('/board', methods=['GET', 'OPTIONS'])
+def status_board_view():
+    if request.method == 'OPTIONS':
+        return jsonify({'message': 'CORS preflight request success'})
+    
+    # verify_and_refresh_token 사용하여 토큰 검증 및 자동 갱신
+    user_id, user_name, role_id, refresh_response, status_code = verify_and_refresh_token(request)
+    if refresh_response:
+        return refresh_response, status_code  # 자동 토큰 갱신 응답 반환
+    
+    if user_id is None:
+        return jsonify({'message': '토큰 인증 실패'}), 401
+
+    department = request.args.get('department')  # 부서 코드 (dpr_id)
+    try:
+        wait = min(max(float(request.args.get('wait', 0)), 0), STATUS_BOARD_MAX_WAIT)
+    except ValueError:
+        return jsonify({'message': 'wait 은 숫자(초)여야 합니다.'}), 400
+
+    try:
+        body, etag = status_board.body_and_etag(department)
+        # 클라이언트가 가진 현황(If-None-Match)과 같으면 바뀔 때까지 또는 wait 초까지 대기
+        # 대기 자리가 모두 차 있으면 기다리지 않고 바로 응답 (워커를 롱폴링이 모두 차지하지 않도록)
+        retry_after = None
+        if wait and if_none_match(etag):
+            slot = acquire_board_wait_slot()
+            if slot is None:
+                retry_after = STATUS_BOARD_RETRY_SECONDS
+            else:
+                try:
+                    body, etag = wait_for_board_change(department, etag, wait)
+                finally:
+                    slot.close()
+        response = etag_response(body, etag)
+        if retry_after:
+            response.headers['Retry-After'] = str(retry_after)
+        return response
+    except Exception as e:
+        print(f"상태 현황 조회 오류: {e}")
+        return jsonify({'message': '상태 현황 조회 오류'}), 500
 
 # 특정 사용자들의 상태 조회
 @status_bp.route('/get_users_status', methods=['POST', 'OPTIONS'])
@@ -124,6 +358,42 @@ def get_users_status():
         except Exception:
             pass
 
+
+# 특정 사용자들의 상태 변경분 조회 (GET, 이전 버전 이후 바뀐 사용자만)
+# - ETag 는 '"세대.버전"', 이전 응답의 ETag 를 If-None-Match 로 보내면 바뀐 게 없을 때 304
+# - If-None-Match 대신 since 파라미터로 보내면 바뀐 게 없을 때 빈 statuses 로 200
+@status_bp.route('/get_users_status_changes', methods=['GET', 'OPTIONS'])
+def get_users_status_changes():
+    if request.method == 'OPTIONS':
+        return jsonify({'message': 'CORS preflight request success'})
+    
+    # verify_and_refresh_token 사용하여 토큰 검증 및 자동 갱신
+    user_id, user_name, role_id, refresh_response, status_code = verify_and_refresh_token(request)
+    if refresh_response:
+        return refresh_response, status_code  # 자동 토큰 갱신 응답 반환
+    
+    if user_id is None:
+        return jsonify({'message': '토큰 인증 실패'}), 401
+
+    # 기준 버전: If-None-Match (이전 응답의 ETag) 또는 since 파라미터 ('세대.버전'), 없거나 다른 세대면 전체 (full=true)
+    since = request_etag() or request.args.get('since', '')
+    user_ids = [uid for uid in request.args.get('user_ids', '').split(',') if uid] or None
+
+    try:
+        statuses, version, full = status_stamps.changed_since(since, user_ids)
+        etag = f'"{version}"'
+        if not full and not statuses and if_none_match(etag):
+            response = make_response('', 304)
+        else:
+            response = jsonify({'statuses': statuses, 'version': version, 'full': full})
+        response.headers['ETag'] = etag
+        response.headers['X-Status-Version'] = str(version)
+        response.headers['Cache-Control'] = 'private, no-cache'
+        return response
+    except Exception as e:
+        print(f"사용자 상태 변경분 조회 오류: {e}")
+        return jsonify({'message': '사용자 상태 변경분 조회 오류'}), 500
+
 # 상태 목록 추가
 @status_bp.route('/add_status', methods=['POST', 'OPTIONS'])
 def add_status():
@@ -156,6 +426,7 @@ def add_status():
         logger.info(f"[SQL/INSERT] tb_status /add_status{sql}")
         
         conn.commit()
+        notify_change('reference')
         return jsonify({'message': '상태가 추가되었습니다.'}), 201
     except Exception as e:
         print(f"상태 추가 오류: {e}")
@@ -208,6 +479,8 @@ def edit_status(status_id):
         logger.info(f"[SQL/UPDATE] tb_status /edit_status{sql_update}")
 
         conn.commit()
+        notify_change('directory')  # 상태 설명(comment)이 사용자 목록에 포함됨
+        notify_change('reference')
 
         return jsonify({'message': '상태가 성공적으로 수정되었습니다.'}), 200
 
@@ -248,6 +521,8 @@ def delete_status(status):
         logger.info(f"[SQL/DELETE] tb_status /delete_status{sql}")
 
         conn.commit()
+        notify_change('directory')  # ON DELETE SET NULL 로 여러 사용자의 상태가 바뀔 수 있음
+        notify_change('reference')
         return jsonify({'message': '상태가 삭제되었습니다.'}), 200
     except Exception as e:
         print(f"상태 삭제 오류: {e}")
@@ -321,6 +596,7 @@ def update_status():
         logger.info(f"[SQL/INSERT] tb_user_status_log /update_status{sql_status_log_insert}")
 
         conn.commit()
+        notify_change('directory', [target_user_id])
         return jsonify({'message': '상태가 업데이트되었습니다.'}), 200
 
     except jwt.ExpiredSignatureError:
@@ -338,4 +614,214 @@ def update_status():
             pass
 
         except Exception:
-            pass
\ No newline at end of file
+            pass
+
+# ---------------------------------------------------------------------------
+# 상태별 체류 시간 분석 (tb_user_status_log)
+# 한 상태 구간 = 기록 시각 ~ 같은 사용자의 다음 기록 시각 (마지막 기록이면 현재 시각까지)
+# 지난 달까지의 월별 합계는 tb_user_status_monthly 에 미리 집계해 두고,
+# 이번 달이나 월 중간에서 시작/끝나는 구간만 로그에서 바로 계산한다.
+# ---------------------------------------------------------------------------
+MAX_STATUS_REPORT_MONTHS = 120
+
+def _month_start(dt):
+    return datetime(dt.year, dt.month, 1)
+
+def _next_month_start(dt):
+    return datetime(dt.year + dt.month // 12, dt.month % 12 + 1, 1)
+
+def fetch_status_intervals(conn, range_start, range_end, user_id=None):
+    """[range_start, range_end) 에 걸친 상태 구간 (user_id, status_id, started_at, ended_at) 을 사용자/시간 순으로 스트리밍
+
+    구간 안의 기록 + 사용자별로 range_start 직전의 마지막 기록(시작 시점의 상태)만 읽고
+    다음 기록 시각은 LEAD() 윈도 함수로 구한다.
+    """
+    user_filter = " AND user_id = %s" if user_id else ""
+    sql = f"""
+        SELECT user_id, status_id, started_at,
+               LEAD(started_at) OVER (PARTITION BY user_id ORDER BY started_at, id) AS ended_at
+        FROM (
+            SELECT id, user_id, status_id, recorded_at AS started_at
+            FROM tb_user_status_log
+            WHERE recorded_at >= %s AND recorded_at < %s{user_filter}
+            UNION ALL
+            SELECT l.id, l.user_id, l.status_id, l.recorded_at
+            FROM tb_user_status_log AS l
+            JOIN (
+                SELECT user_id, MAX(recorded_at) AS recorded_at
+                FROM tb_user_status_log
+                WHERE recorded_at < %s{user_filter}
+                GROUP BY user_id
+            ) AS prev ON l.user_id = prev.user_id AND l.recorded_at = prev.recorded_at
+        ) AS t
+        ORDER BY user_id, started_at, id"""
+    params = [range_start, range_end] + ([user_id] if user_id else []) + [range_start] + ([user_id] if user_id else [])
+    cursor = conn.cursor()
+    try:
+        cursor.execute(sql, tuple(params))
+        logger.info(f"[SQL/SELECT] tb_user_status_log fetch_status_intervals(){sql}")
+        for row in cursor:
+            yield row
+    finally:
+        cursor.close()
+
+def accumulate_status_seconds(intervals, range_start, range_end, now, totals=None):
+    """상태 구간을 [range_start, range_end) 로 자르고 월 경계에서 나눠 (user_id, status_id, 'YYYY-MM') 별 초를 누적 (한 번 순회)"""
+    totals = {} if totals is None else totals
+    for user_id, status_id, started_at, ended_at in intervals:
+        start = max(started_at, range_start)
+        end = min(ended_at or now, range_end)
+        while start < end:
+            boundary = min(_next_month_start(start), end)
+            key = (user_id, status_id, start.strftime('%Y-%m'))
+            totals[key] = totals.get(key, 0) + (boundary - start).total_seconds()
+            start = boundary
+    return totals
+
+def rollup_status_months():
+    """지난 달까지 아직 집계하지 않은 월의 상태별 체류 시간을 tb_user_status_monthly 에 저장"""
+    conn = get_db_connection()
+    if conn is None:
+        raise RuntimeError('데이터베이스 연결 실패!')
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SELECT MIN(recorded_at) FROM tb_user_status_log")
+        first_recorded_at = cursor.fetchone()[0]
+        if first_recorded_at is None:
+            return 0
+        cursor.execute("SELECT month FROM tb_user_status_monthly_done")
+        done = {row[0] for row in cursor.fetchall()}
+
+        current_month = _month_start(datetime.now())
+        month = _month_start(first_recorded_at)
+        count = 0
+        while month < current_month:
+            key = month.strftime('%Y-%m')
+            next_month = _next_month_start(month)
+            if key not in done:
+                totals = accumulate_status_seconds(fetch_status_intervals(conn, month, next_month), month, next_month, next_month)
+                cursor.execute("DELETE FROM tb_user_status_monthly WHERE month = %s", (key,))
+                if totals:
+                    sql = """
+                        INSERT INTO tb_user_status_monthly (month, user_id, status_id, seconds)
+                        VALUES (%s, %s, %s, %s)"""
+                    cursor.executemany(sql, [(m, uid, sid, round(sec)) for (uid, sid, m), sec in totals.items()])
+                    logger.info(f"[SQL/INSERT] tb_user_status_monthly rollup_status_months(){sql}")
+                cursor.execute("INSERT INTO tb_user_status_monthly_done (month) VALUES (%s)", (key,))
+                conn.commit()
+                count += 1
+            month = next_month
+        return count
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+        conn.close()
+
+@status_bp.cli.command('rollup-months')
+def rollup_months_command():
+    """지난 달까지의 상태별 체류 시간 월 집계"""
+    count = rollup_status_months()
+    print(f"상태 체류 시간 월 집계 완료 ({count}개월)")
+
+# 사용자별/상태별/월별 체류 시간 조회
+@status_bp.route('/time_in_status', methods=['GET', 'OPTIONS'])
+def time_in_status():
+    if request.method == 'OPTIONS':
+        return jsonify({'message': 'CORS preflight request success'})
+    
+    # verify_and_refresh_token 사용하여 토큰 검증 및 자동 갱신
+    user_id, user_name, role_id, refresh_response, status_code = verify_and_refresh_token(request)
+    if refresh_response:
+        return refresh_response, status_code  # 자동 토큰 갱신 응답 반환
+    
+    if user_id is None:
+        return jsonify({'message': '토큰 인증 실패'}), 401
+
+    try:
+        range_start = datetime.strptime(request.args.get('start_date', ''), '%Y-%m-%d')
+        range_end = datetime.strptime(request.args.get('end_date', ''), '%Y-%m-%d') + timedelta(days=1)
+    except ValueError:
+        return jsonify({'message': 'start_date, end_date 는 YYYY-MM-DD 형식이어야 합니다.'}), 400
+    if range_start >= range_end:
+        return jsonify({'message': 'start_date 가 end_date 보다 늦습니다.'}), 400
+    target_user_id = request.args.get('user_id')
+    status_ids = {s.strip() for s in request.args.get('status', '').split(',') if s.strip()}
+
+    now = datetime.now()
+    current_month = _month_start(now)
+
+    # 기간을 월 단위로 나눠 집계 테이블로 처리할 월 / 로그에서 계산할 구간으로 구분
+    segments = []
+    month = _month_start(range_start)
+    while month < range_end:
+        next_month = _next_month_start(month)
+        segments.append((month, max(month, range_start), min(next_month, range_end), next_month))
+        month = next_month
+    if len(segments) > MAX_STATUS_REPORT_MONTHS:
+        return jsonify({'message': f'조회 기간은 최대 {MAX_STATUS_REPORT_MONTHS}개월입니다.'}), 400
+
+    conn = get_db_connection()
+    if conn is None:
+        return jsonify({'message': '데이터베이스 연결 실패!'}), 500
+    cursor = conn.cursor()
+    try:
+        sql_done = "SELECT month FROM tb_user_status_monthly_done WHERE month BETWEEN %s AND %s"
+        cursor.execute(sql_done, (segments[0][0].strftime('%Y-%m'), segments[-1][0].strftime('%Y-%m')))
+        logger.info(f"[SQL/SELECT] tb_user_status_monthly_done /time_in_status{sql_done}")
+        done = {row[0] for row in cursor.fetchall()}
+
+        rollup_months, live_runs = [], []
+        for month, seg_start, seg_end, next_month in segments:
+            key = month.strftime('%Y-%m')
+            if seg_start == month and seg_end == next_month and next_month <= current_month and key in done:
+                rollup_months.append(key)
+            elif live_runs and live_runs[-1][1] == seg_start:
+                live_runs[-1][1] = seg_end  # 연속된 구간은 한 번에 조회
+            else:
+                live_runs.append([seg_start, seg_end])
+
+        totals = {}
+        if rollup_months:
+            sql_rollup = f"""
+                SELECT user_id, status_id, month, seconds
+                FROM tb_user_status_monthly
+                WHERE month IN ({','.join(['%s'] * len(rollup_months))})"""
+            params = list(rollup_months)
+            if target_user_id:
+                sql_rollup += " AND user_id = %s"
+                params.append(target_user_id)
+            cursor.execute(sql_rollup, tuple(params))
+            logger.info(f"[SQL/SELECT] tb_user_status_monthly /time_in_status{sql_rollup}")
+            for uid, sid, month_key, seconds in cursor.fetchall():
+                totals[(uid, sid, month_key)] = float(seconds)
+        for run_start, run_end in live_runs:
+            accumulate_status_seconds(fetch_status_intervals(conn, run_start, run_end, target_user_id),
+                                      run_start, run_end, now, totals)
+
+        durations, per_status = [], {}
+        for (uid, sid, month_key), seconds in sorted(totals.items()):
+            if status_ids and sid not in status_ids:
+                continue
+            durations.append({'user_id': uid, 'status_id': sid, 'month': month_key,
+                              'seconds': round(seconds), 'days': round(seconds / 86400, 2)})
+            per_status[(uid, sid)] = per_status.get((uid, sid), 0) + seconds
+        summary = [{'user_id': uid, 'status_id': sid, 'seconds': round(seconds), 'days': round(seconds / 86400, 2)}
+                   for (uid, sid), seconds in sorted(per_status.items())]
+
+        return jsonify({
+            'start_date': range_start.strftime('%Y-%m-%d'),
+            'end_date': (range_end - timedelta(days=1)).strftime('%Y-%m-%d'),
+            'durations': durations,
+            'totals': summary,
+        }), 200
+    except Exception as e:
+        print(f"상태 체류 시간 조회 오류: {e}")
+        return jsonify({'message': '상태 체류 시간 조회 오류'}), 500
+    finally:
+        try:
+            cursor.close()
+            conn.close()
+        except Exception:
+            pass
@@ -1,14 +1,335 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 import logging
+import base64, json
+from bisect import bisect_left, insort
+from collections import namedtuple
 from db import get_db_connection
 from config import SECRET_KEY
-from blueprints.auth import decrypt_aes, decrypt_deterministic, encrypt_deterministic
+from cache import IncrementalState, notify_change, make_etag, etag_response
+from hangul import normalize, chosung, has_chosung, matches_prefix, ngrams
+from blueprints.auth import encrypt_aes, decrypt_aes, decrypt_deterministic, encrypt_deterministic
 from blueprints.auth import verify_and_refresh_token
 
 user_bp = Blueprint('user', __name__, url_prefix='/user')
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+# 사용자 목록(tb_user + tb_status + tb_department 조인, 전화번호 복호화 완료) 레코드
+DirectoryUser = namedtuple('DirectoryUser', [
+    'id', 'name', 'position', 'department', 'department_name', 'team_name',
+    'phone_number', 'role_id', 'status', 'comment', 'first_login_yn',
+])
+
+DIRECTORY_SELECT_SQL = """
+    SELECT 
+        tu.id, 
+        tu.name, 
+        tu.position, 
+        tu.department,
+        td.dpr_nm AS department_name,  -- 부서명 가져오기
+        td.team_nm AS team_name,  -- 팀명 가져오기
+        tu.phone_number, 
+        tu.role_id, 
+        tu.status, 
+        ts.comment, 
+        tu.first_login_yn 
+    FROM tb_user AS tu 
+    LEFT JOIN tb_status AS ts ON tu.status = ts.id
+    LEFT JOIN tb_department AS td ON tu.department = td.dpr_id  -- 부서 매핑
+    WHERE tu.is_delete_yn = 'N'"""
+
+def to_directory_user(row):
+    """조회한 행의 전화번호를 복호화해서 DirectoryUser 로 변환"""
+    try:
+        row['phone_number'] = decrypt_aes(row['phone_number'])
+    except Exception as e:
+        print(f"복호화 오류 (user id {row['id']}): {e}")
+        row['phone_number'] = None
+    return DirectoryUser(**row)
+
+class UserDirectory(IncrementalState):
+    """사용자 목록 스냅샷
+
+    사용자/상태/부서 쓰기 API 에서 notify_change('directory', [user_id, ...]) 를 호출하면
+    해당 사용자만 다시 조회해서 반영하고, changes 없이 호출하면 다음 조회 때 전체를 다시 읽는다.
+    """
+    version_names = ('directory',)
+
+    def __init__(self):
+        super().__init__()
+        self.users = {}
+        self._body = None
+        self._etag = None
+
+    def rebuild(self):
+        self.users = {u.id: u for u in self._load()}
+        self._body = self._etag = None
+
+    def apply(self, name, changes):
+        user_ids = set(changes)
+        if not user_ids:
+            return
+        loaded = {u.id: u for u in self._load(user_ids)}
+        for uid in user_ids:
+            if uid in loaded:
+                self.users[uid] = loaded[uid]
+            else:
+                self.users.pop(uid, None)
+        self._body = self._etag = None
+
+    def _load(self, user_ids=None):
+        conn = get_db_connection()
+        if conn is None:
+            raise RuntimeError('데이터베이스 연결 실패!')
+        cursor = conn.cursor(dictionary=True)
+        try:
+            sql = DIRECTORY_SELECT_SQL
+            params = ()
+            if user_ids:
+                sql += f" AND tu.id IN ({','.join(['%s'] * len(user_ids))})"
+                params = tuple(user_ids)
+            cursor.execute(sql, params)
+            logger.info(f"[SQL/SELECT] tb_user, tb_status, tb_department UserDirectory{sql}")
+
+            return [to_directory_user(row) for row in cursor.fetchall()]
+        finally:
+            cursor.close()
+            conn.close()
+
+    def sorted_users(self):
+        """이름순 정렬된 사용자 목록"""
+        self.ensure_fresh()
+        with self.lock:
+            return sorted(self.users.values(), key=lambda u: (u.name or '', u.id))
+
+    def get(self, user_id):
+        self.ensure_fresh()
+        with self.lock:
+            return self.users.get(user_id)
+
+    def body_and_etag(self):
+        """전체 목록 JSON 본문과 ETag (버전이 바뀔 때만 다시 직렬화)"""
+        self.ensure_fresh()
+        with self.lock:
+            if self._body is None:
+                users = sorted(self.users.values(), key=lambda u: (u.name or '', u.id))
+                self._body = current_app.json.dumps({'users': [u._asdict() for u in users]}).encode('utf-8')
+                self._etag = make_etag(self._body)
+            return self._body, self._etag
+
+user_directory = UserDirectory()
+
+# get_users 필터 파라미터 -> 조건절
+# department 는 idx_user_department, status/role_id 는 외래 키 인덱스를 사용한다.
+# team 은 tb_department(행 수가 적은 부서 테이블)의 팀명 조건이라 인덱스 없이 조인 후 거른다.
+USER_FILTERS = {
+    'department': "tu.department = %s",
+    'team': "td.team_nm = %s",
+    'status': "tu.status = %s",
+    'role_id': "tu.role_id = %s",
+}
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+def encode_cursor(user):
+    return base64.urlsafe_b64encode(json.dumps([user.name, user.id]).encode('utf-8')).decode('ascii')
+
+def decode_cursor(cursor_str):
+    try:
+        name, user_id = json.loads(base64.urlsafe_b64decode(cursor_str.encode('ascii')))
+        return name, user_id
+    except Exception:
+        raise ValueError('유효하지 않은 cursor 입니다.')
+
+def build_user_query(args):
+    """필터/이름 검색/키셋 페이지네이션 SQL, 파라미터, limit (이름, id 순, 다음 페이지 확인용으로 limit + 1 건 조회)"""
+    sql = DIRECTORY_SELECT_SQL
+    params = []
+    for key, condition in USER_FILTERS.items():
+        if args.get(key):
+            sql += f" AND {condition}"
+            params.append(args.get(key))
+    if args.get('q'):
+        # 이름 앞부분 일치 검색 (idx_user_delete_name 사용)
+        escaped = args.get('q').replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        sql += " AND tu.name LIKE %s"
+        params.append(f"{escaped}%")
+    if args.get('cursor'):
+        last_name, last_id = decode_cursor(args.get('cursor'))
+        sql += " AND (tu.name > %s OR (tu.name = %s AND tu.id > %s))"
+        params.extend([last_name, last_name, last_id])
+
+    try:
+        limit = min(int(args.get('limit') or DEFAULT_PAGE_SIZE), MAX_PAGE_SIZE)
+    except ValueError:
+        raise ValueError('limit 은 숫자여야 합니다.')
+    if limit < 1:
+        raise ValueError('limit 은 1 이상이어야 합니다.')
+    sql += " ORDER BY tu.name ASC, tu.id ASC LIMIT %s"
+    params.append(limit + 1)  # 다음 페이지 존재 여부 확인용 1건 추가
+    return sql, params, limit
+
+def query_users(args):
+    """필터/이름 검색/키셋 페이지네이션을 SQL 로 처리 (이름, id 순)"""
+    sql, params, limit = build_user_query(args)
+
+    conn = get_db_connection()
+    if conn is None:
+        raise RuntimeError('데이터베이스 연결 실패!')
+    cursor = conn.cursor(dictionary=True)
+    try:
+        cursor.execute(sql, tuple(params))
+        logger.info(f"[SQL/SELECT] tb_user, tb_status, tb_department /get_users{sql}")
+        rows = cursor.fetchall()
+    finally:
+        cursor.close()
+        conn.close()
+
+    users = [to_directory_user(row) for row in rows[:limit]]
+    next_cursor = encode_cursor(users[-1]) if len(rows) > limit else None
+    return users, next_cursor
+
+def get_favorite_ids(user_id):
+    """user_id 가 즐겨찾기한 사용자 id 목록 (tb_favorite.user_id 인덱스 조회 한 번)"""
+    conn = get_db_connection()
+    if conn is None:
+        raise RuntimeError('데이터베이스 연결 실패!')
+    cursor = conn.cursor()
+    try:
+        sql = "SELECT favorite_user_id FROM tb_favorite WHERE user_id = %s"
+        cursor.execute(sql, (user_id,))
+        logger.info(f"[SQL/SELECT] tb_favorite get_favorite_ids{sql}")
+        return [row[0] for row in cursor.fetchall()]
+    finally:
+        cursor.close()
+        conn.close()
+
+class UserSearchIndex(IncrementalState):
+    """사람 찾기(타입어헤드)용 인메모리 검색 인덱스
+
+    - 이름 앞부분 / 이름 초성 앞부분 / 부서·팀·직급 앞부분: 정렬된 키 목록 + bisect
+    - 중간 일치: 2-gram 역색인 후보를 교집합한 뒤 실제 포함 여부 확인
+    사용자 목록 스냅샷(user_directory)과 같은 'directory' 버전을 따르며,
+    변경된 사용자만 키를 빼고 다시 넣는다.
+    통합 검색(/search)의 사용자 검색도 이 인덱스를 사용한다. (containing)
+    """
+    version_names = ('directory',)
+
+    def __init__(self):
+        super().__init__()
+        self.users = {}
+        self.entries = {}        # user_id -> (이름 키, 초성 키, 기타 키 목록, 검색 문자열 목록, 2-gram 집합)
+        self.name_keys = []      # (정규화 이름, user_id) 정렬 목록
+        self.chosung_keys = []   # (이름 초성, user_id) 정렬 목록
+        self.other_keys = []     # (정규화 부서명/팀명/직급, user_id) 정렬 목록
+        self.grams = {}          # 2-gram, 1글자 -> {user_id}
+
+    def rebuild(self):
+        self.users, self.entries = {}, {}
+        self.name_keys, self.chosung_keys, self.other_keys, self.grams = [], [], [], {}
+        for user in user_directory.sorted_users():
+            self._add(user, bulk=True)
+        # 전체 재구성 때는 한 번에 정렬 (insort 반복은 O(n^2))
+        self.name_keys.sort()
+        self.chosung_keys.sort()
+        self.other_keys.sort()
+
+    def apply(self, name, changes):
+        for uid in set(changes):
+            self._remove(uid)
+            user = user_directory.get(uid)
+            if user is not None:
+                self._add(user)
+
+    def _add(self, user, bulk=False):
+        name_key = normalize(user.name)
+        chosung_key = chosung(user.name)
+        other_keys = {normalize(v) for v in (user.department_name, user.team_name, user.position)} - {''}
+        texts = [name_key, chosung_key, *other_keys]
+        grams = set().union(*(ngrams(t) | set(t) for t in texts))
+
+        self.users[user.id] = user
+        self.entries[user.id] = (name_key, chosung_key, other_keys, texts, grams)
+        add = list.append if bulk else insort
+        add(self.name_keys, (name_key, user.id))
+        add(self.chosung_keys, (chosung_key, user.id))
+        for key in other_keys:
+            add(self.other_keys, (key, user.id))
+        for gram in grams:
+            self.grams.setdefault(gram, set()).add(user.id)
+
+    def _remove(self, uid):
+        entry = self.entries.pop(uid, None)
+        self.users.pop(uid, None)
+        if entry is None:
+            return
+        name_key, chosung_key, other_keys, texts, grams = entry
+        self._discard(self.name_keys, (name_key, uid))
+        self._discard(self.chosung_keys, (chosung_key, uid))
+        for key in other_keys:
+            self._discard(self.other_keys, (key, uid))
+        for gram in grams:
+            postings = self.grams.get(gram)
+            if postings is not None:
+                postings.discard(uid)
+                if not postings:
+                    del self.grams[gram]
+
+    @staticmethod
+    def _discard(keys, item):
+        i = bisect_left(keys, item)
+        if i < len(keys) and keys[i] == item:
+            del keys[i]
+
+    @staticmethod
+    def _scan(keys, prefix, found, limit, check=None):
+        """prefix 로 시작하는 키를 정렬 순서대로 found 에 추가 (limit 개가 차면 중단)"""
+        i = bisect_left(keys, (prefix,))
+        while i < len(keys) and len(found) < limit:
+            key, uid = keys[i]
+            if not key.startswith(prefix):
+                break
+            if check is None or check(uid):
+                found.setdefault(uid)
+            i += 1
+
+    def search(self, query, limit=20):
+        """이름 앞부분 > 이름 초성 > 부서/팀/직급 앞부분 > 중간 일치 순으로 최대 limit 명"""
+        q = normalize(query)
+        if not q:
+            return []
+        self.ensure_fresh()
+        with self.lock:
+            found = {}  # 삽입 순서 = 순위
+            if has_chosung(q):
+                # '홍ㄱ' 처럼 완성형과 초성이 섞인 경우도 초성 키로 찾은 뒤 한 글자씩 확인
+                self._scan(self.chosung_keys, chosung(q), found, limit,
+                           check=lambda uid: matches_prefix(q, self.entries[uid][0]))
+            else:
+                self._scan(self.name_keys, q, found, limit)
+                self._scan(self.other_keys, q, found, limit)
+
+            if len(found) < limit and len(q) >= 2:
+                postings = [self.grams.get(gram) for gram in ngrams(q)]
+                if all(postings):
+                    candidates = set.intersection(*sorted(postings, key=len)) - found.keys()
+                    matched = [uid for uid in candidates if any(q in text for text in self.entries[uid][3])]
+                    matched.sort(key=lambda uid: (self.entries[uid][0], uid))
+                    for uid in matched[:limit - len(found)]:
+                        found.setdefault(uid)
+
+            return [self.users[uid] for uid in found]
+
+    def containing(self, term):
+        """정규화된 검색어 한 단어를 이름/초성/부서·팀·직급 중 하나에 포함하는 user_id 집합 (lock 안에서 호출)"""
+        postings = [self.grams.get(gram) for gram in ({term} if len(term) == 1 else ngrams(term))]
+        if not all(postings):
+            return set()
+        candidates = set.intersection(*sorted(postings, key=len))
+        return {uid for uid in candidates if any(term in text for text in self.entries[uid][3])}
+
+user_search_index = UserSearchIndex()
+
 # 첫 로그인 사용자 목록 조회
 @user_bp.route('/get_pending_users', methods=['GET', 'OPTIONS'])
 def get_pending_users():
@@ -63,47 +384,64 @@ def get_users():
         return jsonify({'message': '토큰 인증 실패'}), 401
     
     try:
-        conn = get_db_connection()
-        if conn is None:
-            return jsonify({'message': '데이터베이스 연결 실패!'}), 500
-        cursor = conn.cursor(dictionary=True)
-        sql = """
-            SELECT 
-                tu.id, 
-                tu.name, 
-                tu.position, 
-                td.dpr_nm AS department_name,  -- 부서명 가져오기
-                td.team_nm AS team_name,  -- 팀명 가져오기
-                tu.phone_number, 
-                tu.role_id, 
-                tu.status, 
-                ts.comment, 
-                tu.first_login_yn 
-            FROM tb_user AS tu 
-            LEFT JOIN tb_status AS ts ON tu.status = ts.id
-            LEFT JOIN tb_department AS td ON tu.department = td.dpr_id  -- 부서 매핑
-            WHERE tu.is_delete_yn = 'N'
-            ORDER BY tu.name ASC"""
-        cursor.execute(sql)
-        logger.info(f"[SQL/SELECT] tb_user, tb_status /get_users{sql}")
-        
-        users = cursor.fetchall()
-        for user in users:
+        # include_favorites=Y 이면 요청한 사용자의 즐겨찾기 여부(is_favorite)를 함께 내려줌
+        favorite_ids = None
+        if request.args.get('include_favorites') == 'Y':
+            favorite_ids = set(get_favorite_ids(user_id))
+
+        def to_dict(user):
+            item = user._asdict()
+            if favorite_ids is not None:
+                item['is_favorite'] = user.id in favorite_ids
+            return item
+
+        # 필터/페이지네이션 파라미터가 있으면 SQL 로 처리
+        if any(request.args.get(key) for key in (*USER_FILTERS, 'q', 'cursor', 'limit')):
             try:
-                user['phone_number'] = decrypt_aes(user['phone_number'])
-            except Exception as e:
-                print(f"복호화 오류 (user id {user['id']}): {e}")
-                user['phone_number'] = None
-        return jsonify({'users': users}), 200
+                users, next_cursor = query_users(request.args)
+            except ValueError as e:
+                return jsonify({'message': str(e)}), 400
+            return jsonify({'users': [to_dict(u) for u in users], 'next_cursor': next_cursor}), 200
+
+        if favorite_ids is not None:
+            body = current_app.json.dumps({'users': [to_dict(u) for u in user_directory.sorted_users()]}).encode('utf-8')
+            return etag_response(body, make_etag(body))
+
+        # 전체 목록은 사용자 목록 스냅샷에서 응답 (변경이 없으면 304)
+        body, etag = user_directory.body_and_etag()
+        return etag_response(body, etag)
     except Exception as e:
         print(f"사용자 목록 조회 오류: {e}")
         return jsonify({'message': '사용자 목록 조회 오류'}), 500
-    finally:
-        try:
-            cursor.close()
-            conn.close()
-        except Exception:
-            pass
+
+# 사람 찾기 (이름/초성/부서·팀·직급 앞부분, 중간 일치)
+@user_bp.route('/search', methods=['GET', 'OPTIONS'])
+def search_users():
+    if request.method == 'OPTIONS':
+        return jsonify({'message': 'CORS preflight request success'})
+    
+    # verify_and_refresh_token 사용하여 토큰 검증 및 자동 갱신
+    user_id, user_name, role_id, refresh_response, status_code = verify_and_refresh_token(request)
+    if refresh_response:
+        return refresh_response, status_code  # 자동 토큰 갱신 응답 반환
+    
+    if user_id is None:
+        return jsonify({'message': '토큰 인증 실패'}), 401
+
+    query = request.args.get('q', '')
+    try:
+        limit = min(int(request.args.get('limit', 20)), 100)
+    except ValueError:
+        return jsonify({'message': 'limit 은 숫자여야 합니다.'}), 400
+    if limit < 1:
+        return jsonify({'message': 'limit 은 1 이상이어야 합니다.'}), 400
+
+    try:
+        users = user_search_index.search(query, limit)
+        return jsonify({'users': [u._asdict() for u in users]}), 200
+    except Exception as e:
+        print(f"사용자 검색 오류: {e}")
+        return jsonify({'message': '사용자 검색 오류'}), 500
 
 # user_id로 tb_user 테이블 조회
 @user_bp.route('/get_user', methods=['GET', 'OPTIONS'])
@@ -170,3 +508,45 @@ def get_user():
         except Exception:
             pass
 
+# 내 정보 수정 (로그인한 사용자 본인의 전화번호만 수정, 관리자 권한 불필요)
+# 이름/직급/부서/권한 변경은 관리자 API(/admin/update_user)에서만 가능
+@user_bp.route('/update_my_details', methods=['PUT', 'OPTIONS'])
+def update_my_details():
+    if request.method == 'OPTIONS':
+        return jsonify({'message': 'CORS preflight request success'})
+    
+    # verify_and_refresh_token 사용하여 토큰 검증 및 자동 갱신
+    user_id, user_name, role_id, refresh_response, status_code = verify_and_refresh_token(request)
+    if refresh_response:
+        return refresh_response, status_code  # 자동 토큰 갱신 응답 반환
+    
+    if user_id is None:
+        return jsonify({'message': '토큰 인증 실패'}), 401
+
+    data = request.get_json() or {}
+    phone = data.get('phone')
+    if not phone:
+        return jsonify({'message': '전화번호가 제공되지 않았습니다.'}), 400
+
+    conn = get_db_connection()
+    if conn is None:
+        return jsonify({'message': '데이터베이스 연결 실패!'}), 500
+    cursor = conn.cursor()
+    try:
+        sql = """
+            UPDATE tb_user 
+            SET phone_number = %s, updated_by = %s 
+            WHERE id = %s AND is_delete_yn = 'N'"""
+        cursor.execute(sql, (encrypt_aes(phone), user_name or 'SYSTEM', user_id))
+        logger.info(f"[SQL/UPDATE] tb_user /update_my_details{sql}")
+
+        conn.commit()
+        notify_change('directory', [user_id])
+        return jsonify({'message': '내 정보가 업데이트되었습니다.'}), 200
+    except Exception as e:
+        conn.rollback()
+        print(f"내 정보 업데이트 오류: {e}")
+        return jsonify({'message': '내 정보 업데이트 오류'}), 500
+    finally:
+        cursor.close()
+        conn.close()
@@ -0,0 +1,299 @@
+# cache.py
+# 프로세스 내 캐시와 캐시 버전 관리
+#
+# 버전은 CACHE_DIR 아래의 파일 크기로 관리한다.
+# - 버전 증가: 파일에 1바이트를 O_APPEND 로 기록 (원자적이므로 락이 필요 없음)
+# - 버전 조회: os.stat() 한 번 (DB 조회 없음)
+# gunicorn 처럼 워커 프로세스가 여러 개여도 한 워커의 쓰기가 다른 워커의 캐시를 즉시 무효화한다.
+#
+# 변경 내용(바뀐 id 목록)은 버전별로 {name}.changes 에 한 줄씩 기록한다. ('버전<TAB>JSON')
+# 다른 워커는 건너뛴 버전의 기록을 읽어 부분 갱신하고, 기록이 없거나 잘려 있으면 전체 재구성한다.
+import os, json, fcntl, threading, logging, hashlib
+from collections import OrderedDict, defaultdict
+from flask import request, make_response
+from compression import strip_etag_suffix
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = "/app/cache" if os.getenv("DOCKER_ENV") else "cache"
+if not os.path.exists(CACHE_DIR):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+
+def _version_path(name):
+    return os.path.join(CACHE_DIR, f"{name}.version")
+
+def get_version(name):
+    """현재 버전 번호 조회 (한 번도 증가한 적이 없으면 0)"""
+    try:
+        return os.stat(_version_path(name)).st_size
+    except FileNotFoundError:
+        return 0
+
+def bump_version(name):
+    """버전을 1 증가시키고 증가 후의 버전 번호를 반환"""
+    fd = os.open(_version_path(name), os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+    try:
+        os.write(fd, b".")
+        return os.fstat(fd).st_size
+    finally:
+        os.close(fd)
+
+def get_epoch():
+    """캐시 디렉터리 세대 id
+
+    캐시 디렉터리를 비우거나(재시작, 임시 파일 정리) 다른 서버로 옮기면 버전 번호가 0 부터 다시 시작하므로,
+    클라이언트에 버전을 넘길 때는 이 값을 함께 넘겨 다른 세대의 버전인지 구분한다.
+    """
+    path = os.path.join(CACHE_DIR, "epoch")
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except FileNotFoundError:
+        pass
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}"
+    with open(tmp_path, "w") as f:
+        f.write(os.urandom(8).hex())
+    try:
+        os.link(tmp_path, path)  # 이미 있으면 실패 (먼저 만든 프로세스의 값을 사용)
+    except FileExistsError:
+        pass
+    finally:
+        os.unlink(tmp_path)
+    with open(path) as f:
+        return f.read().strip()
+
+# 변경 기록 파일이 이 크기를 넘으면 비우고 새로 쌓음 (그 이전 버전을 건너뛴 워커는 전체 재구성)
+CHANGE_LOG_MAX_BYTES = 1024 * 1024
+
+def _change_log_path(name):
+    return os.path.join(CACHE_DIR, f"{name}.changes")
+
+# 버전 이름 -> {버전: 그 버전 기록 줄이 끝나는 위치} (최근 것만, 매번 파일 처음부터 읽지 않도록)
+_log_offsets = defaultdict(OrderedDict)
+_log_lock = threading.Lock()
+LOG_OFFSETS_KEEP = 256
+
+def _remember_offset(name, version, offset):
+    with _log_lock:
+        offsets = _log_offsets[name]
+        offsets[version] = offset
+        offsets.move_to_end(version)
+        while len(offsets) > LOG_OFFSETS_KEEP:
+            offsets.popitem(last=False)
+
+def record_change(name, changes):
+    """변경 기록을 남기고 버전을 1 증가시킨 뒤 증가 후의 버전 번호를 반환
+
+    쓰는 프로세스끼리는 파일 락으로 순서를 맞추고, 기록을 먼저 쓴 다음 버전을 올리므로
+    버전 N 을 본 워커는 N 까지의 기록을 항상 읽을 수 있다.
+    """
+    fd = os.open(_change_log_path(name), os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        if os.fstat(fd).st_size > CHANGE_LOG_MAX_BYTES:
+            os.ftruncate(fd, 0)
+        payload = json.dumps(changes, ensure_ascii=False)
+        os.write(fd, f"{get_version(name) + 1}\t{payload}\n".encode('utf-8'))
+        version = bump_version(name)
+        _remember_offset(name, version, os.fstat(fd).st_size)
+        return version
+    finally:
+        os.close(fd)  # 닫으면 락도 풀림
+
+def read_changes(name, after, upto):
+    """after 초과 upto 이하 버전의 변경 기록 [(버전, changes), ...]
+
+    기록이 빠져 있거나(정리됨, 캐시 디렉터리 초기화) changes 가 None(전체 변경)인 기록이 있으면 None
+    """
+    if upto <= after:
+        return None
+    with _log_lock:
+        offset = _log_offsets[name].get(after, 0)
+    records = []
+    try:
+        with open(_change_log_path(name), 'rb') as f:
+            if offset > os.fstat(f.fileno()).st_size:
+                offset = 0  # 기록 파일을 비운 경우
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break  # 아직 쓰는 중인 줄
+                offset += len(line)
+                version, payload = line.decode('utf-8').split('\t', 1)
+                version = int(version)
+                if version <= after:
+                    continue
+                if version > upto:
+                    break
+                records.append((version, json.loads(payload)))
+                _remember_offset(name, version, offset)
+    except FileNotFoundError:
+        return None
+    except ValueError:
+        return None  # 정리된 파일의 중간 위치부터 읽은 경우 등
+    if [v for v, _ in records] != list(range(after + 1, upto + 1)):
+        return None
+    if any(changes is None for _, changes in records):
+        return None
+    return records
+
+# 버전 이름 -> 변경 알림을 받을 콜백 목록
+_listeners = defaultdict(list)
+
+def subscribe(name, callback):
+    """notify_change(name) 시 callback(name, version, changes) 호출"""
+    _listeners[name].append(callback)
+
+def notify_change(name, changes=None):
+    """쓰기 커밋 후 호출: 버전을 올리고 같은 프로세스의 인메모리 상태에 변경 내용을 전달
+
+    changes 는 바뀐 id 목록 (JSON 으로 기록 가능한 값), None 이면 전체 변경
+    """
+    if changes is not None:
+        changes = sorted(set(changes), key=str)
+    version = record_change(name, changes)
+    for callback in _listeners.get(name, []):
+        try:
+            callback(name, version, changes)
+        except Exception as e:
+            logger.error(f"캐시 변경 알림 처리 오류 ({name}): {e}")
+    return version
+
+class VersionedCache:
+    """지정한 버전이 바뀌면 자동으로 무효화되는 키-값 캐시 (LRU, 최대 maxsize 개)"""
+
+    def __init__(self, *version_names, maxsize=64):
+        self.version_names = version_names
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def current_version(self):
+        return tuple(get_version(name) for name in self.version_names)
+
+    def get(self, key, version):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] != version:
+                return None
+            self._data.move_to_end(key)
+            return entry[1]
+
+    def set(self, key, version, value):
+        # version 은 값을 계산하기 "전"에 읽어 둔 버전이어야 한다.
+        # (계산 중에 쓰기가 일어나면 다음 조회에서 자연스럽게 다시 계산됨)
+        with self._lock:
+            self._data[key] = (version, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+class IncrementalState:
+    """버전 기반 인메모리 상태
+
+    - 같은 프로세스의 쓰기(notify_change)는 apply(name, changes) 로 바로 부분 갱신
+    - 다른 프로세스의 쓰기로 버전이 바뀌어 있으면 변경 기록(read_changes)을 버전 순서대로 apply
+    - 변경 기록으로 따라잡을 수 없으면(전체 변경, 기록 정리, 캐시 디렉터리 초기화 등) rebuild() 로 전체 재구성
+    하위 클래스에서 version_names, rebuild(), apply() 를 구현한다.
+    apply() 가 호출될 때 self.versions[name] 은 적용할 기록 바로 앞의 버전이다.
+    """
+    version_names = ()
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.versions = None
+        for name in self.version_names:
+            subscribe(name, self._on_change)
+
+    def ensure_fresh(self):
+        versions = {name: get_version(name) for name in self.version_names}
+        if versions != self.versions:
+            with self.lock:
+                if versions != self.versions and not self._catch_up(versions):
+                    self.rebuild()
+                    self.versions = versions
+
+    def _catch_up(self, versions):
+        """다른 프로세스의 변경 기록을 적용해서 versions 까지 따라잡음 (실패하면 False)"""
+        if self.versions is None:
+            return False
+        pending = {}
+        for name, version in versions.items():
+            if version != self.versions[name]:
+                records = read_changes(name, self.versions[name], version)
+                if records is None:
+                    return False
+                pending[name] = records
+        try:
+            for name, records in pending.items():
+                for version, changes in records:
+                    self.apply(name, changes)
+                    self.versions[name] = version
+        except Exception as e:
+            logger.error(f"{type(self).__name__} 변경 기록 적용 오류: {e}")
+            self.versions = None
+            return False
+        return True
+
+    def _on_change(self, name, version, changes):
+        with self.lock:
+            if self.versions is None:
+                return
+            if changes is None:
+                self.versions = None
+                return
+            if self.versions.get(name) != version - 1:
+                return  # 다른 프로세스의 변경이 먼저 있었음: 다음 조회 때 변경 기록으로 함께 따라잡음
+            try:
+                self.apply(name, changes)
+                self.versions[name] = version
+            except Exception as e:
+                logger.error(f"{type(self).__name__} 부분 갱신 오류: {e}")
+                self.versions = None
+
+    def rebuild(self):
+        raise NotImplementedError
+
+    def apply(self, name, changes):
+        raise NotImplementedError
+
+def make_etag(body):
+    """응답 본문(bytes) 기반 강한 ETag (워커/재시작과 무관하게 같은 내용이면 같은 값)"""
+    return '"' + hashlib.sha1(body).hexdigest() + '"'
+
+def if_none_match(etag):
+    """요청의 If-None-Match 헤더에 etag 가 포함되어 있는지 확인 (압축 응답의 인코딩 접미사는 무시)"""
+    header = request.headers.get('If-None-Match')
+    if not header:
+        return False
+    if header.strip() == '*':
+        return True
+    for tag in header.split(','):
+        tag = tag.strip()
+        if tag.startswith('W/'):
+            tag = tag[2:]
+        if strip_etag_suffix(tag) == etag:
+            return True
+    return False
+
+def request_etag():
+    """요청의 If-None-Match 헤더에 있는 첫 ETag 값 (따옴표, W/, 압축 접미사 제외, 없으면 None)"""
+    header = (request.headers.get('If-None-Match') or '').strip()
+    if not header or header == '*':
+        return None
+    tag = header.split(',')[0].strip()
+    if tag.startswith('W/'):
+        tag = tag[2:]
+    return strip_etag_suffix(tag).strip('"') or None
+
+def etag_response(body, etag, cache_control='private, no-cache', mimetype='application/json'):
+    """ETag 조건부 응답: 클라이언트가 같은 ETag 를 갖고 있으면 본문 없이 304"""
+    if if_none_match(etag):
+        response = make_response('', 304)
+    else:
+        response = make_response(body)
+        response.mimetype = mimetype
+    response.headers['ETag'] = etag
+    response.headers['Cache-Control'] = cache_control
+    return response
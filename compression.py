@@ -0,0 +1,122 @@
+# compression.py
+# 응답 압축 (Accept-Encoding 협상: br > gzip)
+#
+# - COMPRESSION_MIN_SIZE 바이트 미만, 이미 압축된 형식(이미지/폰트/압축 파일), 스트리밍/파일 전송 응답은 건너뜀
+# - 압축한 응답의 ETag 에는 인코딩 접미사(-br, -gzip)를 붙인다. (같은 ETag 로 다른 바이트를 보내지 않도록)
+#   If-None-Match 비교 시에는 cache.if_none_match 에서 접미사를 떼고 비교한다.
+# - brotli 패키지가 없으면 gzip 만 사용
+import gzip, time, threading
+from config import COMPRESSION_MIN_SIZE, COMPRESSION_GZIP_LEVEL, COMPRESSION_BROTLI_QUALITY
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# 압축 대상 mimetype (텍스트 계열만, 이미지/폰트/zip 등은 이미 압축되어 있음)
+COMPRESSIBLE_MIMETYPES = {
+    'application/json',
+    'application/javascript',
+    'application/xml',
+    'image/svg+xml',
+}
+
+ETAG_SUFFIXES = {'br': '-br', 'gzip': '-gzip'}
+
+def _compress_gzip(data):
+    return gzip.compress(data, compresslevel=COMPRESSION_GZIP_LEVEL)
+
+def _compress_br(data):
+    return brotli.compress(data, quality=COMPRESSION_BROTLI_QUALITY)
+
+ENCODERS = {'gzip': _compress_gzip}
+if brotli is not None:
+    ENCODERS['br'] = _compress_br
+
+class CompressionStats:
+    """압축에 쓴 CPU 시간과 줄어든 바이트 수 (프로세스별 누적)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._data = {}
+
+    def record(self, encoding, original, compressed, cpu_seconds):
+        with self._lock:
+            entry = self._data.setdefault(encoding, {'responses': 0, 'bytes_in': 0, 'bytes_out': 0, 'cpu_seconds': 0.0})
+            entry['responses'] += 1
+            entry['bytes_in'] += original
+            entry['bytes_out'] += compressed
+            entry['cpu_seconds'] += cpu_seconds
+
+    def snapshot(self):
+        with self._lock:
+            result = {}
+            for encoding, entry in self._data.items():
+                saved = entry['bytes_in'] - entry['bytes_out']
+                result[encoding] = dict(
+                    entry,
+                    cpu_seconds=round(entry['cpu_seconds'], 4),
+                    bytes_saved=saved,
+                    ratio=round(entry['bytes_out'] / entry['bytes_in'], 4) if entry['bytes_in'] else None,
+                    # CPU 1ms 당 줄어든 바이트 수 (압축 수준 조정 시 참고)
+                    bytes_saved_per_cpu_ms=round(saved / (entry['cpu_seconds'] * 1000)) if entry['cpu_seconds'] else None,
+                )
+            return result
+
+compression_stats = CompressionStats()
+
+def choose_encoding(accept_encodings):
+    """Accept-Encoding 에서 사용할 인코딩 선택 (q=0 은 거부로 처리, 같으면 br 우선)"""
+    best, best_quality = None, 0
+    for encoding in ('br', 'gzip'):
+        if encoding not in ENCODERS:
+            continue
+        quality = accept_encodings.quality(encoding)
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+def is_compressible(response):
+    if response.direct_passthrough or response.is_streamed:
+        return False
+    if response.status_code < 200 or response.status_code in (204, 206, 304):
+        return False
+    if 'Content-Encoding' in response.headers:
+        return False
+    mimetype = response.mimetype or ''
+    return mimetype.startswith('text/') or mimetype in COMPRESSIBLE_MIMETYPES
+
+def strip_etag_suffix(tag):
+    """압축 응답 ETag 의 인코딩 접미사 제거 ('"abc-gzip"' -> '"abc"')"""
+    for suffix in ETAG_SUFFIXES.values():
+        if tag.endswith(suffix + '"'):
+            return tag[:-len(suffix) - 1] + '"'
+    return tag
+
+def compress_response(request, response):
+    """after_request 에서 호출: 조건이 맞으면 본문을 압축하고 헤더를 맞춤"""
+    if not is_compressible(response):
+        return response
+    response.vary.add('Accept-Encoding')
+
+    encoding = choose_encoding(request.accept_encodings)
+    if encoding is None:
+        return response
+    data = response.get_data()
+    if len(data) < COMPRESSION_MIN_SIZE:
+        return response
+
+    # 요청 처리 스레드의 CPU 시간 (다른 스레드의 작업은 포함되지 않음)
+    start = time.thread_time()
+    compressed = ENCODERS[encoding](data)
+    cpu_seconds = time.thread_time() - start
+    compression_stats.record(encoding, len(data), len(compressed), cpu_seconds)
+    if len(compressed) >= len(data):
+        return response
+
+    response.set_data(compressed)
+    response.headers['Content-Encoding'] = encoding
+    etag = response.headers.get('ETag')
+    if etag and etag.endswith('"'):
+        response.headers['ETag'] = etag[:-1] + ETAG_SUFFIXES[encoding] + '"'
+    return response
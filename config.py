@@ -26,6 +26,39 @@ db_config = {
     "raise_on_warnings": True
 }
 
+# 프로젝트 동시 참여 허용 개수 (초과하면 과다 배정으로 판단)
+PROJECT_CAPACITY = int(os.getenv("REACT_APP_PROJECT_CAPACITY", "1"))
+
+# 휴가 일정으로 판단할 키워드 (tb_schedule의 task 또는 status에 포함되면 휴가)
+LEAVE_KEYWORDS = [k.strip() for k in os.getenv("REACT_APP_LEAVE_KEYWORDS", "휴가,연차,반차,병가").split(",") if k.strip()]
+
+# 프로젝트 현황 집계 테이블 전체 재계산 주기 (분)
+PROJECT_SUMMARY_RECOMPUTE_MINUTES = int(os.getenv("REACT_APP_PROJECT_SUMMARY_RECOMPUTE_MINUTES", "60"))
+
+# 사용자 상태별 체류 시간 월 집계 주기 (분)
+STATUS_MONTHLY_ROLLUP_MINUTES = int(os.getenv("REACT_APP_STATUS_MONTHLY_ROLLUP_MINUTES", "360"))
+
+# /status/board 롱폴링 최대 대기 시간 (초)
+STATUS_BOARD_MAX_WAIT = int(os.getenv("REACT_APP_STATUS_BOARD_MAX_WAIT", "25"))
+
+# /status/board 롱폴링 동시 대기 요청 수 (모든 워커 합계, 초과하면 기다리지 않고 바로 응답)
+STATUS_BOARD_MAX_WAITERS = int(os.getenv("REACT_APP_STATUS_BOARD_MAX_WAITERS", "4"))
+
+# /bootstrap 기준 정보 브라우저 캐시 시간 (초, 이후에는 ETag 로 재검증, 개별 목록 API 는 매번 재검증)
+REFERENCE_CACHE_MAX_AGE = int(os.getenv("REACT_APP_REFERENCE_CACHE_MAX_AGE", "60"))
+
+# 응답 압축: 이 크기(바이트) 이상인 텍스트/JSON 응답만 압축, gzip 레벨(1~9), brotli 품질(0~11)
+COMPRESSION_MIN_SIZE = int(os.getenv("REACT_APP_COMPRESSION_MIN_SIZE", "1024"))
+COMPRESSION_GZIP_LEVEL = int(os.getenv("REACT_APP_COMPRESSION_GZIP_LEVEL", "6"))
+COMPRESSION_BROTLI_QUALITY = int(os.getenv("REACT_APP_COMPRESSION_BROTLI_QUALITY", "4"))
+
+# JSON 응답 날짜 형식: Y 면 기존 RFC 1123 형식('Tue, 04 Mar 2025 00:00:00 GMT'), 아니면 ISO-8601
+JSON_LEGACY_DATES = os.getenv("REACT_APP_JSON_LEGACY_DATES", "N") == "Y"
+
+# /admin/import_users 한 번에 검사/INSERT 하는 행 수, 비밀번호 해시 프로세스 수 (0 이면 CPU 개수)
+IMPORT_USERS_CHUNK_SIZE = int(os.getenv("REACT_APP_IMPORT_USERS_CHUNK_SIZE", "500"))
+IMPORT_USERS_HASH_WORKERS = int(os.getenv("REACT_APP_IMPORT_USERS_HASH_WORKERS", "0"))
+
 # ✅ JWT 시크릿키 설정 (기본값 추가)
 SECRET_KEY = os.getenv("REACT_APP_SECRET_KEY", "default_secret_key")
 
@@ -10,3 +10,20 @@ def get_db_connection():
     except mysql.connector.Error as err:
         print(f"MySQL 연결 오류: {err}")
         return None
+
+def close_db(cursor, conn):
+    """커서와 연결을 각각 닫음
+
+    커서 닫기가 실패해도(unbuffered 커서의 읽지 않은 결과 등) 연결은 반드시 닫아서 연결이 새지 않도록 한다.
+    """
+    try:
+        if cursor is not None:
+            cursor.close()
+    except Exception as err:
+        print(f"MySQL 커서 닫기 오류: {err}")
+    finally:
+        try:
+            if conn is not None:
+                conn.close()
+        except Exception as err:
+            print(f"MySQL 연결 닫기 오류: {err}")
@@ -0,0 +1,57 @@
+# hangul.py
+# 한글 검색 보조 함수 (초성 추출, 정규화, n-gram)
+
+HANGUL_BASE = 0xAC00  # '가'
+HANGUL_LAST = 0xD7A3  # '힣'
+JUNGSUNG_COUNT = 21
+JONGSUNG_COUNT = 28
+
+# 초성 19자 (호환용 자모)
+CHOSUNG_LIST = [
+    'ㄱ', 'ㄲ', 'ㄴ', 'ㄷ', 'ㄸ', 'ㄹ', 'ㅁ', 'ㅂ', 'ㅃ', 'ㅅ',
+    'ㅆ', 'ㅇ', 'ㅈ', 'ㅉ', 'ㅊ', 'ㅋ', 'ㅌ', 'ㅍ', 'ㅎ',
+]
+CHOSUNG_SET = set(CHOSUNG_LIST)
+
+def normalize(text):
+    """소문자 변환 + 공백 제거 (None 은 빈 문자열)"""
+    if not text:
+        return ''
+    return ''.join(str(text).lower().split())
+
+def chosung_of(ch):
+    """한글 음절이면 초성, 아니면 문자 그대로 반환"""
+    code = ord(ch)
+    if HANGUL_BASE <= code <= HANGUL_LAST:
+        return CHOSUNG_LIST[(code - HANGUL_BASE) // (JUNGSUNG_COUNT * JONGSUNG_COUNT)]
+    return ch
+
+def chosung(text):
+    """문자열의 초성 문자열 ('홍길동' -> 'ㅎㄱㄷ')"""
+    return ''.join(chosung_of(ch) for ch in normalize(text))
+
+def has_chosung(text):
+    """초성(호환용 자모)이 하나라도 포함되어 있는지"""
+    return any(ch in CHOSUNG_SET for ch in text)
+
+def matches_prefix(query, text):
+    """query 가 text 의 앞부분과 일치하는지 (query 의 초성 글자는 text 음절의 초성과 비교)
+
+    예) matches_prefix('홍ㄱ', '홍길동') -> True
+    """
+    if len(query) > len(text):
+        return False
+    for q, t in zip(query, text):
+        if q == t:
+            continue
+        if q in CHOSUNG_SET and chosung_of(t) == q:
+            continue
+        return False
+    return True
+
+def ngrams(text, n=2):
+    """정규화된 문자열의 n-gram 집합 (n 보다 짧으면 문자열 자체)"""
+    text = normalize(text)
+    if len(text) <= n:
+        return {text} if text else set()
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
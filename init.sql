@@ -34,12 +34,17 @@ CREATE TABLE tb_user (
     FOREIGN KEY (status) REFERENCES tb_status(id) ON DELETE SET NULL
 );
 
+-- 사용자 목록 필터/이름순 페이지네이션용 인덱스 (/user/get_users)
+CREATE INDEX idx_user_department ON tb_user (department);
+CREATE INDEX idx_user_delete_name ON tb_user (is_delete_yn, name);
+
 -- 즐겨찾기 테이블 생성
 CREATE TABLE tb_favorite (
     id BIGINT PRIMARY KEY AUTO_INCREMENT,
     user_id VARCHAR(100) NOT NULL,
     favorite_user_id VARCHAR(100) NOT NULL,
     is_favorite_yn CHAR(1) DEFAULT 'N',
+    UNIQUE KEY uq_favorite_user (user_id, favorite_user_id),  -- 중복 즐겨찾기 방지
     FOREIGN KEY (user_id) REFERENCES tb_user(id) ON DELETE CASCADE,
     FOREIGN KEY (favorite_user_id) REFERENCES tb_user(id) ON DELETE CASCADE
 );
@@ -97,17 +102,62 @@ CREATE TABLE tb_project_user (
     FOREIGN KEY (user_id) REFERENCES tb_user(id) ON DELETE CASCADE
 );
 
+-- 사용자별 참여 기간 조회용 인덱스
+CREATE INDEX idx_project_user_period ON tb_project_user (user_id, start_date, end_date);
+
 -- 유저 상태 변경 기록 테이블 생성 (새롭게 추가됨)
 CREATE TABLE tb_user_status_log (
-    recorded_at DATETIME(3) PRIMARY KEY,  -- 상태 기록 시간 (밀리초 포함)
+    id BIGINT PRIMARY KEY AUTO_INCREMENT, -- 기록 ID (같은 밀리초에 여러 건이 기록될 수 있음)
+    recorded_at DATETIME(3) NOT NULL,     -- 상태 기록 시간 (밀리초 포함)
     status_id VARCHAR(100) NOT NULL,      -- 상태 ID (tb_status 참조)
     user_id VARCHAR(100) NOT NULL,        -- 사용자 ID (tb_user 참조)
     created_by VARCHAR(100) DEFAULT 'SYSTEM', -- 생성자 정보
 
+    INDEX idx_user_status_log_user (user_id, recorded_at),  -- 사용자별 상태 이력 조회
+    INDEX idx_user_status_log_recorded (recorded_at),       -- 기간별 상태 이력 조회 (/status/time_in_status)
     FOREIGN KEY (status_id) REFERENCES tb_status(id) ON DELETE CASCADE,
     FOREIGN KEY (user_id) REFERENCES tb_user(id) ON DELETE CASCADE
 );
 
+-- 공지사항 읽음 상태 (사용자별 1행: read_through_id 이하는 모두 읽음 + 그 이후에 읽은 공지 id 목록)
+CREATE TABLE tb_notice_read (
+    user_id VARCHAR(100) PRIMARY KEY,
+    read_through_id BIGINT NOT NULL DEFAULT 0,
+    read_ids JSON,                        -- read_through_id 보다 큰, 읽은 공지 id 배열
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    FOREIGN KEY (user_id) REFERENCES tb_user(id) ON DELETE CASCADE
+);
+
+-- 사용자 상태별 체류 시간 월 집계 (지난 달까지, /status/time_in_status)
+CREATE TABLE tb_user_status_monthly (
+    month CHAR(7) NOT NULL,               -- 'YYYY-MM'
+    user_id VARCHAR(100) NOT NULL,
+    status_id VARCHAR(100) NOT NULL,
+    seconds BIGINT NOT NULL DEFAULT 0,    -- 그 달에 해당 상태였던 시간 (초)
+    PRIMARY KEY (month, user_id, status_id)
+);
+
+-- 체류 시간 월 집계가 끝난 월
+CREATE TABLE tb_user_status_monthly_done (
+    month CHAR(7) PRIMARY KEY,
+    computed_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+
+-- 프로젝트 현황 집계 테이블 (status / category / group_name 별 프로젝트 수)
+CREATE TABLE tb_project_summary (
+    dimension VARCHAR(20) NOT NULL,       -- 'status', 'category', 'group_name'
+    value VARCHAR(100) NOT NULL,          -- NULL 값은 '' 로 저장
+    project_count INT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    PRIMARY KEY (dimension, value)
+);
+
+-- 월별 투입 인원 집계 테이블
+CREATE TABLE tb_project_headcount_monthly (
+    month CHAR(7) PRIMARY KEY,            -- 'YYYY-MM'
+    headcount INT NOT NULL DEFAULT 0,     -- 해당 월에 참여 중인 인원 (여러 프로젝트에 참여해도 1명)
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+);
 
 INSERT INTO tb_role (id, comment, created_at, created_by, updated_at, updated_by)
 VALUES 
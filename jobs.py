@@ -0,0 +1,76 @@
+# jobs.py
+# 주기 실행 작업 (데몬 스레드)
+# gunicorn 워커가 여러 개여도 같은 작업이 주기마다 한 번만 실행되도록
+# CACHE_DIR 아래의 파일 락과 마지막 실행 시각 파일을 사용한다.
+#
+# 작업은 register_periodic_job 으로 등록만 해 두고, 서버가 첫 요청을 받을 때 start_periodic_jobs 로 시작한다.
+# (flask CLI 명령처럼 요청을 처리하지 않는 프로세스에서는 스레드를 만들지 않음)
+import os, time, fcntl, threading, logging
+from cache import CACHE_DIR
+
+logger = logging.getLogger(__name__)
+
+_registered = []  # (name, interval_seconds, fn)
+_started = False
+_start_lock = threading.Lock()
+
+def run_exclusive(name, fn, min_interval=0):
+    """다른 프로세스가 실행 중이거나 min_interval 초 이내에 실행된 적이 있으면 건너뜀
+
+    마지막 실행 시각은 락 파일과 별도의 파일({name}.lastrun)에 기록한다.
+    (락 파일은 열 때 새로 만들어질 수 있으므로, 그 시각을 실행 시각으로 보면 첫 실행을 건너뛰게 됨)
+    """
+    lock_path = os.path.join(CACHE_DIR, f"{name}.lock")
+    last_run_path = os.path.join(CACHE_DIR, f"{name}.lastrun")
+    with open(lock_path, "a") as lock_file:
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return False
+        try:
+            if min_interval:
+                try:
+                    last_run = os.path.getmtime(last_run_path)
+                except FileNotFoundError:
+                    last_run = None  # 한 번도 실행된 적 없음
+                if last_run is not None and time.time() - last_run < min_interval:
+                    return False
+            fn()
+            with open(last_run_path, "a"):
+                pass
+            os.utime(last_run_path, None)  # 마지막 실행 시각 기록
+            return True
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+def start_periodic_job(name, interval_seconds, fn):
+    """시작하자마자 한 번, 이후 interval_seconds 마다 fn 실행"""
+    def loop():
+        while True:
+            try:
+                # 다른 워커가 이번 주기에 이미 실행했으면 건너뜀 (약간의 오차 허용)
+                if run_exclusive(name, fn, min_interval=interval_seconds * 0.9):
+                    logger.info(f"[JOB] {name} 실행 완료")
+            except Exception as e:
+                logger.error(f"[JOB] {name} 실행 오류: {e}")
+            time.sleep(interval_seconds)
+
+    thread = threading.Thread(target=loop, name=f"job-{name}", daemon=True)
+    thread.start()
+    return thread
+
+def register_periodic_job(name, interval_seconds, fn):
+    """주기 실행 작업 등록 (start_periodic_jobs 호출 시 시작)"""
+    _registered.append((name, interval_seconds, fn))
+
+def start_periodic_jobs():
+    """등록된 작업 시작 (프로세스마다 한 번만)"""
+    global _started
+    if _started:
+        return
+    with _start_lock:
+        if _started:
+            return
+        _started = True
+        for name, interval_seconds, fn in _registered:
+            start_periodic_job(name, interval_seconds, fn)
@@ -0,0 +1,74 @@
+# json_provider.py
+# Flask JSON 직렬화 (orjson 이 있으면 orjson, 없으면 표준 json)
+#
+# - 날짜: ISO-8601 ('2025-03-04', 시각은 UTC 로 간주해 '2025-03-04T10:00:00Z')
+#   기존 Flask 기본 형식('Tue, 04 Mar 2025 00:00:00 GMT')과 같은 시점을 가리키도록 시각에 Z 를 붙인다.
+# - Decimal: 문자열 (정밀도 유지, 기존과 동일)
+# - bytes: UTF-8 문자열 (UTF-8 이 아니면 base64)
+# - JSON_LEGACY_DATES=Y 면 날짜를 기존 RFC 1123 형식으로 출력 (구버전 클라이언트 호환)
+import json, base64, decimal, uuid
+from datetime import date, datetime
+from flask.json.provider import DefaultJSONProvider
+from werkzeug.http import http_date
+from config import JSON_LEGACY_DATES
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def encode_bytes(value):
+    try:
+        return bytes(value).decode('utf-8')
+    except UnicodeDecodeError:
+        return base64.b64encode(bytes(value)).decode('ascii')
+
+def iso_date(value):
+    """date -> 'YYYY-MM-DD', datetime -> ISO-8601 (시간대가 없으면 UTC 로 간주해 Z)"""
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            return value.isoformat() + 'Z'
+        return value.isoformat()
+    return value.isoformat()
+
+class FastJSONProvider(DefaultJSONProvider):
+    """app.json 으로 등록해서 사용 (jsonify, current_app.json.dumps 모두 이 클래스를 거침)"""
+
+    legacy_dates = JSON_LEGACY_DATES
+
+    def default(self, o):
+        if isinstance(o, date):
+            return http_date(o) if self.legacy_dates else iso_date(o)
+        if isinstance(o, decimal.Decimal):
+            return str(o)
+        if isinstance(o, (bytes, bytearray, memoryview)):
+            return encode_bytes(o)
+        if isinstance(o, uuid.UUID):
+            return str(o)
+        if hasattr(o, 'tolist'):  # numpy 배열/스칼라
+            return o.tolist()
+        raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+    def _orjson_options(self):
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if self.legacy_dates:
+            option |= orjson.OPT_PASSTHROUGH_DATETIME  # 날짜를 default() 로 넘겨 RFC 1123 형식으로
+        else:
+            option |= orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z
+        return option
+
+    def dumps(self, obj, **kwargs):
+        # indent 등 orjson 이 지원하지 않는 옵션이 있으면 표준 json 사용
+        if orjson is not None and not kwargs:
+            return orjson.dumps(obj, default=self.default, option=self._orjson_options()).decode('utf-8')
+        kwargs.setdefault('default', self.default)
+        kwargs.setdefault('ensure_ascii', self.ensure_ascii)
+        kwargs.setdefault('sort_keys', self.sort_keys)
+        return json.dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs):
+        if orjson is not None and not kwargs:
+            return orjson.loads(s)
+        return json.loads(s, **kwargs)
@@ -0,0 +1,16 @@
+-- 프로젝트 현황 집계 테이블 추가 (/project/summary)
+-- 적용 후 `flask --app app project recompute-summary` 로 초기 데이터를 채운다.
+
+CREATE TABLE IF NOT EXISTS tb_project_summary (
+    dimension VARCHAR(20) NOT NULL,       -- 'status', 'category', 'group_name'
+    value VARCHAR(100) NOT NULL,          -- NULL 값은 '' 로 저장
+    project_count INT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    PRIMARY KEY (dimension, value)
+);
+
+CREATE TABLE IF NOT EXISTS tb_project_headcount_monthly (
+    month CHAR(7) PRIMARY KEY,            -- 'YYYY-MM'
+    headcount INT NOT NULL DEFAULT 0,     -- 해당 월에 참여 중인 인원 (여러 프로젝트에 참여해도 1명)
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+);
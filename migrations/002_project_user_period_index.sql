@@ -0,0 +1,2 @@
+-- 사용자별 참여 기간 조회용 인덱스 (/project/current_assignments 과거 날짜 조회)
+CREATE INDEX idx_project_user_period ON tb_project_user (user_id, start_date, end_date);
@@ -0,0 +1,4 @@
+-- 사용자 목록 필터/이름순 페이지네이션용 인덱스 (/user/get_users)
+-- status, role_id 는 외래 키를 만들 때 InnoDB 가 만든 인덱스를 사용
+CREATE INDEX idx_user_department ON tb_user (department);
+CREATE INDEX idx_user_delete_name ON tb_user (is_delete_yn, name);
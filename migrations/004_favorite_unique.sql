@@ -0,0 +1,9 @@
+-- 즐겨찾기 중복 행 정리 (같은 (user_id, favorite_user_id) 중 id 가 가장 작은 행만 남김)
+DELETE f1 FROM tb_favorite AS f1
+JOIN tb_favorite AS f2
+  ON f1.user_id = f2.user_id
+ AND f1.favorite_user_id = f2.favorite_user_id
+ AND f1.id > f2.id;
+
+-- 중복 즐겨찾기 방지 (/favorite/toggle_favorite, /favorite/set_favorites)
+ALTER TABLE tb_favorite ADD UNIQUE KEY uq_favorite_user (user_id, favorite_user_id);
@@ -0,0 +1,5 @@
+-- 상태 변경 기록: recorded_at 기본 키 -> 대리 키 (같은 밀리초의 동시 기록 충돌 방지)
+ALTER TABLE tb_user_status_log
+    DROP PRIMARY KEY,
+    ADD COLUMN id BIGINT NOT NULL AUTO_INCREMENT PRIMARY KEY FIRST,
+    ADD INDEX idx_user_status_log_user (user_id, recorded_at);
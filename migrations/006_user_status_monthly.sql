@@ -0,0 +1,17 @@
+-- 기간별 상태 이력 조회 (/status/time_in_status)
+CREATE INDEX idx_user_status_log_recorded ON tb_user_status_log (recorded_at);
+
+-- 사용자 상태별 체류 시간 월 집계 (지난 달까지)
+CREATE TABLE tb_user_status_monthly (
+    month CHAR(7) NOT NULL,               -- 'YYYY-MM'
+    user_id VARCHAR(100) NOT NULL,
+    status_id VARCHAR(100) NOT NULL,
+    seconds BIGINT NOT NULL DEFAULT 0,    -- 그 달에 해당 상태였던 시간 (초)
+    PRIMARY KEY (month, user_id, status_id)
+);
+
+-- 체류 시간 월 집계가 끝난 월
+CREATE TABLE tb_user_status_monthly_done (
+    month CHAR(7) PRIMARY KEY,
+    computed_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
@@ -0,0 +1,5 @@
+-- 공지사항 목록용 요약 컬럼과 (created_at, id) 키셋 페이지네이션 인덱스
+-- 기존 공지의 요약은 `flask notice backfill-summary` 로 채운다.
+ALTER TABLE tb_notice
+    ADD COLUMN summary VARCHAR(300) NULL AFTER content,
+    ADD INDEX idx_notice_list (is_delete_yn, created_at, id);
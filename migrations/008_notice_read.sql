@@ -0,0 +1,8 @@
+-- 공지사항 읽음 상태 (사용자별 1행: read_through_id 이하는 모두 읽음 + 그 이후에 읽은 공지 id 목록)
+CREATE TABLE tb_notice_read (
+    user_id VARCHAR(100) PRIMARY KEY,
+    read_through_id BIGINT NOT NULL DEFAULT 0,
+    read_ids JSON,                        -- read_through_id 보다 큰, 읽은 공지 id 배열
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    FOREIGN KEY (user_id) REFERENCES tb_user(id) ON DELETE CASCADE
+);
@@ -0,0 +1,28 @@
+-- 권한별 메뉴 허용 목록 + 메뉴별 API 경로 접두사 (요청 훅에서 권한 검사에 사용)
+ALTER TABLE tb_menu
+    ADD COLUMN endpoint_prefix VARCHAR(255) NULL;  -- 이 메뉴에 속한 API 경로 접두사 (NULL 이면 API 제한 없음)
+
+CREATE TABLE tb_role_menu (
+    role_id VARCHAR(100) NOT NULL,
+    menu_id VARCHAR(100) NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    created_by VARCHAR(100) DEFAULT 'SYSTEM',
+    PRIMARY KEY (role_id, menu_id),
+    FOREIGN KEY (role_id) REFERENCES tb_role(id) ON DELETE CASCADE,
+    FOREIGN KEY (menu_id) REFERENCES tb_menu(menu_id) ON DELETE CASCADE
+);
+
+-- 기존 메뉴는 모든 권한에 허용 (현재 동작 유지)
+INSERT INTO tb_role_menu (role_id, menu_id)
+SELECT r.id, m.menu_id FROM tb_role r CROSS JOIN tb_menu m;
+
+-- 관리자 API(/admin/) 는 AD_ADMIN 만 호출 가능
+-- (본인 정보 수정은 /admin/update_user 대신 /user/update_my_details 사용)
+INSERT INTO tb_menu (menu_id, menu_nm, menu_order, endpoint_prefix, created_by, updated_by)
+SELECT 'ADMIN', '관리자', 999, '/admin/', 'SYSTEM', 'SYSTEM'
+WHERE NOT EXISTS (SELECT 1 FROM tb_menu WHERE menu_id = 'ADMIN');
+
+UPDATE tb_menu SET endpoint_prefix = '/admin/' WHERE menu_id = 'ADMIN';
+
+DELETE FROM tb_role_menu WHERE menu_id = 'ADMIN';
+INSERT INTO tb_role_menu (role_id, menu_id) VALUES ('AD_ADMIN', 'ADMIN');
@@ -85,20 +85,29 @@ const Calendar = () => {
       const usersData = await usersResponse.json();
       setUsers(usersData.users);
 
-      const uniqueDepartments = [
-        ...new Set(
-          usersData.users.map((user) =>
-            user.team_name
-              ? `${user.department_name} - ${user.team_name}`
-              : user.department_name
-          )
-        ),
-      ]
-        .filter(Boolean)
-        .sort((a, b) => a.localeCompare(b, "ko-KR"));
-      // console.log(usersData.users);
-      setDepartments(uniqueDepartments);
-      // console.log(uniqueDepartments);
+      // 부서/팀 목록과 소속 인원은 서버의 조직도 캐시에서 가져옴
+      const treeResponse = await authFetch(
+        `${process.env.REACT_APP_API_URL}/department/tree?include_members=Y`,
+        {
+          headers: {
+            Authorization: `Bearer ${accessToken}`,
+            "X-Refresh-Token": refreshToken,
+          },
+        }
+      );
+      if (!treeResponse.ok) throw new Error("조직도를 불러오지 못했습니다.");
+      const treeData = await treeResponse.json();
+      setDepartments(
+        treeData.departments
+          .flatMap((dept) => dept.teams)
+          .filter((team) => team.member_count > 0)
+          .map((team) => ({
+            id: team.dpr_id,
+            label: team.label,
+            memberIds: new Set(team.member_ids),
+          }))
+          .sort((a, b) => a.label.localeCompare(b.label, "ko-KR"))
+      );
     } catch (error) {
       console.error("데이터 로딩 오류:", error);
     }
@@ -568,8 +577,8 @@ const Calendar = () => {
                   >
                     <option value="">전체 부서</option>
                     {departments.map((dept) => (
-                      <option key={dept} value={dept}>
-                        {dept}
+                      <option key={dept.id} value={dept.id}>
+                        {dept.label}
                       </option>
                     ))}
                   </select>
@@ -582,15 +591,12 @@ const Calendar = () => {
                       );
                     }
 
-                    const departmentUserIds = users
-                      .filter(
-                        (user) =>
-                          selectedDepartment === "" ||
-                          (user.team_name
-                            ? `${user.department_name} - ${user.team_name}`
-                            : user.department_name) === selectedDepartment
-                      )
-                      .map((user) => user.id);
+                    const selectedTeam = departments.find(
+                      (dept) => dept.id === selectedDepartment
+                    );
+                    const departmentUserIds = selectedTeam
+                      ? selectedTeam.memberIds
+                      : new Set(users.map((user) => user.id));
 
                     const filtered = otherUsersSchedule
                       .filter((schedule) => {
@@ -603,7 +609,7 @@ const Calendar = () => {
                         selected.setHours(0, 0, 0, 0);
 
                         return (
-                          departmentUserIds.includes(schedule.user_id) &&
+                          departmentUserIds.has(schedule.user_id) &&
                           selected >= startDate &&
                           selected <= endDate
                         );
@@ -10,7 +10,7 @@ import { authFetch } from "../../utils/authFetch";
  * 📌 EmployeeList - 사원 목록을 조회하고 필터링하는 페이지
  *
  * ✅ 주요 기능:
- *  - 사원 목록 조회 (GET /user/get_users)
+ *  - 사원 목록 조회 (GET /user/get_users?include_favorites=Y, 즐겨찾기 여부 포함)
  *  - 즐겨찾기 기능 (GET/POST /favorite/get_favorites, /favorite/toggle_favorite)
  *  - 상태 목록 조회 (GET /status/get_status_list)
  *  - 관리자 권한 확인 후 상태 변경 가능 (PUT /admin/update_status_admin)
@@ -75,8 +75,7 @@ const EmployeeList = () => {
 
         // 2. 모든 데이터 병렬로 가져오기
         await Promise.all([
-          fetchFavorites(userInfo.id), // 즐겨찾기 목록
-          fetchEmployees(), // 사원 목록
+          fetchEmployees(), // 사원 목록 (즐겨찾기 여부 포함)
           fetchStatusList(), // 상태 목록
         ]);
       } catch (error) {
@@ -142,19 +141,23 @@ const EmployeeList = () => {
   // 👥 **사원 및 부서 목록 가져오기**
   const fetchEmployees = async () => {
     try {
-      const response = await authFetch(`${apiUrl}/user/get_users`, {
-        method: "GET",
-        headers: {
-          "Content-Type": "application/json",
-          Authorization: `Bearer ${accessToken}`,
-          "X-Refresh-Token": refreshToken,
-        },
-      });
+      const response = await authFetch(
+        `${apiUrl}/user/get_users?include_favorites=Y`,
+        {
+          method: "GET",
+          headers: {
+            "Content-Type": "application/json",
+            Authorization: `Bearer ${accessToken}`,
+            "X-Refresh-Token": refreshToken,
+          },
+        }
+      );
       if (!response.ok)
         throw new Error("사원 데이터를 가져오는 데 실패했습니다.");
 
       const data = await response.json();
       setEmployees(data.users);
+      setFavoriteEmployees(data.users.filter((user) => user.is_favorite));
 
       const uniqueDepartments = [
         ...new Set(
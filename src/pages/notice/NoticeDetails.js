@@ -6,6 +6,7 @@ import { useParams } from "react-router-dom";
 import { FaArrowLeft } from "react-icons/fa";
 import { useAuth } from "../../utils/useAuth";
 import { authFetch } from "../../utils/authFetch";
+import { withBlobUrls } from "../../utils/noticeContent";
 
 const NoticeDetails = () => {
   const [loading, setLoading] = useState(true); // 데이터 로딩 상태
@@ -72,7 +73,10 @@ const NoticeDetails = () => {
       }
       const data = await response.json();
       //console.log("data: ", data.notice);
-      setNotice(data.notice);
+      setNotice({
+        ...data.notice,
+        content: withBlobUrls(data.notice.content, apiUrl),
+      });
     } catch (err) {
       setError(err.message);
     } finally {
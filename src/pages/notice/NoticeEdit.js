@@ -6,6 +6,7 @@ import "react-quill/dist/quill.snow.css";
 import "./NoticeEdit.css";
 import { useAuth } from "../../utils/useAuth";
 import { authFetch } from "../../utils/authFetch";
+import { withBlobUrls } from "../../utils/noticeContent";
 
 const NoticeEdit = () => {
   const [loading, setLoading] = useState(true); // 데이터 로딩 상태
@@ -97,7 +98,10 @@ const NoticeEdit = () => {
       }
       const data = await response.json();
       console.log("data: ", data.notice);
-      setNotice(data.notice);
+      setNotice({
+        ...data.notice,
+        content: withBlobUrls(data.notice.content, apiUrl),
+      });
     } catch (err) {
       setError(err.message);
     } finally {
@@ -16,7 +16,7 @@ import AddNoticeButton from "./AddNoticeButton";
  * 📌  NoticeList - 공지사항 목록을 보여주는 컴포넌트
  *
  * ✅ 주요 기능:
- * - 공지사항 목록 조회 (GET /notice/get_all_notice)
+ * - 공지사항 목록 조회 (GET /notice/get_notice_list, limit/cursor 로 나눠서 조회)
  *
  *
  * ✅ UI (또는 Component) 구조:
@@ -34,6 +34,9 @@ const NoticeList = () => {
 
   const [currentPage, setCurrentPage] = useState(1);
   const noticesPerPage = 10;
+  const noticesPerFetch = 50; // 서버에서 한 번에 가져오는 공지 수 (마지막 페이지를 넘기면 다음 묶음 조회)
+  const [nextCursor, setNextCursor] = useState(null); // 다음 묶음 조회용 cursor (마지막 공지의 created_at, id)
+  const [loadingMore, setLoadingMore] = useState(false);
 
   const apiUrl = process.env.REACT_APP_API_URL;
 
@@ -76,11 +79,17 @@ const NoticeList = () => {
     return userInfo;
   };
 
-  // 공지사항 목록 조회 API 호출
-  const fetchNotices = async () => {
+  // 공지사항 목록 조회 API 호출 (cursor 를 주면 이어서 조회해서 뒤에 붙임)
+  const fetchNotices = async (cursor = null) => {
     try {
-      setLoading(true);
-      const response = await authFetch(`${apiUrl}/notice/get_notice_list`, {
+      if (cursor) {
+        setLoadingMore(true);
+      } else {
+        setLoading(true);
+      }
+      const params = new URLSearchParams({ limit: noticesPerFetch });
+      if (cursor) params.append("cursor", cursor);
+      const response = await authFetch(`${apiUrl}/notice/get_notice_list?${params}`, {
         method: "GET",
         headers: {
           Authorization: `Bearer ${accessToken}`,
@@ -94,20 +103,26 @@ const NoticeList = () => {
       }
 
       const data = await response.json();
-      setNotices(data.notices);
-      setFilteredNotices(data.notices);
+      const loaded = cursor ? [...notices, ...data.notices] : data.notices;
+      setNotices(loaded);
+      setFilteredNotices(loaded);
+      setNextCursor(data.next_cursor);
+      return loaded;
     } catch (err) {
       console.error("공지사항 목록 조회 오류:", err);
       setError("공지사항을 불러오는 중 오류가 발생했습니다.");
     } finally {
       setLoading(false);
+      setLoadingMore(false);
     }
   };
 
   // 검색 및 필터링 로직
   const filterNotices = (notice) => {
     if (!searchText) return true;
-    const value = notice[searchField]?.toLowerCase() || "";
+    // 목록에는 본문 대신 요약(summary)만 내려오므로 내용 검색은 요약으로 처리
+    const field = searchField === "content" ? "summary" : searchField;
+    const value = notice[field]?.toLowerCase() || "";
     return value.includes(searchText.toLowerCase());
   };
 
@@ -141,10 +156,17 @@ const NoticeList = () => {
     indexOfLastNotice
   );
 
-  // 페이지 변경 핸들러
-  const goToNextPage = () => {
+  // 페이지 변경 핸들러 (불러온 공지의 마지막 페이지면 다음 묶음을 가져온 뒤 이동)
+  const hasMore = nextCursor !== null;
+  const goToNextPage = async () => {
     if (currentPage < totalPages) {
       setCurrentPage(currentPage + 1);
+    } else if (hasMore && !loadingMore) {
+      const loaded = (await fetchNotices(nextCursor)) || notices;
+      // 검색 중이면 새로 가져온 공지가 모두 걸러질 수 있으므로 페이지가 늘었을 때만 이동
+      if (loaded.filter(filterNotices).length > currentPage * noticesPerPage) {
+        setCurrentPage(currentPage + 1);
+      }
     }
   };
 
@@ -239,8 +261,12 @@ const NoticeList = () => {
           </button>
           <span>
             {currentPage} / {totalPages}
+            {hasMore && "+"}
           </span>
-          <button onClick={goToNextPage} disabled={currentPage === totalPages}>
+          <button
+            onClick={goToNextPage}
+            disabled={loadingMore || (currentPage >= totalPages && !hasMore)}
+          >
             다음
           </button>
         </div>
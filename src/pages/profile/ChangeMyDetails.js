@@ -130,7 +130,8 @@ const ChangeMyDetails = () => {
     e.preventDefault();
 
     try {
-      const response = await authFetch(`${apiUrl}/admin/update_user`, {
+      // 본인 정보 수정 API (관리자 권한 없이 전화번호만 변경)
+      const response = await authFetch(`${apiUrl}/user/update_my_details`, {
         method: "PUT",
         headers: {
           "Content-Type": "application/json",
@@ -138,13 +139,7 @@ const ChangeMyDetails = () => {
           "X-Refresh-Token": refreshToken,
         },
         body: JSON.stringify({
-          id: user.id,
-          username: formData.username,
-          position: formData.position,
-          department_name: formData.department_name,
-          team_name: formData.team_name,
           phone: formData.phone,
-          role_id: formData.role_id,
         }),
       });
 
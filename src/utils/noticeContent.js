@@ -0,0 +1,12 @@
+/**
+ * 공지 본문의 이미지 경로 처리
+ *
+ * 서버는 본문에 포함된 이미지를 파일로 분리하고 본문에는 "/notice/blob/<해시>" 경로만 저장한다.
+ * 화면과 API 서버의 주소가 다를 수 있으므로 표시/편집 전에 API 주소를 붙인다.
+ * (저장할 때 서버가 다시 상대 경로로 바꿔서 저장함)
+ */
+export const withBlobUrls = (content, apiUrl) =>
+  (content || "").replace(
+    /src=(["'])\/notice\/blob\//g,
+    (match, quote) => `src=${quote}${apiUrl}/notice/blob/`
+  );
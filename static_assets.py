@@ -0,0 +1,136 @@
+# static_assets.py
+# React 빌드 결과(build/) 정적 파일 서빙
+#
+# - 시작할 때 build/ 를 한 번만 훑어서 경로 -> (파일, mimetype, ETag, 미리 압축된 .br/.gz) 목록을 만든다.
+#   (요청마다 os.path.exists 를 호출하지 않음, 빌드를 바꾸면 재시작)
+# - 파일 이름에 내용 해시가 들어간 파일(main.3f2a1b9c.js 등)은 내용이 바뀌지 않으므로 1년 immutable 캐시
+# - index.html 등 나머지는 no-cache + ETag (매번 재검증, 바뀌지 않았으면 304)
+# - Accept-Encoding 에 맞는 .br / .gz 파일이 있으면 그 파일을 그대로 전송 (요청 시 압축하지 않음)
+# - API 경로처럼 보이는 요청(/user/..., /api/...)과 없는 정적 파일(/static/..., *.js 등)은 index.html 대신 404
+import os, re, gzip, hashlib, mimetypes
+from flask import request, send_file, jsonify
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+BUILD_DIR = "/app/build" if os.getenv("DOCKER_ENV") else "build"
+INDEX_FILE = "index.html"
+
+# 파일 이름의 내용 해시 (CRA 빌드: main.3f2a1b9c.js, 787.1c2d3e4f.chunk.js, logo.5d5d9eef.svg)
+HASHED_NAME_RE = re.compile(r'\.[0-9a-f]{8,}\.')
+
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+REVALIDATE_CACHE_CONTROL = 'no-cache'
+
+# 미리 압축된 파일 확장자 (선호 순서)
+VARIANT_EXTENSIONS = (('br', '.br'), ('gzip', '.gz'))
+
+# 미리 압축할 만한 파일 (텍스트 계열)
+COMPRESSIBLE_EXTENSIONS = ('.html', '.js', '.css', '.json', '.map', '.svg', '.txt', '.xml', '.ico')
+
+# 정적 파일 확장자 (색인에 없으면 index.html 대신 404, 사용자 id 같은 이메일 경로와 구분하려고 목록으로 관리)
+ASSET_EXTENSIONS = COMPRESSIBLE_EXTENSIONS + ('.png', '.jpg', '.jpeg', '.gif', '.webp', '.woff', '.woff2', '.ttf', '.eot')
+
+def file_etag(path):
+    """파일 내용 기반 ETag 값 (따옴표 제외, 서버/재시작과 무관하게 같은 내용이면 같은 값)"""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(65536), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+class StaticAssets:
+    """build/ 디렉터리 색인 (시작 시 1회)"""
+
+    def __init__(self, build_dir=BUILD_DIR):
+        self.build_dir = build_dir
+        self.assets = {}  # 'static/js/main.3f2a1b9c.js' -> {'path', 'mimetype', 'etag', 'variants', 'cache_control'}
+        self.api_prefixes = None
+        self.reindex()
+
+    def reindex(self):
+        assets = {}
+        for root, _, files in os.walk(self.build_dir):
+            names = set(files)
+            for name in files:
+                if name.endswith(tuple(ext for _, ext in VARIANT_EXTENSIONS)) and name.rsplit('.', 1)[0] in names:
+                    continue  # 원본이 있는 압축본은 원본의 variants 로만 제공
+                path = os.path.join(root, name)
+                rel = os.path.relpath(path, self.build_dir).replace(os.sep, '/')
+                assets[rel] = {
+                    'path': path,
+                    'mimetype': mimetypes.guess_type(name)[0] or 'application/octet-stream',
+                    'etag': file_etag(path),
+                    'variants': {enc: path + ext for enc, ext in VARIANT_EXTENSIONS if name + ext in names},
+                    'cache_control': IMMUTABLE_CACHE_CONTROL if HASHED_NAME_RE.search(name) else REVALIDATE_CACHE_CONTROL,
+                }
+        self.assets = assets
+
+    def is_api_path(self, path, url_map):
+        """API 경로(블루프린트 접두사, /api) 이거나 정적 파일 경로인지 (SPA 라우트가 아님)"""
+        if self.api_prefixes is None:
+            prefixes = {'api'}
+            for rule in url_map.iter_rules():
+                first = rule.rule.lstrip('/').split('/', 1)[0]
+                if first and not first.startswith('<'):
+                    prefixes.add(first)
+            self.api_prefixes = prefixes
+        first = path.lstrip('/').split('/', 1)[0]
+        return first in self.api_prefixes or first == 'static' or path.lower().endswith(ASSET_EXTENSIONS)
+
+    def send(self, rel_path):
+        """색인에 있는 파일 전송 (없으면 None)"""
+        asset = self.assets.get(rel_path)
+        if asset is None:
+            return None
+
+        path, etag = asset['path'], asset['etag']
+        encoding = None
+        for enc, _ in VARIANT_EXTENSIONS:
+            if enc in asset['variants'] and request.accept_encodings.quality(enc) > 0:
+                encoding = enc
+                path, etag = asset['variants'][enc], f"{etag}-{enc}"
+                break
+
+        response = send_file(path, mimetype=asset['mimetype'], conditional=True, etag=etag, max_age=None)
+        response.headers['Cache-Control'] = asset['cache_control']
+        if asset['variants']:
+            response.vary.add('Accept-Encoding')
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+        return response
+
+    def send_index(self):
+        response = self.send(INDEX_FILE)
+        if response is None:
+            return jsonify({'message': '프론트엔드 빌드(index.html)가 없습니다.'}), 404
+        return response
+
+def not_found_response():
+    return jsonify({'message': '요청한 경로를 찾을 수 없습니다.'}), 404
+
+def precompress_build(build_dir=BUILD_DIR, gzip_level=9, brotli_quality=11):
+    """빌드 결과의 텍스트 파일마다 .gz (brotli 가 있으면 .br 도) 생성, 원본보다 작을 때만 저장
+
+    반환: 생성한 파일 수
+    """
+    created = 0
+    for root, _, files in os.walk(build_dir):
+        for name in files:
+            if not name.endswith(COMPRESSIBLE_EXTENSIONS):
+                continue
+            path = os.path.join(root, name)
+            with open(path, 'rb') as f:
+                data = f.read()
+            encoders = [('.gz', lambda d: gzip.compress(d, compresslevel=gzip_level, mtime=0))]
+            if brotli is not None:
+                encoders.append(('.br', lambda d: brotli.compress(d, quality=brotli_quality)))
+            for ext, compress in encoders:
+                compressed = compress(data)
+                if len(compressed) < len(data):
+                    with open(path + ext, 'wb') as f:
+                        f.write(compressed)
+                    created += 1
+    return created